@@ -43,7 +43,15 @@ if os.path.dirname(current_dir) not in sys.path:
     sys.path.append(os.path.dirname(current_dir))
 
 # Inicializar la base de datos
-from models.database import init_db, populate_sample_data
+from models.database import init_db, populate_sample_data, init_app as init_db_app
+
+# Reutilizar conexiones SQLite por hilo y liberarlas al final de cada petición
+init_db_app(app)
+
+# jsonify y request.get_json usan el códec JSON común (orjson si está instalado)
+from utils import json_codec
+app.json_encoder = json_codec.CodecJSONEncoder
+app.json_decoder = json_codec.CodecJSONDecoder
 
 # Verificar si la base de datos existe
 if not os.path.exists(DB_PATH):
@@ -51,6 +59,46 @@ if not os.path.exists(DB_PATH):
     init_db()
     populate_sample_data()
 
+# Aplicar migraciones pendientes en bases de datos existentes
+from models.migrations import run_migrations
+run_migrations(verbose=True)
+
+# Escritor único con commit agrupado (solo con SQLite)
+if app.config.get('WRITE_QUEUE_ENABLED') and app.config.get('REPOSITORY_BACKEND', 'sqlite') == 'sqlite':
+    from services.write_queue import write_queue
+    write_queue.start(
+        max_batch=app.config.get('WRITE_QUEUE_MAX_BATCH', 64),
+        max_delay_ms=app.config.get('WRITE_QUEUE_MAX_DELAY_MS', 0)
+    )
+
+# Hilos de los trabajos en segundo plano (simulación y liquidación)
+from services.job_runner import job_runner
+job_runner.start(
+    workers=app.config.get('JOB_RUNNER_WORKERS', 2),
+    lease_seconds=app.config.get('JOB_LEASE_SECONDS', 60)
+)
+
+# Sesiones compartidas entre procesos con caché local
+from services.session_store import session_store
+session_store.configure(
+    cache_size=app.config.get('SESSION_CACHE_MAX_ENTRIES', 4096),
+    cache_ttl=app.config.get('SESSION_CACHE_TTL', 60),
+    revocation_poll=app.config.get('SESSION_REVOCATION_POLL', 1),
+    sweep_interval=app.config.get('SESSION_SWEEP_INTERVAL', 300)
+)
+
+# Tokens JWT ya verificados (token_required no vuelve a decodificarlos)
+from utils.token_cache import verified_tokens
+verified_tokens.configure(
+    max_entries=app.config.get('TOKEN_CACHE_MAX_ENTRIES', 4096),
+    ttl=app.config.get('TOKEN_CACHE_TTL', 300)
+)
+
+# Planificador de transiciones de estado de los eventos (solo con SQLite)
+if app.config.get('STATUS_SCHEDULER_ENABLED') and app.config.get('REPOSITORY_BACKEND', 'sqlite') == 'sqlite':
+    from services.status_scheduler import status_scheduler
+    status_scheduler.start(rebuild_interval=app.config.get('STATUS_SCHEDULER_REBUILD_INTERVAL', 300))
+
 # Ruta de inicio para verificación rápida
 @app.route('/', methods=['GET'])
 def index():
@@ -65,6 +113,8 @@ def index():
             "/sports",
             "/competitions",
             "/bets (requires auth)",
+            "/leaderboard",
+            "/metrics",
             "/auth/login",
             "/auth/logout"
         ]
@@ -75,26 +125,45 @@ from routes.events import events_bp
 from routes.bets import bets_bp
 from routes.auth import auth_bp
 from routes.simulation import simulation_bp
+from routes.leaderboard import leaderboard_bp
 
 # Registrar blueprints
 app.register_blueprint(events_bp, url_prefix='/events')
 app.register_blueprint(bets_bp, url_prefix='/bets')
 app.register_blueprint(auth_bp, url_prefix='/auth')
 app.register_blueprint(simulation_bp, url_prefix='/simulation')
+app.register_blueprint(leaderboard_bp, url_prefix='/leaderboard')
+
+# Deportes y competiciones se sirven desde el catálogo en memoria
+from services.catalog_service import CatalogService
+from utils.response_cache import LISTING_TAG, cached_response, catalog_cache, conditional_get, request_key
+
+# Cache-Control de deportes y competiciones (solo cambian sus contadores)
+CATALOG_CACHE_CONTROL = 'public, max-age=60'
+
+# Caché de respuestas de las rutas públicas del catálogo
+catalog_cache.configure(
+    max_entries=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 2048),
+    ttl=app.config.get('RESPONSE_CACHE_TTL', 30),
+    stale_ttl=app.config.get('RESPONSE_CACHE_STALE_TTL', 30),
+    enabled=app.config.get('RESPONSE_CACHE_ENABLED', True)
+)
 
 # Ruta para listar deportes
-from models.sport import Sport
 @app.route('/sports', methods=['GET'])
+@conditional_get(lambda: CatalogService.get_snapshot().listing_etag(request_key()), CATALOG_CACHE_CONTROL)
+@cached_response(lambda: (LISTING_TAG,))
 def get_sports_list():
-    sports = Sport.get_all()
+    sports = CatalogService.get_snapshot().get_sports()
     return jsonify({"sports": sports})
 
 # Ruta para listar competiciones
-from models.competition import Competition
 @app.route('/competitions', methods=['GET'])
+@conditional_get(lambda: CatalogService.get_snapshot().listing_etag(request_key()), CATALOG_CACHE_CONTROL)
+@cached_response(lambda: (LISTING_TAG,))
 def get_competitions_list():
     sport_id = request.args.get('sport_id')
-    competitions = Competition.get_all(sport_id)
+    competitions = CatalogService.get_snapshot().get_competitions(sport_id)
     return jsonify({"competitions": competitions})
 
 # Ruta de estado/salud para monitoreo
@@ -106,6 +175,18 @@ def health_check():
         "timestamp": datetime.datetime.now().isoformat()
     })
 
+# Contadores internos del proceso (caché de respuestas, cola de escritura, sesiones y autenticación)
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    from services.write_queue import write_queue
+    return jsonify({
+        "json_codec": json_codec.BACKEND,
+        "response_cache": catalog_cache.stats(),
+        "write_queue": write_queue.stats(),
+        "sessions": session_store.stats(),
+        "auth": verified_tokens.stats()
+    })
+
 # Manejadores de errores
 @app.errorhandler(404)
 def not_found(error):
@@ -16,4 +16,48 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key')
     DEBUG = os.getenv('DEBUG', 'True') == 'True'
     ENV = os.getenv('FLASK_ENV', 'development')
-    DATABASE_URI = str(DATABASE_PATH)
\ No newline at end of file
+    DATABASE_URI = str(DATABASE_PATH)
+    # Backend de datos de los modelos: 'sqlite' o 'memory' (pruebas de carga)
+    REPOSITORY_BACKEND = os.getenv('REPOSITORY_BACKEND', 'sqlite')
+    # Antigüedad máxima (segundos) del catálogo en memoria antes de recargarlo;
+    # acota cuánto tardan en verse las escrituras hechas por otros procesos
+    CATALOG_SNAPSHOT_MAX_AGE = float(os.getenv('CATALOG_SNAPSHOT_MAX_AGE', '30'))
+    # Caché de respuestas de /sports, /competitions, /events/featured y /events/<id>:
+    # entradas máximas (LRU), segundos fresca y segundos servida caducada mientras
+    # se recalcula. Las escrituras del catálogo de este proceso la invalidan al
+    # momento; el TTL acota cuánto tardan en verse las de otros procesos
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '2048'))
+    RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '30'))
+    RESPONSE_CACHE_STALE_TTL = float(os.getenv('RESPONSE_CACHE_STALE_TTL', '30'))
+    # Planificador en proceso de las transiciones upcoming -> live -> completed
+    STATUS_SCHEDULER_ENABLED = os.getenv('STATUS_SCHEDULER_ENABLED', 'True') == 'True'
+    # Segundos entre reconstrucciones completas del planificador (eventos de otros procesos)
+    STATUS_SCHEDULER_REBUILD_INTERVAL = int(os.getenv('STATUS_SCHEDULER_REBUILD_INTERVAL', '300'))
+    # Cola de escritura con commit agrupado (apuestas, liquidaciones y simulación)
+    WRITE_QUEUE_ENABLED = os.getenv('WRITE_QUEUE_ENABLED', 'True') == 'True'
+    # Operaciones máximas por transacción y espera máxima (ms) a más operaciones;
+    # con 0 la tanda son las operaciones que llegaron durante el commit anterior
+    WRITE_QUEUE_MAX_BATCH = int(os.getenv('WRITE_QUEUE_MAX_BATCH', '64'))
+    WRITE_QUEUE_MAX_DELAY_MS = float(os.getenv('WRITE_QUEUE_MAX_DELAY_MS', '0'))
+    # Hilos de los trabajos en segundo plano (ciclos de simulación y liquidación)
+    JOB_RUNNER_WORKERS = int(os.getenv('JOB_RUNNER_WORKERS', '2'))
+    # Segundos de vigencia de la concesión de un trabajo sin renovar; si su
+    # proceso muere, pasado este plazo se puede lanzar otro del mismo tipo
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '60'))
+    # Segundos de validez de las sesiones (y de sus tokens JWT)
+    SESSION_TTL = int(os.getenv('SESSION_TTL', '86400'))
+    # Caché de sesiones de cada proceso: entradas máximas (LRU) y segundos que
+    # se sirve una sesión sin volver a SQLite
+    SESSION_CACHE_MAX_ENTRIES = int(os.getenv('SESSION_CACHE_MAX_ENTRIES', '4096'))
+    SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', '60'))
+    # Segundos máximos que tarda una revocación (logout) en verse en los demás
+    # procesos, y segundos entre barridos de sesiones caducadas
+    SESSION_REVOCATION_POLL = float(os.getenv('SESSION_REVOCATION_POLL', '1'))
+    SESSION_SWEEP_INTERVAL = float(os.getenv('SESSION_SWEEP_INTERVAL', '300'))
+    # Caché de tokens JWT ya verificados: entradas máximas (LRU) y segundos
+    # máximos que se usa una entrada (nunca después del exp del token)
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('TOKEN_CACHE_MAX_ENTRIES', '4096'))
+    TOKEN_CACHE_TTL = float(os.getenv('TOKEN_CACHE_TTL', '300'))
+    # Apuestas liquidadas mínimas en el periodo para aparecer en /leaderboard
+    LEADERBOARD_MIN_BETS = int(os.getenv('LEADERBOARD_MIN_BETS', '5'))
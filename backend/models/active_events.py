@@ -0,0 +1,44 @@
+# Archivo: backend/models/active_events.py
+#
+# Contadores active_events_count de sports y competitions. Un evento cuenta
+# como activo mientras está 'upcoming' o 'live'; se asocia a su deporte por
+# lower(sports.name) = events.sport_type y a su competición por nombre dentro
+# de ese deporte. Los triggers de la migración 9 los mantienen al día y
+# recount_active_events los recalcula desde cero.
+
+ACTIVE_STATUSES = ('upcoming', 'live')
+
+# Condición SQL equivalente a ACTIVE_STATUSES
+ACTIVE_STATUSES_SQL = "('upcoming', 'live')"
+
+def recount_active_events(cursor):
+    """
+    Recalcula todos los contadores en una sola pasada sobre events.
+
+    Args:
+        cursor: Cursor de la transacción en curso (no se hace commit aquí)
+    """
+    cursor.execute("DROP TABLE IF EXISTS temp.active_event_counts")
+    cursor.execute(f"""
+    CREATE TEMP TABLE active_event_counts AS
+    SELECT sport_type, competition, COUNT(*) AS total
+    FROM events
+    WHERE status IN {ACTIVE_STATUSES_SQL}
+    GROUP BY sport_type, competition
+    """)
+
+    cursor.execute("""
+    UPDATE sports SET active_events_count = COALESCE((
+        SELECT SUM(total) FROM active_event_counts WHERE sport_type = lower(sports.name)
+    ), 0)
+    """)
+    cursor.execute("""
+    UPDATE competitions SET active_events_count = COALESCE((
+        SELECT SUM(c.total)
+        FROM active_event_counts c
+        JOIN sports s ON lower(s.name) = c.sport_type
+        WHERE s.id = competitions.sport_id AND c.competition = competitions.name
+    ), 0)
+    """)
+
+    cursor.execute("DROP TABLE temp.active_event_counts")
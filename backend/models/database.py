@@ -4,9 +4,11 @@ import sqlite3
 import os
 import datetime
 import uuid
-import json
+import threading
 from pathlib import Path
 
+from utils import json_codec
+
 # Obtener la ruta absoluta del directorio actual (donde se encuentra este archivo)
 CURRENT_DIR = Path(__file__).resolve().parent
 # Subir un nivel para llegar al directorio backend
@@ -17,12 +19,90 @@ DB_DIR.mkdir(exist_ok=True)
 
 DB_PATH = DB_DIR / "worldbet.db"
 
-def get_db_connection():
-    """Crea una conexión a la base de datos SQLite."""
-    conn = sqlite3.connect(DB_PATH)
+# Ajustes de SQLite aplicados a cada conexión nueva
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),        # Los lectores no se bloquean detrás de los escritores
+    ("synchronous", "NORMAL"),      # Seguro con WAL y evita un fsync por commit
+    ("mmap_size", 268435456),       # 256 MB de lecturas mapeadas en memoria
+    ("cache_size", -65536),         # 64 MB de caché de páginas (valor negativo = KiB)
+    ("busy_timeout", 5000),         # Esperar hasta 5 s por el bloqueo de escritura
+    ("foreign_keys", "ON"),
+)
+# Número de sentencias preparadas que se mantienen en caché por conexión
+STATEMENT_CACHE_SIZE = 512
+
+# Conexiones abiertas por hilo (una por ruta de base de datos)
+_local = threading.local()
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Conexión SQLite reutilizable por hilo.
+    
+    close() no cierra la conexión: la deja disponible para la siguiente llamada
+    del mismo hilo (los modelos pueden anidarse sin perder la transacción del
+    llamador). Las transacciones que queden abiertas se deshacen al liberar la
+    conexión con release_db_connection(), y close_db_connections() la cierra de
+    verdad.
+    """
+    def close(self):
+        pass
+    
+    def release(self):
+        if self.in_transaction:
+            self.rollback()
+    
+    def force_close(self):
+        super().close()
+
+def _connect(db_path):
+    """Abre una conexión nueva con los pragmas de rendimiento aplicados."""
+    conn = sqlite3.connect(
+        db_path,
+        factory=PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
     conn.row_factory = sqlite3.Row  # Para obtener resultados como diccionarios
+    for pragma, value in SQLITE_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
+def _thread_connections():
+    """Devuelve las conexiones del hilo actual, descartando las heredadas de otro proceso."""
+    pid = os.getpid()
+    if getattr(_local, 'pid', None) != pid:
+        # Tras un fork (gunicorn) no se pueden reutilizar las conexiones del padre
+        _local.pid = pid
+        _local.connections = {}
+    return _local.connections
+
+def get_db_connection():
+    """Obtiene la conexión a la base de datos SQLite del hilo actual, creándola si hace falta."""
+    connections = _thread_connections()
+    db_path = str(DB_PATH)
+    
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = _connect(db_path)
+        connections[db_path] = conn
+    
     return conn
 
+def release_db_connection(exception=None):
+    """Devuelve la conexión del hilo al pool al terminar una petición."""
+    for conn in _thread_connections().values():
+        conn.release()
+
+def close_db_connections():
+    """Cierra definitivamente las conexiones del hilo actual."""
+    connections = _thread_connections()
+    for conn in connections.values():
+        conn.force_close()
+    connections.clear()
+
+def init_app(app):
+    """Registra la gestión de conexiones en el ciclo de vida de las peticiones Flask."""
+    app.teardown_appcontext(release_db_connection)
+
 def init_db():
     """Inicializa la base de datos con el esquema y datos iniciales."""
     conn = get_db_connection()
@@ -63,7 +143,7 @@ def init_db():
         teams TEXT,    -- JSON (Nuevo campo para equipos)
         status TEXT DEFAULT 'upcoming',
         image_url TEXT,
-        stats TEXT  -- JSON,
+        stats TEXT,  -- JSON
         highlights_url TEXT  -- Nueva columna para los highlights
     );
     
@@ -103,6 +183,10 @@ def init_db():
     
     conn.commit()
     conn.close()
+    
+    # Aplicar las migraciones versionadas (tablas adicionales e índices)
+    from models.migrations import run_migrations
+    run_migrations()
 
 def populate_sample_data():
     """Inserta datos de ejemplo en la base de datos."""
@@ -115,13 +199,13 @@ def populate_sample_data():
     sunday = current_date + datetime.timedelta(days=1)
     sunday = sunday.replace(hour=16, minute=0, second=0, microsecond=0)
     
-    # Insertar deportes
+    # Insertar deportes (active_events_count lo mantienen los triggers de events)
     sports = [
-        (str(uuid.uuid4()), "Football", 120, "https://upload.wikimedia.org/wikipedia/commons/thumb/4/42/Football_in_Bloomington%2C_Indiana%2C_1995.jpg/500px-Football_in_Bloomington%2C_Indiana%2C_1995.jpg"),
-        (str(uuid.uuid4()), "Basketball", 80, "https://upload.wikimedia.org/wikipedia/commons/thumb/8/8d/Kent_Benson_attempts_a_hook_shot_over_Ken_Ferdinand.jpg/500px-Kent_Benson_attempts_a_hook_shot_over_Ken_Ferdinand.jpg"),
-        (str(uuid.uuid4()), "Tennis", 60, "https://upload.wikimedia.org/wikipedia/commons/thumb/9/94/2013_Australian_Open_-_Guillaume_Rufin.jpg/500px-2013_Australian_Open_-_Guillaume_Rufin.jpg"),
-        (str(uuid.uuid4()), "Boxing", 25, "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1e/Floyd_Mayweather%2C_Jr._vs._Juan_Manuel_Márquez.jpg/500px-Floyd_Mayweather%2C_Jr._vs._Juan_Manuel_Márquez.jpg"),
-        (str(uuid.uuid4()), "Motorsport", 30, "https://upload.wikimedia.org/wikipedia/commons/thumb/d/db/Logo_de_Motorsport.com_sitio.png/500px-Logo_de_Motorsport.com_sitio.png")
+        (str(uuid.uuid4()), "Football", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/4/42/Football_in_Bloomington%2C_Indiana%2C_1995.jpg/500px-Football_in_Bloomington%2C_Indiana%2C_1995.jpg"),
+        (str(uuid.uuid4()), "Basketball", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/8/8d/Kent_Benson_attempts_a_hook_shot_over_Ken_Ferdinand.jpg/500px-Kent_Benson_attempts_a_hook_shot_over_Ken_Ferdinand.jpg"),
+        (str(uuid.uuid4()), "Tennis", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/9/94/2013_Australian_Open_-_Guillaume_Rufin.jpg/500px-2013_Australian_Open_-_Guillaume_Rufin.jpg"),
+        (str(uuid.uuid4()), "Boxing", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1e/Floyd_Mayweather%2C_Jr._vs._Juan_Manuel_Márquez.jpg/500px-Floyd_Mayweather%2C_Jr._vs._Juan_Manuel_Márquez.jpg"),
+        (str(uuid.uuid4()), "Motorsport", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/d/db/Logo_de_Motorsport.com_sitio.png/500px-Logo_de_Motorsport.com_sitio.png")
     ]
     
     cursor.executemany('''
@@ -135,15 +219,15 @@ def populate_sample_data():
     
     # Insertar competiciones
     competitions = [
-        (str(uuid.uuid4()), "La Liga", sport_ids["Football"], "Spain", 10, "https://w7.pngwing.com/pngs/740/650/png-transparent-spain-2011-12-la-liga-2017-18-la-liga-2014-15-la-liga-atletico-madrid-premier-league-sport-sports-liga-thumbnail.png"),
-        (str(uuid.uuid4()), "Premier League", sport_ids["Football"], "England", 12, "https://static.vecteezy.com/system/resources/thumbnails/010/994/451/small/premier-league-logo-symbol-with-name-design-england-football-european-countries-football-teams-illustration-with-purple-background-free-vector.jpg"),
-        (str(uuid.uuid4()), "Champions League", sport_ids["Football"], "International", 8, "https://st2.depositphotos.com/2124563/8893/i/450/depositphotos_88939068-stock-photo-flag-of-uefa-champions-league.jpg"),
-        (str(uuid.uuid4()), "NBA", sport_ids["Basketball"], "USA", 15, "https://static.vecteezy.com/system/resources/thumbnails/015/863/585/small_2x/nba-logo-on-transparent-background-free-vector.jpg"),
-        (str(uuid.uuid4()), "Euroleague", sport_ids["Basketball"], "Europe", 10, "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/UEFA_Europa_League_logo_%282024_version%29.svg/1436px-UEFA_Europa_League_logo_%282024_version%29.svg.png"),
-        (str(uuid.uuid4()), "ATP Masters", sport_ids["Tennis"], "International", 5, "https://upload.wikimedia.org/wikipedia/en/thumb/3/3f/ATP_Tour_logo.svg/375px-ATP_Tour_logo.svg.png"),
-        (str(uuid.uuid4()), "French Open", sport_ids["Tennis"], "France", 20, "https://upload.wikimedia.org/wikipedia/en/thumb/1/1d/Logo_Roland-Garros.svg/1200px-Logo_Roland-Garros.svg.png"),
-        (str(uuid.uuid4()), "Heavyweight Championship", sport_ids["Boxing"], "International", 3, "https://ichef.bbci.co.uk/ace/standard/976/cpsprodpb/1909/live/b1ff39e0-392d-11ef-bdc5-41d7421c2adf.png"),
-        (str(uuid.uuid4()), "Formula 1", sport_ids["Motorsport"], "International", 8, "https://logodownload.org/wp-content/uploads/2016/11/formula-1-logo-0.png")
+        (str(uuid.uuid4()), "La Liga", sport_ids["Football"], "Spain", 0, "https://w7.pngwing.com/pngs/740/650/png-transparent-spain-2011-12-la-liga-2017-18-la-liga-2014-15-la-liga-atletico-madrid-premier-league-sport-sports-liga-thumbnail.png"),
+        (str(uuid.uuid4()), "Premier League", sport_ids["Football"], "England", 0, "https://static.vecteezy.com/system/resources/thumbnails/010/994/451/small/premier-league-logo-symbol-with-name-design-england-football-european-countries-football-teams-illustration-with-purple-background-free-vector.jpg"),
+        (str(uuid.uuid4()), "Champions League", sport_ids["Football"], "International", 0, "https://st2.depositphotos.com/2124563/8893/i/450/depositphotos_88939068-stock-photo-flag-of-uefa-champions-league.jpg"),
+        (str(uuid.uuid4()), "NBA", sport_ids["Basketball"], "USA", 0, "https://static.vecteezy.com/system/resources/thumbnails/015/863/585/small_2x/nba-logo-on-transparent-background-free-vector.jpg"),
+        (str(uuid.uuid4()), "Euroleague", sport_ids["Basketball"], "Europe", 0, "https://upload.wikimedia.org/wikipedia/commons/thumb/1/1b/UEFA_Europa_League_logo_%282024_version%29.svg/1436px-UEFA_Europa_League_logo_%282024_version%29.svg.png"),
+        (str(uuid.uuid4()), "ATP Masters", sport_ids["Tennis"], "International", 0, "https://upload.wikimedia.org/wikipedia/en/thumb/3/3f/ATP_Tour_logo.svg/375px-ATP_Tour_logo.svg.png"),
+        (str(uuid.uuid4()), "French Open", sport_ids["Tennis"], "France", 0, "https://upload.wikimedia.org/wikipedia/en/thumb/1/1d/Logo_Roland-Garros.svg/1200px-Logo_Roland-Garros.svg.png"),
+        (str(uuid.uuid4()), "Heavyweight Championship", sport_ids["Boxing"], "International", 0, "https://ichef.bbci.co.uk/ace/standard/976/cpsprodpb/1909/live/b1ff39e0-392d-11ef-bdc5-41d7421c2adf.png"),
+        (str(uuid.uuid4()), "Formula 1", sport_ids["Motorsport"], "International", 0, "https://logodownload.org/wp-content/uploads/2016/11/formula-1-logo-0.png")
     ]
     
     cursor.executemany('''
@@ -156,7 +240,7 @@ def populate_sample_data():
     
     
     # 3. Nadal vs Djokovic - Equipos y datos
-    nadal_djokovic_teams = json.dumps([
+    nadal_djokovic_teams = json_codec.dumps([
         {
             "id": "rafael-nadal-001",
             "name": "Nadal",
@@ -171,7 +255,7 @@ def populate_sample_data():
         }
     ])
     
-    nadal_djokovic_markets = json.dumps([
+    nadal_djokovic_markets = json_codec.dumps([
         {
             "id": str(uuid.uuid4()),
             "name": "Match Winner",
@@ -216,7 +300,7 @@ def populate_sample_data():
         }
     ])
     
-    nadal_djokovic_stats = json.dumps({
+    nadal_djokovic_stats = json_codec.dumps({
         "team1_form": ["W", "W", "W", "W", "L"],
         "team2_form": ["W", "L", "W", "W", "W"],
         "head_to_head": {
@@ -247,7 +331,7 @@ def populate_sample_data():
     ))
     
     # 4. Ferrari vs Red Bull - Equipos y datos
-    ferrari_redbull_teams = json.dumps([
+    ferrari_redbull_teams = json_codec.dumps([
         {
             "id": "scuderia-ferrari-001",
             "name": "Ferrari",
@@ -262,7 +346,7 @@ def populate_sample_data():
         }
     ])
     
-    f1_markets = json.dumps([
+    f1_markets = json_codec.dumps([
         {
             "id": str(uuid.uuid4()),
             "name": "Race Winner",
@@ -286,7 +370,7 @@ def populate_sample_data():
         }
     ])
     
-    f1_stats = json.dumps({
+    f1_stats = json_codec.dumps({
         "team1_form": ["1", "3", "2", "1", "2"],
         "team2_form": ["2", "1", "1", "2", "1"],
         "head_to_head": {
@@ -312,12 +396,13 @@ def populate_sample_data():
         ferrari_redbull_teams,  # Equipos
         "upcoming",
         "https://mir-s3-cdn-cf.behance.net/project_modules/fs/c39372105002709.5f6f665700bd5.jpg",
-        f1_stats
+        f1_stats,
+        None  # Sin enlace de highlight
     ))
 
     
     # 8. Medvedev vs Alcaraz - Equipos y datos
-    medvedev_alcaraz_teams = json.dumps([
+    medvedev_alcaraz_teams = json_codec.dumps([
         {
             "id": "daniil-medvedev-001",
             "name": "Medvedev",
@@ -332,7 +417,7 @@ def populate_sample_data():
         }
     ])
     
-    medvedev_alcaraz_markets = json.dumps([
+    medvedev_alcaraz_markets = json_codec.dumps([
         {
             "id": str(uuid.uuid4()),
             "name": "Match Winner",
@@ -351,7 +436,7 @@ def populate_sample_data():
         }
     ])
     
-    medvedev_alcaraz_stats = json.dumps({
+    medvedev_alcaraz_stats = json_codec.dumps({
         "team1_form": ["W", "L", "W", "W", "L"],
         "team2_form": ["W", "W", "W", "W", "W"],
         "head_to_head": {
@@ -384,7 +469,7 @@ def populate_sample_data():
     
     
     # 10. Tyson vs Joshua - Equipos y datos
-    tyson_joshua_teams = json.dumps([
+    tyson_joshua_teams = json_codec.dumps([
         {
             "id": "tyson-fury-001",
             "name": "Tyson",
@@ -399,7 +484,7 @@ def populate_sample_data():
         }
     ])
     
-    tyson_joshua_markets = json.dumps([
+    tyson_joshua_markets = json_codec.dumps([
         {
             "id": str(uuid.uuid4()),
             "name": "Fight Outcome",
@@ -423,7 +508,7 @@ def populate_sample_data():
         }
     ])
     
-    tyson_joshua_stats = json.dumps({
+    tyson_joshua_stats = json_codec.dumps({
         "team1_form": ["W", "W", "W", "W", "W"],
         "team2_form": ["W", "L", "W", "W", "W"],
         "head_to_head": {
@@ -462,6 +547,11 @@ def populate_sample_data():
     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', events)
     
+    # Mantener sincronizadas las tablas markets/selections
+    from models.market import Market
+    for event in events:
+        Market.sync_event_markets(cursor, event[0], json_codec.loads(event[8]))
+    
     conn.commit()
     conn.close()
     
@@ -0,0 +1,33 @@
+from config import Config
+from models.user_stats import LEADERBOARD_METRICS, LEADERBOARD_TABLES
+from repositories import get_repository
+
+class Leaderboard:
+    # Rankings y periodos disponibles
+    METRICS = tuple(LEADERBOARD_METRICS)
+    PERIODS = tuple(LEADERBOARD_TABLES)
+    
+    @staticmethod
+    def get_top(metric, period, limit):
+        """
+        Obtiene las primeras posiciones de un ranking.
+        
+        Args:
+            metric: 'profit', 'roi' o 'win_rate'
+            period: 'all' (histórico) o '7d' (últimos 7 días)
+            limit: Número máximo de posiciones
+        
+        Returns:
+            Lista de entradas por puntuación descendente
+        """
+        return get_repository().bets.get_leaderboard(metric, period, limit, Config.LEADERBOARD_MIN_BETS)
+    
+    @staticmethod
+    def get_rank(user_id, metric, period):
+        """
+        Obtiene la posición de un usuario en un ranking.
+        
+        Returns:
+            Entrada del usuario; rank es None si no tiene apuestas suficientes
+        """
+        return get_repository().bets.get_leaderboard_rank(user_id, metric, period, Config.LEADERBOARD_MIN_BETS)
@@ -0,0 +1,113 @@
+from models.database import get_db_connection
+
+class Market:
+    @staticmethod
+    def sync_event_markets(cursor, event_id, markets):
+        """
+        Sincroniza las tablas markets y selections con el JSON de mercados de un evento.
+
+        Args:
+            cursor: Cursor de la transacción en curso (no se hace commit aquí)
+            event_id: ID del evento
+            markets: Lista de mercados tal y como se guarda en events.markets
+        """
+        cursor.execute("DELETE FROM selections WHERE event_id = ?", (event_id,))
+        cursor.execute("DELETE FROM markets WHERE event_id = ?", (event_id,))
+
+        market_rows = []
+        selection_rows = []
+        for market_position, market in enumerate(markets or []):
+            market_rows.append((market['id'], event_id, market['name'], market_position))
+            for selection_position, selection in enumerate(market.get('selections', [])):
+                selection_rows.append((
+                    selection['id'],
+                    market['id'],
+                    event_id,
+                    selection['name'],
+                    selection['odds'],
+                    selection_position,
+                    selection.get('result')
+                ))
+
+        cursor.executemany('''
+        INSERT INTO markets (id, event_id, name, position)
+        VALUES (?, ?, ?, ?)
+        ''', market_rows)
+
+        cursor.executemany('''
+        INSERT INTO selections (id, market_id, event_id, name, odds, position, result)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', selection_rows)
+
+    @staticmethod
+    def find_selection(cursor, selection_id):
+        """
+        Busca una selección junto con su mercado y su evento usando el índice por ID.
+
+        Args:
+            cursor: Cursor a utilizar para la consulta
+            selection_id: ID de la selección
+
+        Returns:
+            Dict con los datos de la selección y su evento, o None si no existe
+        """
+        # Los IDs de selección no son únicos en datos antiguos: se elige la
+        # primera coincidencia en orden de eventos, mercados y selecciones
+        cursor.execute('''
+        SELECT s.id AS selection_id, s.name AS selection_name, s.odds, s.result,
+               s.market_id, m.name AS market_name,
+               e.id AS event_id, e.name AS event_name, e.start_time, e.status AS event_status
+        FROM selections s
+        JOIN markets m ON m.event_id = s.event_id AND m.id = s.market_id
+        JOIN events e ON e.id = s.event_id
+        WHERE s.id = ?
+        ORDER BY e.rowid, m.position, s.position
+        LIMIT 1
+        ''', (selection_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    @staticmethod
+    def find_selections(cursor, selection_ids):
+        """
+        Busca varias selecciones con una sola consulta.
+        
+        Args:
+            cursor: Cursor a utilizar para la consulta
+            selection_ids: IDs de las selecciones
+        
+        Returns:
+            Dict {selection_id: datos como en find_selection}; los IDs inexistentes no aparecen
+        """
+        unique_ids = list(dict.fromkeys(selection_ids))
+        if not unique_ids:
+            return {}
+        
+        placeholders = ", ".join("?" for _ in unique_ids)
+        cursor.execute(f'''
+        SELECT s.id AS selection_id, s.name AS selection_name, s.odds, s.result,
+               s.market_id, m.name AS market_name,
+               e.id AS event_id, e.name AS event_name, e.start_time, e.status AS event_status
+        FROM selections s
+        JOIN markets m ON m.event_id = s.event_id AND m.id = s.market_id
+        JOIN events e ON e.id = s.event_id
+        WHERE s.id IN ({placeholders})
+        ORDER BY e.rowid, m.position, s.position
+        ''', unique_ids)
+        
+        # Igual que find_selection: ante IDs repetidos gana la primera coincidencia
+        selections = {}
+        for row in cursor.fetchall():
+            selections.setdefault(row['selection_id'], dict(row))
+        return selections
+    
+    @staticmethod
+    def get_selection(selection_id):
+        """Obtiene una selección y su evento abriendo su propia conexión."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        selection = Market.find_selection(cursor, selection_id)
+
+        conn.close()
+        return selection
@@ -0,0 +1,650 @@
+# Archivo: backend/models/migrations.py
+
+import datetime
+
+from models.database import get_db_connection
+from utils import json_codec
+
+# Migraciones registradas: lista de (versión, descripción, función)
+MIGRATIONS = []
+
+def migration(version, description):
+    """Registra una función como migración versionada. La función recibe un cursor."""
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        return func
+    return decorator
+
+def _table_columns(cursor, table):
+    """Devuelve los nombres de columna de una tabla."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+def _add_column(cursor, table, column, definition):
+    """Añade una columna si todavía no existe (bases creadas con scripts antiguos)."""
+    if column not in _table_columns(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+@migration(1, "Columnas end_time y teams en events")
+def _events_end_time_and_teams(cursor):
+    _add_column(cursor, "events", "end_time", "TEXT")
+    _add_column(cursor, "events", "teams", "TEXT")
+
+    # Rellenar equipos y fecha de fin de los eventos antiguos
+    cursor.execute("SELECT id, name, start_time FROM events WHERE teams IS NULL OR end_time IS NULL")
+    for event_id, event_name, start_time in cursor.fetchall():
+        teams = []
+        if " vs " in event_name:
+            team_names = event_name.split(" vs ")
+            teams = [
+                {
+                    "id": f"{team_names[0].lower().replace(' ', '-')}-001",
+                    "name": team_names[0],
+                    "logo_url": f"/{team_names[0][0].lower()}.png",
+                    "is_home": True
+                },
+                {
+                    "id": f"{team_names[1].lower().replace(' ', '-')}-001",
+                    "name": team_names[1],
+                    "logo_url": f"/{team_names[1][0].lower()}.png",
+                    "is_home": False
+                }
+            ]
+
+        # Fecha de fin por defecto: 2 horas después del inicio
+        try:
+            end_time = (datetime.datetime.fromisoformat(start_time) + datetime.timedelta(hours=2)).isoformat()
+        except (TypeError, ValueError):
+            end_time = None
+
+        cursor.execute(
+            "UPDATE events SET teams = COALESCE(teams, ?), end_time = COALESCE(end_time, ?) WHERE id = ?",
+            (json_codec.dumps(teams) if teams else None, end_time, event_id)
+        )
+
+@migration(2, "Columna highlights_url en events")
+def _events_highlights_url(cursor):
+    _add_column(cursor, "events", "highlights_url", "TEXT")
+
+    highlights_data = [
+        ('Lakers vs Celtics', 'https://www.youtube.com/watch?v=hUbrUO5xFrM'),
+        ('Nadal vs Djokovic', 'https://www.youtube.com/watch?v=X8VH-Tb5BM4'),
+        ('Ferrari vs Red Bull Racing', 'https://www.youtube.com/watch?v=IfNYcNZZCLI'),
+        ('Warriors vs Suns', 'https://www.youtube.com/watch?v=X7BLBkCfGh0'),
+        ('Medvedev vs Alcaraz', 'https://www.youtube.com/watch?v=d3LPhPDLKA4'),
+        ('Arsenal vs Tottenham', 'https://www.youtube.com/watch?v=SXm5pG2abw0'),
+        ('Tyson vs Joshua', 'https://www.youtube.com/watch?v=nPp8ynCLiQQ')
+    ]
+    cursor.executemany(
+        "UPDATE events SET highlights_url = ? WHERE name = ? AND highlights_url IS NULL",
+        [(url, name) for name, url in highlights_data]
+    )
+
+@migration(3, "Tablas normalizadas markets y selections")
+def _markets_and_selections(cursor):
+    from models.market import Market
+
+    # Los IDs de mercado y selección se repiten entre eventos en datos antiguos,
+    # por eso la clave primaria incluye el evento (y el mercado)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS markets (
+        id TEXT NOT NULL,
+        event_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (event_id, id),
+        FOREIGN KEY (event_id) REFERENCES events (id) ON DELETE CASCADE
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS selections (
+        id TEXT NOT NULL,
+        market_id TEXT NOT NULL,
+        event_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        odds REAL NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        result TEXT,
+        PRIMARY KEY (event_id, market_id, id),
+        FOREIGN KEY (event_id, market_id) REFERENCES markets (event_id, id) ON DELETE CASCADE
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_selections_id ON selections (id)")
+
+    # Rellenar desde el JSON de los eventos existentes
+    cursor.execute("SELECT id, markets FROM events")
+    for event_id, markets in cursor.fetchall():
+        Market.sync_event_markets(cursor, event_id, json_codec.loads(markets) if markets else [])
+
+    # Cada apuesta guarda el evento y el mercado exactos de su selección
+    _add_column(cursor, "bets", "event_id", "TEXT")
+    _add_column(cursor, "bets", "market_id", "TEXT")
+    cursor.execute("SELECT DISTINCT selection_id FROM bets WHERE event_id IS NULL")
+    for (selection_id,) in cursor.fetchall():
+        selection = Market.find_selection(cursor, selection_id)
+        if selection:
+            cursor.execute(
+                "UPDATE bets SET event_id = ?, market_id = ? WHERE selection_id = ? AND event_id IS NULL",
+                (selection['event_id'], selection['market_id'], selection_id)
+            )
+
+@migration(4, "Índices de consulta de eventos")
+def _events_indexes(cursor):
+    # Listados: get_featured (con y sin sport_type), get_live_events,
+    # get_events_by_competition; todos ordenados por start_time
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_start_time ON events (start_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_sport_start ON events (sport_type, start_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_status_start ON events (status, start_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_competition_start ON events (competition, start_time)")
+
+@migration(5, "Índices de consulta de apuestas")
+def _bets_indexes(cursor):
+    # Historial por usuario (con y sin filtro de estado) y estadísticas
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_user_status_created ON bets (user_id, status, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_user_created ON bets (user_id, created_at)")
+    # Apuestas pendientes de liquidar
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_status_result_time ON bets (status, estimated_result_time)")
+
+@migration(6, "Índices con desempate por id para la paginación por cursor")
+def _keyset_pagination_indexes(cursor):
+    # La paginación por cursor ordena por (start_time, id) y (created_at, id);
+    # incluir id en el índice evita el ordenamiento temporal de los empates
+    for old_index in ("idx_events_start_time", "idx_events_sport_start", "idx_events_status_start",
+                      "idx_events_competition_start", "idx_bets_user_status_created", "idx_bets_user_created"):
+        cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_start_id ON events (start_time, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_sport_start_id ON events (sport_type, start_time, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_status_start_id ON events (status, start_time, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_competition_start_id ON events (competition, start_time, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_user_status_created_id ON bets (user_id, status, created_at, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_user_created_id ON bets (user_id, created_at, id)")
+
+@migration(7, "Índice de texto completo FTS5 de eventos")
+def _events_fts(cursor):
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        name, description, competition, venue, teams,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''')
+
+    # Nombres de los equipos como texto plano a partir del JSON de events.teams
+    teams_text = """(
+        SELECT group_concat(json_extract(value, '$.name'), ' ')
+        FROM json_each(CASE WHEN json_valid({0}.teams) THEN {0}.teams ELSE '[]' END)
+    )"""
+    insert_fts = f"""
+        INSERT INTO events_fts (rowid, name, description, competition, venue, teams)
+        VALUES (NEW.rowid, NEW.name, NEW.description, NEW.competition, NEW.venue, {teams_text.format('NEW')});
+    """
+
+    # Triggers que mantienen el índice al día con la tabla events
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_fts_after_insert AFTER INSERT ON events BEGIN
+        {insert_fts}
+    END
+    """)
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS events_fts_after_delete AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = OLD.rowid;
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_fts_after_update
+    AFTER UPDATE OF name, description, competition, venue, teams ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = OLD.rowid;
+        {insert_fts}
+    END
+    """)
+
+    cursor.execute("DELETE FROM events_fts")
+    cursor.execute(f"""
+    INSERT INTO events_fts (rowid, name, description, competition, venue, teams)
+    SELECT events.rowid, name, description, competition, venue, {teams_text.format('events')}
+    FROM events
+    """)
+
+# Proyección de listado (misma forma que repositories.base.format_event_card)
+# serializada como JSON a partir de una fila de events
+EVENT_CARD_SQL = """json_object(
+    'id', {0}.id,
+    'name', {0}.name,
+    'sport_type', {0}.sport_type,
+    'competition', {0}.competition,
+    'start_time', {0}.start_time,
+    'end_time', {0}.end_time,
+    'teams', CASE WHEN json_valid({0}.teams) AND json_type({0}.teams) = 'array'
+                  THEN json({0}.teams) ELSE json_array() END,
+    'main_markets', CASE WHEN json_valid({0}.markets) AND json_array_length({0}.markets) > 0
+                         THEN json_array(json(json_extract({0}.markets, '$[0]'))) ELSE json_array() END,
+    'status', {0}.status,
+    'image_url', {0}.image_url,
+    'highlights_url', {0}.highlights_url
+)"""
+
+@migration(8, "Proyección de listado precalculada en events.card")
+def _events_card(cursor):
+    _add_column(cursor, "events", "card", "TEXT")
+
+    # La tarjeta se recalcula al insertar el evento y cuando cambia cualquiera de
+    # las columnas que la componen
+    update_card = f"UPDATE events SET card = {EVENT_CARD_SQL.format('NEW')} WHERE rowid = NEW.rowid;"
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_card_after_insert AFTER INSERT ON events BEGIN
+        {update_card}
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_card_after_update
+    AFTER UPDATE OF id, name, sport_type, competition, start_time, end_time, teams, markets,
+                    status, image_url, highlights_url ON events BEGIN
+        {update_card}
+    END
+    """)
+
+    cursor.execute(f"UPDATE events SET card = {EVENT_CARD_SQL.format('events')}")
+
+@migration(9, "Contadores active_events_count mantenidos por triggers")
+def _active_event_counters(cursor):
+    from models.active_events import ACTIVE_STATUSES_SQL, recount_active_events
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sports_lower_name ON sports (lower(name))")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_competitions_sport_name ON competitions (sport_id, name)")
+
+    # Suma delta a los contadores del deporte y la competición de una fila de events
+    def adjust(row, delta):
+        return f"""
+        UPDATE sports SET active_events_count = active_events_count + ({delta})
+        WHERE lower(name) = {row}.sport_type AND {row}.status IN {ACTIVE_STATUSES_SQL};
+        UPDATE competitions SET active_events_count = active_events_count + ({delta})
+        WHERE name = {row}.competition AND {row}.status IN {ACTIVE_STATUSES_SQL}
+          AND sport_id IN (SELECT id FROM sports WHERE lower(name) = {row}.sport_type);
+        """
+
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_active_count_after_insert AFTER INSERT ON events BEGIN
+        {adjust('NEW', 1)}
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_active_count_after_delete AFTER DELETE ON events BEGIN
+        {adjust('OLD', -1)}
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS events_active_count_after_update
+    AFTER UPDATE OF status, sport_type, competition ON events BEGIN
+        {adjust('OLD', -1)}
+        {adjust('NEW', 1)}
+    END
+    """)
+
+    # Sustituir los valores fijos de los datos de ejemplo por los reales
+    recount_active_events(cursor)
+
+# Fecha ISO (hora local si no lleva zona) a segundos epoch UTC; igual que utils.timestamps.to_epoch
+EPOCH_SQL = "CAST(strftime('%s', {0}, 'utc') AS INTEGER)"
+
+@migration(10, "Columnas de fecha en segundos epoch (UTC) para events y bets")
+def _epoch_timestamp_columns(cursor):
+    _add_column(cursor, "events", "start_ts", "INTEGER")
+    _add_column(cursor, "events", "end_ts", "INTEGER")
+    _add_column(cursor, "bets", "created_ts", "INTEGER")
+    _add_column(cursor, "bets", "estimated_result_ts", "INTEGER")
+
+    # Sin end_time, el evento dura 2 horas (como en SimulationService)
+    start_ts = EPOCH_SQL.format('{0}.start_time')
+    set_event_ts = f"""
+        start_ts = {start_ts},
+        end_ts = COALESCE({EPOCH_SQL.format('{0}.end_time')}, {start_ts} + 7200)
+    """
+    set_bet_ts = f"""
+        created_ts = {EPOCH_SQL.format('{0}.created_at')},
+        estimated_result_ts = {EPOCH_SQL.format('{0}.estimated_result_time')}
+    """
+
+    # Las cadenas ISO siguen siendo la fuente de verdad; los triggers mantienen
+    # las columnas *_ts sincronizadas
+    for table, columns, set_sql in (("events", "start_time, end_time", set_event_ts),
+                                    ("bets", "created_at, estimated_result_time", set_bet_ts)):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ts_after_insert AFTER INSERT ON {table} BEGIN
+            UPDATE {table} SET {set_sql.format('NEW')} WHERE rowid = NEW.rowid;
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_ts_after_update AFTER UPDATE OF {columns} ON {table} BEGIN
+            UPDATE {table} SET {set_sql.format('NEW')} WHERE rowid = NEW.rowid;
+        END
+        """)
+        cursor.execute(f"UPDATE {table} SET {set_sql.format(table)}")
+
+    # Listados y filtros de fecha como recorridos de rango sobre start_ts
+    for old_index in ("idx_events_start_id", "idx_events_sport_start_id", "idx_events_status_start_id",
+                      "idx_events_competition_start_id", "idx_bets_status_result_time"):
+        cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_start_ts_id ON events (start_ts, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_sport_start_ts_id ON events (sport_type, start_ts, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_status_start_ts_id ON events (status, start_ts, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_competition_start_ts_id ON events (competition, start_ts, id)")
+    # Transición a 'completed' y apuestas pendientes de liquidar
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_events_status_end_ts ON events (status, end_ts)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bets_status_result_ts ON bets (status, estimated_result_ts)")
+
+@migration(11, "Registro de llegada de resultados y marca de agua de liquidación")
+def _settlement_watermark(cursor):
+    # Registro de solo inserción: una fila cada vez que llegan resultados de un evento
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS event_result_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id TEXT NOT NULL,
+        recorded_at TEXT NOT NULL
+    )
+    ''')
+
+    # Última posición del registro ya liquidada (fila única)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS settlement_watermark (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_seq INTEGER NOT NULL,
+        updated_at TEXT
+    )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO settlement_watermark (id, last_seq) VALUES (1, 0)")
+
+    # Apuestas pendientes de cada selección, para liquidarlas con un solo UPDATE
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_bets_placed_selection
+    ON bets (event_id, market_id, selection_id) WHERE status = 'placed'
+    ''')
+
+    # Los eventos que ya tienen resultados se liquidan en el primer ciclo
+    cursor.execute("""
+    INSERT INTO event_result_log (event_id, recorded_at)
+    SELECT DISTINCT e.id, ?
+    FROM events e
+    JOIN selections s ON s.event_id = e.id
+    WHERE e.status = 'completed' AND s.result IS NOT NULL
+    """, (datetime.datetime.now().isoformat(),))
+
+@migration(12, "Tabla event_results con la selección ganadora de cada mercado")
+def _event_results(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS event_results (
+        event_id TEXT NOT NULL,
+        market_id TEXT NOT NULL,
+        winning_selection_id TEXT NOT NULL,
+        resolved_at TEXT NOT NULL,
+        PRIMARY KEY (event_id, market_id),
+        FOREIGN KEY (event_id, market_id) REFERENCES markets (event_id, id) ON DELETE CASCADE
+    )
+    ''')
+
+    # Conservar los resultados ya simulados en el JSON de mercados
+    cursor.execute("""
+    INSERT OR IGNORE INTO event_results (event_id, market_id, winning_selection_id, resolved_at)
+    SELECT s.event_id, s.market_id, s.id, ?
+    FROM selections s
+    WHERE s.result = 'win'
+    """, (datetime.datetime.now().isoformat(),))
+
+@migration(13, "Tabla user_stats con las estadísticas de apuestas de cada usuario")
+def _user_stats(cursor):
+    from models.user_stats import user_stats_upsert_sql, rebuild_user_stats
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_stats (
+        user_id TEXT PRIMARY KEY,
+        total_bets INTEGER NOT NULL DEFAULT 0,
+        win_count INTEGER NOT NULL DEFAULT 0,
+        loss_count INTEGER NOT NULL DEFAULT 0,
+        void_count INTEGER NOT NULL DEFAULT 0,
+        half_win_count INTEGER NOT NULL DEFAULT 0,
+        half_loss_count INTEGER NOT NULL DEFAULT 0,
+        total_staked REAL NOT NULL DEFAULT 0,
+        total_returned REAL NOT NULL DEFAULT 0,
+        total_profit REAL NOT NULL DEFAULT 0
+    )
+    ''')
+
+    # Se resta la aportación anterior de la apuesta y se suma la nueva; así
+    # cubren settle_bet, simulate_results y los UPDATE por mercado de la liquidación
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_after_insert AFTER INSERT ON bets
+    WHEN NEW.status = 'settled' BEGIN
+        {user_stats_upsert_sql('NEW', '+')};
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_after_update
+    AFTER UPDATE OF user_id, status, result, stake_amount, potential_return ON bets
+    WHEN OLD.status = 'settled' OR NEW.status = 'settled' BEGIN
+        {user_stats_upsert_sql('OLD', '-')};
+        {user_stats_upsert_sql('NEW', '+')};
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS user_stats_after_delete AFTER DELETE ON bets
+    WHEN OLD.status = 'settled' BEGIN
+        {user_stats_upsert_sql('OLD', '-')};
+    END
+    """)
+
+    rebuild_user_stats(cursor)
+
+@migration(14, "Cubos diarios y ventana de 7 días de user_stats para el ranking")
+def _leaderboard(cursor):
+    from models.user_stats import (
+        LEADERBOARD_METRICS, LEADERBOARD_TABLES, user_stats_upsert_sql, rebuild_leaderboard_window
+    )
+
+    # Instante de liquidación; las apuestas ya liquidadas toman la hora estimada del resultado
+    _add_column(cursor, "bets", "settled_ts", "INTEGER")
+    cursor.execute("""
+    UPDATE bets SET settled_ts = COALESCE(estimated_result_ts, created_ts)
+    WHERE status = 'settled' AND settled_ts IS NULL
+    """)
+
+    now_ts = "CAST(strftime('%s', 'now') AS INTEGER)"
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS bets_settled_ts_after_insert AFTER INSERT ON bets
+    WHEN NEW.status = 'settled' AND NEW.settled_ts IS NULL BEGIN
+        UPDATE bets SET settled_ts = {now_ts} WHERE rowid = NEW.rowid;
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS bets_settled_ts_after_update AFTER UPDATE OF status ON bets
+    WHEN (OLD.status = 'settled') IS NOT (NEW.status = 'settled') BEGIN
+        UPDATE bets SET settled_ts = CASE WHEN NEW.status = 'settled' THEN {now_ts} END
+        WHERE rowid = NEW.rowid;
+    END
+    """)
+
+    stats_columns = """
+        total_bets INTEGER NOT NULL DEFAULT 0,
+        win_count INTEGER NOT NULL DEFAULT 0,
+        loss_count INTEGER NOT NULL DEFAULT 0,
+        void_count INTEGER NOT NULL DEFAULT 0,
+        half_win_count INTEGER NOT NULL DEFAULT 0,
+        half_loss_count INTEGER NOT NULL DEFAULT 0,
+        total_staked REAL NOT NULL DEFAULT 0,
+        total_returned REAL NOT NULL DEFAULT 0,
+        total_profit REAL NOT NULL DEFAULT 0
+    """
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS user_stats_daily (
+        user_id TEXT NOT NULL,
+        day INTEGER NOT NULL,
+        {stats_columns},
+        PRIMARY KEY (user_id, day)
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_stats_daily_day ON user_stats_daily (day)")
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS user_stats_7d (
+        user_id TEXT PRIMARY KEY,
+        {stats_columns}
+    )
+    """)
+    # Primer día (días desde epoch) de la ventana móvil (fila única)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS leaderboard_window (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        start_day INTEGER NOT NULL
+    )
+    ''')
+
+    tables = ("user_stats_daily", "user_stats_7d")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS leaderboard_after_insert AFTER INSERT ON bets
+    WHEN NEW.status = 'settled' BEGIN
+        {"; ".join(user_stats_upsert_sql('NEW', '+', table) for table in tables)};
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS leaderboard_after_update
+    AFTER UPDATE OF user_id, status, result, stake_amount, potential_return ON bets
+    WHEN OLD.status = 'settled' OR NEW.status = 'settled' BEGIN
+        {"; ".join(user_stats_upsert_sql('OLD', '-', table) for table in tables)};
+        {"; ".join(user_stats_upsert_sql('NEW', '+', table) for table in tables)};
+    END
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS leaderboard_after_delete AFTER DELETE ON bets
+    WHEN OLD.status = 'settled' BEGIN
+        {"; ".join(user_stats_upsert_sql('OLD', '-', table) for table in tables)};
+    END
+    """)
+
+    # Top-N y posición de un usuario como recorridos del índice de cada ranking
+    for period, table in LEADERBOARD_TABLES.items():
+        for metric, expression in LEADERBOARD_METRICS.items():
+            cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table}_{metric}
+            ON {table} (({expression}) DESC, user_id, total_bets)
+            """)
+
+    rebuild_leaderboard_window(cursor)
+
+@migration(15, "Tablas jobs y job_leases para los trabajos en segundo plano")
+def _jobs(cursor):
+    # params, progress, phases y result se guardan como JSON
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        status TEXT NOT NULL,
+        params TEXT NOT NULL DEFAULT '{}',
+        progress TEXT NOT NULL DEFAULT '{}',
+        phases TEXT NOT NULL DEFAULT '[]',
+        result TEXT,
+        error TEXT,
+        created_by TEXT,
+        created_at TEXT NOT NULL,
+        started_at TEXT,
+        finished_at TEXT
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_kind_created ON jobs (kind, created_at)")
+
+    # Una fila por tipo de trabajo en curso; expires_ts (epoch) se renueva en
+    # cada tramo y una concesión vencida se puede volver a tomar
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_leases (
+        name TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        expires_ts INTEGER NOT NULL
+    )
+    ''')
+
+@migration(16, "Tablas sessions y session_revocations para las sesiones compartidas entre procesos")
+def _sessions(cursor):
+    # Se guarda el SHA-256 del token, nunca el token; expires_ts en epoch
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        created_ts INTEGER NOT NULL,
+        expires_ts INTEGER NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_ts)")
+
+    # Registro de sesiones revocadas que cada proceso lee para vaciar su caché;
+    # AUTOINCREMENT evita reutilizar IDs tras el barrido
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS session_revocations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        token_hash TEXT NOT NULL,
+        expires_ts INTEGER NOT NULL
+    )
+    ''')
+
+def _ensure_migrations_table(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        description TEXT NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+    ''')
+
+def get_applied_versions():
+    """Devuelve el conjunto de versiones ya aplicadas."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    _ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cursor.fetchall()}
+
+    conn.close()
+    return versions
+
+def run_migrations(verbose=False):
+    """
+    Aplica en orden las migraciones pendientes.
+
+    Cada migración se ejecuta en su propia transacción (BEGIN IMMEDIATE) junto con
+    el registro de su versión, por lo que nunca se aplica dos veces aunque varios
+    procesos arranquen a la vez.
+
+    Returns:
+        Lista de versiones aplicadas en esta ejecución
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    _ensure_migrations_table(cursor)
+    applied_now = []
+
+    for version, description, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Comprobar dentro de la transacción por si otro proceso ya la aplicó
+            cursor.execute("SELECT 1 FROM schema_migrations WHERE version = ?", (version,))
+            if cursor.fetchone():
+                conn.rollback()
+                continue
+
+            if verbose:
+                print(f"Aplicando migración {version}: {description}")
+
+            func(cursor)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.datetime.now().isoformat())
+            )
+            conn.commit()
+            applied_now.append(version)
+        except Exception:
+            conn.rollback()
+            raise
+
+    conn.close()
+    return applied_now
@@ -1,14 +1,14 @@
-from models.database import get_db_connection
+from repositories import get_repository
+from services.catalog_service import CatalogService
 
 class Sport:
     @staticmethod
     def get_all():
-        """Obtiene todos los deportes de la base de datos."""
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT id, name, active_events_count, icon_url FROM sports")
-        sports = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
-        return sports
\ No newline at end of file
+        """Obtiene todos los deportes."""
+        return get_repository().sports.get_all()
+    
+    @staticmethod
+    def reconcile_active_event_counts():
+        """Recalcula los contadores de eventos activos de deportes y competiciones."""
+        get_repository().sports.reconcile_active_event_counts()
+        CatalogService.refresh()
@@ -0,0 +1,189 @@
+# Archivo: backend/models/user_stats.py
+#
+# Estadísticas agregadas de apuestas por usuario. Cada fila acumula las
+# apuestas liquidadas de un usuario:
+#
+#   user_stats        histórico completo (migración 13)
+#   user_stats_daily  un cubo por usuario y día UTC de liquidación (migración 14)
+#   user_stats_7d     suma de los cubos de la ventana móvil (migración 14)
+#
+# Los triggers de bets las actualizan en la misma transacción que liquida la
+# apuesta, de modo que /bets/stats es una lectura por clave primaria y el
+# ranking (/leaderboard) un recorrido de índice. rebuild_user_stats y
+# rebuild_leaderboard_window las recalculan desde cero a partir de bets.
+
+from utils.timestamps import now_epoch
+
+# Columnas acumuladas y su aportación por apuesta liquidada; {0} es la fila
+# (NEW, OLD o bets). Misma lógica que accumulate_user_stats en repositories/base.py
+USER_STATS_COLUMNS = (
+    ("total_bets", "1"),
+    ("win_count", "({0}.result IS 'win')"),
+    ("loss_count", "({0}.result IS 'loss')"),
+    ("void_count", "({0}.result IS 'void')"),
+    ("half_win_count", "({0}.result IS 'half_win')"),
+    ("half_loss_count", "({0}.result IS 'half_loss')"),
+    ("total_staked", "{0}.stake_amount"),
+    ("total_returned", """CASE {0}.result
+        WHEN 'win' THEN {0}.potential_return
+        WHEN 'void' THEN {0}.stake_amount
+        WHEN 'half_win' THEN {0}.stake_amount + ({0}.potential_return - {0}.stake_amount) / 2.0
+        WHEN 'half_loss' THEN {0}.stake_amount / 2.0
+        ELSE 0 END"""),
+    ("total_profit", """CASE {0}.result
+        WHEN 'win' THEN {0}.potential_return - {0}.stake_amount
+        WHEN 'loss' THEN -{0}.stake_amount
+        WHEN 'half_win' THEN ({0}.potential_return - {0}.stake_amount) / 2.0
+        WHEN 'half_loss' THEN -{0}.stake_amount / 2.0
+        ELSE 0 END""")
+)
+
+# Días de la ventana móvil del ranking (el día actual y los anteriores)
+LEADERBOARD_WINDOW_DAYS = 7
+
+# Puntuación de cada ranking sobre las columnas acumuladas. Las mismas
+# expresiones indexan user_stats y user_stats_7d; misma lógica que
+# leaderboard_score en repositories/base.py
+LEADERBOARD_METRICS = {
+    "profit": "total_profit",
+    "roi": "CASE WHEN total_staked > 0 THEN total_profit * 100.0 / total_staked ELSE 0 END",
+    "win_rate": """CASE WHEN total_bets > 0
+        THEN (win_count + (half_win_count + half_loss_count) / 2.0) * 100.0 / total_bets
+        ELSE 0 END"""
+}
+
+# Periodo del ranking -> tabla de estadísticas
+LEADERBOARD_TABLES = {
+    "all": "user_stats",
+    "7d": "user_stats_7d"
+}
+
+# Día UTC de liquidación de una apuesta; las filas aún sin settled_ts (el
+# trigger que lo rellena puede ejecutarse después) se liquidan ahora
+SETTLED_DAY_SQL = "(COALESCE({0}.settled_ts, CAST(strftime('%s', 'now') AS INTEGER)) / 86400)"
+
+# Primer día incluido en user_stats_daily y user_stats_7d
+WINDOW_START_SQL = "(SELECT start_day FROM leaderboard_window WHERE id = 1)"
+
+def _column_list():
+    return ", ".join(name for name, _ in USER_STATS_COLUMNS)
+
+def user_stats_upsert_sql(row, sign, table="user_stats"):
+    """
+    Sentencia que suma (sign='+') o resta (sign='-') la aportación de una apuesta
+    a la fila de su usuario, solo si la apuesta está liquidada.
+
+    En user_stats_daily y user_stats_7d solo cuentan las apuestas liquidadas
+    dentro de la ventana; las anteriores ya salieron de ambas tablas.
+
+    Args:
+        row: Fila de la apuesta dentro del trigger ('NEW' u 'OLD')
+        sign: '+' o '-'
+        table: 'user_stats', 'user_stats_daily' o 'user_stats_7d'
+    """
+    keys = ["user_id"]
+    key_values = [f"{row}.user_id"]
+    conditions = [f"{row}.status = 'settled'"]
+
+    if table != "user_stats":
+        day = SETTLED_DAY_SQL.format(row)
+        conditions.append(f"{day} >= {WINDOW_START_SQL}")
+        if table == "user_stats_daily":
+            keys.append("day")
+            key_values.append(day)
+
+    values = ", ".join(f"{sign}({expr.format(row)})" for _, expr in USER_STATS_COLUMNS)
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name, _ in USER_STATS_COLUMNS)
+    return f"""
+    INSERT INTO {table} ({", ".join(keys)}, {_column_list()})
+    SELECT {", ".join(key_values)}, {values}
+    WHERE {" AND ".join(conditions)}
+    ON CONFLICT ({", ".join(keys)}) DO UPDATE SET {updates}
+    """
+
+def window_start(today):
+    """Primer día de la ventana móvil que termina en today (días desde epoch)."""
+    return today - (LEADERBOARD_WINDOW_DAYS - 1)
+
+def roll_leaderboard_window(cursor, today=None):
+    """
+    Avanza la ventana móvil hasta el día actual.
+
+    Resta de user_stats_7d los cubos diarios que salen de la ventana y los
+    elimina; solo recorre esos cubos, nunca bets.
+
+    Args:
+        cursor: Cursor de la transacción en curso (no se hace commit aquí)
+        today: Día actual en días desde epoch (por defecto, hoy en UTC)
+
+    Returns:
+        True si la ventana avanzó
+    """
+    start = window_start(now_epoch() // 86400 if today is None else today)
+
+    cursor.execute("SELECT start_day FROM leaderboard_window WHERE id = 1")
+    if cursor.fetchone()['start_day'] >= start:
+        return False
+
+    subtracted = ", ".join(f"-SUM({name})" for name, _ in USER_STATS_COLUMNS)
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name, _ in USER_STATS_COLUMNS)
+    cursor.execute(f"""
+    INSERT INTO user_stats_7d (user_id, {_column_list()})
+    SELECT user_id, {subtracted}
+    FROM user_stats_daily
+    WHERE day < ?
+    GROUP BY user_id
+    ON CONFLICT (user_id) DO UPDATE SET {updates}
+    """, (start,))
+    cursor.execute("DELETE FROM user_stats_daily WHERE day < ?", (start,))
+    cursor.execute("DELETE FROM user_stats_7d WHERE total_bets <= 0")
+    cursor.execute("UPDATE leaderboard_window SET start_day = ? WHERE id = 1", (start,))
+    return True
+
+def _bet_sums():
+    return ", ".join(f"SUM({expr.format('bets')})" for _, expr in USER_STATS_COLUMNS)
+
+def rebuild_user_stats(cursor):
+    """
+    Recalcula todas las filas de user_stats en una sola pasada sobre bets.
+
+    Args:
+        cursor: Cursor de la transacción en curso (no se hace commit aquí)
+    """
+    cursor.execute("DELETE FROM user_stats")
+    cursor.execute(f"""
+    INSERT INTO user_stats (user_id, {_column_list()})
+    SELECT user_id, {_bet_sums()}
+    FROM bets
+    WHERE status = 'settled'
+    GROUP BY user_id
+    """)
+
+def rebuild_leaderboard_window(cursor):
+    """
+    Recalcula user_stats_daily y user_stats_7d con la ventana terminada hoy.
+
+    Args:
+        cursor: Cursor de la transacción en curso (no se hace commit aquí)
+    """
+    columns = _column_list()
+    settled_day = SETTLED_DAY_SQL.format("bets")
+    start = window_start(now_epoch() // 86400)
+
+    cursor.execute("INSERT OR REPLACE INTO leaderboard_window (id, start_day) VALUES (1, ?)", (start,))
+    cursor.execute("DELETE FROM user_stats_daily")
+    cursor.execute(f"""
+    INSERT INTO user_stats_daily (user_id, day, {columns})
+    SELECT user_id, {settled_day}, {_bet_sums()}
+    FROM bets
+    WHERE status = 'settled' AND {settled_day} >= ?
+    GROUP BY user_id, {settled_day}
+    """, (start,))
+
+    cursor.execute("DELETE FROM user_stats_7d")
+    cursor.execute(f"""
+    INSERT INTO user_stats_7d (user_id, {columns})
+    SELECT user_id, {", ".join(f"SUM({name})" for name, _ in USER_STATS_COLUMNS)}
+    FROM user_stats_daily
+    GROUP BY user_id
+    """)
@@ -0,0 +1,28 @@
+import threading
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def get_repository():
+    """
+    Devuelve el repositorio de datos configurado (REPOSITORY_BACKEND).
+
+    - 'sqlite' (por defecto): base de datos SQLite
+    - 'memory': datos de utils/mock_data.py indexados en memoria, para pruebas de carga
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                from config import Config
+                backend = Config.REPOSITORY_BACKEND
+
+                if backend == 'sqlite':
+                    from repositories.sqlite_repository import create_sqlite_repository
+                    _repository = create_sqlite_repository()
+                elif backend == 'memory':
+                    from repositories.memory_repository import create_memory_repository
+                    _repository = create_memory_repository()
+                else:
+                    raise ValueError(f"Unknown repository backend: {backend}")
+    return _repository
@@ -0,0 +1,310 @@
+# Archivo: backend/repositories/base.py
+#
+# Interfaz común de acceso a datos para los modelos Event, Bet, Sport y
+# Competition, junto con el formateo compartido por todas las implementaciones.
+
+from utils import json_codec
+from utils.json_codec import RawJSON
+
+class SportRepository:
+    def get_all(self):
+        """Obtiene todos los deportes."""
+        raise NotImplementedError
+
+    def reconcile_active_event_counts(self):
+        """Recalcula active_events_count de deportes y competiciones a partir de los eventos."""
+        raise NotImplementedError
+
+class CompetitionRepository:
+    def get_all(self, sport_id=None):
+        """Obtiene las competiciones, opcionalmente filtradas por deporte."""
+        raise NotImplementedError
+
+class EventRepository:
+    def get_featured(self, sport_type=None, date_from=None, date_to=None, limit=10, page=1, cursor=None, include_total=True):
+        """
+        Lista eventos por (start_time, id) con filtros opcionales.
+
+        En todos los listados, "events" contiene las tarjetas de cada evento ya
+        serializadas (RawJSON, ver format_event_card) para enviarlas sin decodificar.
+        """
+        raise NotImplementedError
+
+    def get_by_id(self, event_id):
+        """Obtiene un evento completo (mercados, equipos y estadísticas decodificados)."""
+        raise NotImplementedError
+
+    def get_all_events(self):
+        """Obtiene todos los eventos completos (para construir el catálogo en memoria)."""
+        raise NotImplementedError
+
+    def get_events_by_competition(self, competition, limit=10, page=1, cursor=None, include_total=True):
+        """Lista los eventos de una competición."""
+        raise NotImplementedError
+
+    def get_live_events(self, limit=10, page=1, cursor=None, include_total=True):
+        """Lista los eventos en vivo."""
+        raise NotImplementedError
+
+    def search_events(self, query_text, limit=10, page=1, cursor=None, include_total=True):
+        """Busca eventos por texto, ordenados por relevancia."""
+        raise NotImplementedError
+
+    def update_event_status(self, event_id, new_status):
+        """Actualiza el estado de un evento. Devuelve True si existía."""
+        raise NotImplementedError
+
+class BetRepository:
+    def create(self, user_id, selection_id, stake_amount, currency, use_ai_recommendation):
+        """Crea una apuesta. Devuelve None si la selección no existe o su evento ya no está abierto."""
+        raise NotImplementedError
+
+    def create_batch(self, user_id, items):
+        """
+        Crea varias apuestas en una sola transacción.
+
+        Args:
+            user_id: ID del usuario
+            items: Dicts con selection_id, stake_amount, currency y use_ai_recommendation
+
+        Returns:
+            Lista alineada con items: la apuesta creada, o None si su selección no
+            existe o su evento ya no está abierto
+        """
+        raise NotImplementedError
+
+    def get_user_bets(self, user_id, status="all", limit=10, page=1, cursor=None, include_total=True):
+        """Lista las apuestas de un usuario por (created_at, id) descendente."""
+        raise NotImplementedError
+
+    def get_bet_by_id(self, bet_id):
+        """Obtiene una apuesta por su ID."""
+        raise NotImplementedError
+
+    def settle_bet(self, bet_id, outcome):
+        """Liquida una apuesta con el resultado indicado."""
+        raise NotImplementedError
+
+    def simulate_results(self, seed=None, max_markets=None):
+        """Liquida con un resultado simulado (según las cuotas) las apuestas cuyo evento ya terminó."""
+        raise NotImplementedError
+
+    def calculate_user_profit(self, user_id):
+        """Obtiene las estadísticas de beneficio de un usuario (lectura por clave)."""
+        raise NotImplementedError
+
+    def rebuild_user_stats(self):
+        """Recalcula desde cero las estadísticas de beneficio de todos los usuarios."""
+        raise NotImplementedError
+
+    def get_leaderboard(self, metric, period, limit, min_bets):
+        """
+        Devuelve las primeras posiciones de un ranking.
+
+        Args:
+            metric: 'profit', 'roi' o 'win_rate'
+            period: 'all' (histórico) o '7d' (ventana móvil de 7 días)
+            limit: Número máximo de posiciones
+            min_bets: Apuestas liquidadas mínimas para entrar en el ranking
+
+        Returns:
+            Lista de entradas (ver format_leaderboard_entry) por puntuación descendente
+        """
+        raise NotImplementedError
+
+    def get_leaderboard_rank(self, user_id, metric, period, min_bets):
+        """
+        Devuelve la posición de un usuario en un ranking.
+
+        Returns:
+            Entrada del usuario (ver format_leaderboard_entry); rank es None si
+            no tiene apuestas suficientes en el periodo
+        """
+        raise NotImplementedError
+
+class Repository:
+    """Agrupa los repositorios de un mismo backend de datos."""
+    def __init__(self, sports, competitions, events, bets):
+        self.sports = sports
+        self.competitions = competitions
+        self.events = events
+        self.bets = bets
+
+def format_event_card(event):
+    """Proyección de un evento (ya decodificado) para los listados: solo el mercado principal."""
+    markets = event.get('markets') or []
+    return {
+        "id": event['id'],
+        "name": event['name'],
+        "sport_type": event['sport_type'],
+        "competition": event['competition'],
+        "start_time": event['start_time'],
+        "end_time": event.get('end_time'),
+        "teams": event.get('teams') or [],
+        "main_markets": [markets[0]] if markets else [],
+        "status": event['status'],
+        "image_url": event.get('image_url'),
+        "highlights_url": event.get('highlights_url')
+    }
+
+def serialize_event_card(event):
+    """Tarjeta de listado de un evento serializada una sola vez como fragmento JSON."""
+    return RawJSON(json_codec.dumps(format_event_card(event)))
+
+def format_bet_summary(bet):
+    """Proyección de una apuesta para el historial del usuario."""
+    return {
+        "bet_id": bet['id'],
+        "event_name": bet['event_name'],
+        "selection_name": bet['selection_name'],
+        "odds": bet['odds'],
+        "stake_amount": bet['stake_amount'],
+        "currency": bet['currency'],
+        "potential_return": bet['potential_return'],
+        "status": bet['status'],
+        "placed_at": bet['created_at'],
+        "result": bet['result'],
+        "used_ai_recommendation": bool(bet['used_ai_recommendation'])
+    }
+
+def build_commission(stake_amount, use_ai_recommendation):
+    """Comisiones aplicadas a una apuesta."""
+    return {
+        "standard": round(stake_amount * 0.03, 2),
+        "ai_premium": round(stake_amount * 0.01, 2) if use_ai_recommendation else 0,
+        "profit_percentage": 5
+    }
+
+def empty_user_stats():
+    """Acumuladores de user_stats de un usuario sin apuestas liquidadas."""
+    return {
+        'total_bets': 0,
+        'win_count': 0,
+        'loss_count': 0,
+        'void_count': 0,
+        'half_win_count': 0,
+        'half_loss_count': 0,
+        'total_staked': 0,
+        'total_returned': 0,
+        'total_profit': 0
+    }
+
+def accumulate_user_stats(totals, bet, sign=1):
+    """
+    Suma (sign=1) o resta (sign=-1) la aportación de una apuesta liquidada a los
+    acumuladores de su usuario. Misma lógica que los triggers de user_stats.
+
+    Args:
+        totals: Acumuladores como los de empty_user_stats (se modifican)
+        bet: Apuesta liquidada (dict con stake_amount, potential_return y result)
+        sign: 1 para sumar, -1 para restar
+    """
+    stake = bet['stake_amount']
+    potential_return = bet['potential_return']
+    result = bet['result']
+
+    totals['total_bets'] += sign
+    totals['total_staked'] += sign * stake
+
+    if result == 'win':
+        totals['win_count'] += sign
+        totals['total_returned'] += sign * potential_return
+        totals['total_profit'] += sign * (potential_return - stake)
+    elif result == 'loss':
+        totals['loss_count'] += sign
+        # No hay retorno, la pérdida es el monto apostado
+        totals['total_profit'] -= sign * stake
+    elif result == 'void':
+        totals['void_count'] += sign
+        # En caso de anulación, se devuelve el monto apostado
+        totals['total_returned'] += sign * stake
+    elif result == 'half_win':
+        totals['half_win_count'] += sign
+        # Gana la mitad, retorno = stake + (potential_return - stake) / 2
+        half_profit = (potential_return - stake) / 2
+        totals['total_returned'] += sign * (stake + half_profit)
+        totals['total_profit'] += sign * half_profit
+    elif result == 'half_loss':
+        totals['half_loss_count'] += sign
+        # Pierde la mitad, retorno = stake / 2
+        totals['total_returned'] += sign * stake / 2
+        totals['total_profit'] -= sign * stake / 2
+
+def leaderboard_score(metric, totals):
+    """
+    Puntuación de un usuario en un ranking. Misma lógica que LEADERBOARD_METRICS
+    en models/user_stats.py.
+    """
+    if metric == 'profit':
+        return totals['total_profit']
+    if metric == 'roi':
+        return totals['total_profit'] * 100.0 / totals['total_staked'] if totals['total_staked'] > 0 else 0
+    if totals['total_bets'] > 0:
+        halves = totals['half_win_count'] + totals['half_loss_count']
+        return (totals['win_count'] + halves / 2.0) * 100.0 / totals['total_bets']
+    return 0
+
+def format_leaderboard_entry(rank, user_id, username, score, totals):
+    """Entrada de un ranking con la puntuación y las estadísticas del usuario en el periodo."""
+    stats = format_user_stats(user_id, totals)
+    return {
+        'rank': rank,
+        'user_id': user_id,
+        'username': username,
+        'score': round(score, 2),
+        'total_bets': stats['total_bets'],
+        'total_staked': stats['total_staked'],
+        'total_profit': stats['total_profit'],
+        'roi': stats['roi'],
+        'win_rate': stats['win_rate']
+    }
+
+def rank_leaderboard_rows(rows):
+    """
+    Asigna posiciones a una lista de (user_id, username, score, totals) ordenada
+    por puntuación descendente; los empates comparten posición.
+    """
+    entries = []
+    rank = 0
+    previous_score = None
+    for position, (user_id, username, score, totals) in enumerate(rows, start=1):
+        if score != previous_score:
+            rank = position
+            previous_score = score
+        entries.append(format_leaderboard_entry(rank, user_id, username, score, totals))
+    return entries
+
+def format_user_stats(user_id, totals):
+    """
+    Calcula las estadísticas de beneficio a partir de los acumuladores de un usuario.
+
+    Args:
+        user_id: ID del usuario
+        totals: Acumuladores (fila de user_stats o dict de empty_user_stats)
+
+    Returns:
+        Dict con estadísticas de beneficios
+    """
+    total_bets = totals['total_bets']
+    total_staked = totals['total_staked']
+    total_profit = totals['total_profit']
+
+    # Las medias victorias y medias derrotas cuentan medio acierto y medio fallo
+    halves = totals['half_win_count'] + totals['half_loss_count']
+    win_count = totals['win_count'] + halves / 2 if halves else totals['win_count']
+    loss_count = totals['loss_count'] + halves / 2 if halves else totals['loss_count']
+
+    win_rate = (win_count / total_bets * 100) if total_bets > 0 else 0
+    roi = (total_profit / total_staked * 100) if total_staked > 0 else 0
+
+    return {
+        'user_id': user_id,
+        'total_bets': total_bets,
+        'win_count': win_count,
+        'loss_count': loss_count,
+        'win_rate': round(win_rate, 2),
+        'total_staked': round(total_staked, 2),
+        'total_returned': round(totals['total_returned'], 2),
+        'total_profit': round(total_profit, 2),
+        'roi': round(roi, 2)  # Return on Investment (%)
+    }
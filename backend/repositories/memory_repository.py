@@ -0,0 +1,467 @@
+# Archivo: backend/repositories/memory_repository.py
+#
+# Backend en memoria construido a partir de utils/mock_data.py. Pensado para
+# pruebas de carga de la capa HTTP sin E/S de disco: las consultas por ID,
+# selección, filtro y usuario usan índices (diccionarios y listas ordenadas)
+# en lugar de los recorridos lineales de mock_data.
+
+import bisect
+import copy
+import datetime
+import heapq
+import re
+import threading
+import uuid
+from collections import defaultdict
+
+from repositories.base import (
+    Repository, SportRepository, CompetitionRepository, EventRepository, BetRepository,
+    serialize_event_card, format_bet_summary, build_commission,
+    empty_user_stats, accumulate_user_stats, format_user_stats,
+    leaderboard_score, format_leaderboard_entry, rank_leaderboard_rows
+)
+from models.active_events import ACTIVE_STATUSES
+from models.user_stats import window_start
+from services.monte_carlo import MarketBook, MonteCarloEngine
+from utils.pagination import encode_cursor, decode_cursor, paginate_sorted_keys
+from utils.timestamps import now_epoch
+
+# Clave máxima para incluir todos los IDs con una misma fecha en bisect
+_MAX_ID = '\U0010ffff'
+
+# Pesos de relevancia por columna (mismo orden que el índice FTS5 de SQLite)
+_SEARCH_WEIGHTS = (('name', 10.0), ('description', 2.0), ('competition', 4.0), ('venue', 1.0), ('teams', 8.0))
+
+def _remove_key(keys, key):
+    """Elimina una clave de una lista ordenada."""
+    index = bisect.bisect_left(keys, key)
+    if index < len(keys) and keys[index] == key:
+        del keys[index]
+
+class MemoryStore:
+    """Estado compartido e índices del backend en memoria."""
+    def __init__(self, sports, competitions, events):
+        self.lock = threading.RLock()
+
+        self.sports = copy.deepcopy(sports)
+        self.competitions = copy.deepcopy(competitions)
+
+        # Deportes por sport_type y competiciones por (sport_id, nombre), para
+        # mantener active_events_count al añadir eventos o cambiar su estado
+        self.sports_by_type = {sport['name'].lower(): sport for sport in self.sports}
+        self.competitions_by_name = {(comp['sport_id'], comp['name']): comp for comp in self.competitions}
+        for item in self.sports + self.competitions:
+            item['active_events_count'] = 0
+
+        # Eventos: por ID y listas ordenadas de claves (start_time, id) por filtro
+        self.events_by_id = {}
+        self.cards_by_id = {}
+        self.event_keys = []
+        self.event_keys_by_sport = defaultdict(list)
+        self.event_keys_by_competition = defaultdict(list)
+        self.event_keys_by_status = defaultdict(list)
+        self.search_terms = {}
+
+        # Selecciones: ID -> (evento, mercado, selección)
+        self.selections = {}
+
+        # Apuestas: por ID y listas ordenadas de claves (created_at, id) por usuario y estado
+        self.bets_by_id = {}
+        self.bet_keys_by_user = defaultdict(list)
+        self.bet_keys_by_user_status = defaultdict(list)
+        # Estadísticas acumuladas de las apuestas liquidadas por usuario, en
+        # total y por (usuario, día de liquidación) para el ranking de 7 días
+        self.user_stats = defaultdict(empty_user_stats)
+        self.user_stats_daily = defaultdict(empty_user_stats)
+        self.settled_day_by_bet = {}
+
+        for event in copy.deepcopy(events):
+            self.add_event(event)
+
+    def add_event(self, event):
+        event.setdefault('end_time', None)
+        event.setdefault('teams', [])
+        event.setdefault('highlights_url', None)
+        event.setdefault('status', 'upcoming')
+
+        key = (event['start_time'], event['id'])
+        self.events_by_id[event['id']] = event
+        self.cards_by_id[event['id']] = serialize_event_card(event)
+        bisect.insort(self.event_keys, key)
+        bisect.insort(self.event_keys_by_sport[event['sport_type']], key)
+        bisect.insort(self.event_keys_by_competition[event['competition']], key)
+        bisect.insort(self.event_keys_by_status[event['status']], key)
+
+        for market in event.get('markets') or []:
+            for selection in market['selections']:
+                # Igual que en SQLite, ante IDs repetidos gana la primera aparición
+                self.selections.setdefault(selection['id'], (event, market, selection))
+
+        self._adjust_active_count(event, 1)
+
+        self.search_terms[event['id']] = {
+            column: re.findall(r"\w+", text.lower())
+            for column, text in (
+                ('name', event.get('name') or ''),
+                ('description', event.get('description') or ''),
+                ('competition', event.get('competition') or ''),
+                ('venue', event.get('venue') or ''),
+                ('teams', ' '.join(team.get('name', '') for team in event['teams']))
+            )
+        }
+
+    def _adjust_active_count(self, event, delta):
+        """Suma delta a los contadores del deporte y la competición si el evento está activo."""
+        if event['status'] not in ACTIVE_STATUSES:
+            return
+        sport = self.sports_by_type.get(event['sport_type'])
+        if not sport:
+            return
+        sport['active_events_count'] += delta
+        competition = self.competitions_by_name.get((sport['id'], event['competition']))
+        if competition:
+            competition['active_events_count'] += delta
+
+    def recount_active_events(self):
+        for item in self.sports + self.competitions:
+            item['active_events_count'] = 0
+        for event in self.events_by_id.values():
+            self._adjust_active_count(event, 1)
+
+    def set_event_status(self, event, new_status):
+        key = (event['start_time'], event['id'])
+        _remove_key(self.event_keys_by_status[event['status']], key)
+        self._adjust_active_count(event, -1)
+        event['status'] = new_status
+        self._adjust_active_count(event, 1)
+        self.cards_by_id[event['id']] = serialize_event_card(event)
+        bisect.insort(self.event_keys_by_status[new_status], key)
+
+    def add_bet(self, bet):
+        key = (bet['created_at'], bet['id'])
+        self.bets_by_id[bet['id']] = bet
+        bisect.insort(self.bet_keys_by_user[bet['user_id']], key)
+        bisect.insort(self.bet_keys_by_user_status[(bet['user_id'], bet['status'])], key)
+        if bet['status'] == 'settled':
+            self._accumulate_settled(bet, now_epoch() // 86400, 1)
+
+    def _accumulate_settled(self, bet, day, sign):
+        accumulate_user_stats(self.user_stats[bet['user_id']], bet, sign)
+        accumulate_user_stats(self.user_stats_daily[(bet['user_id'], day)], bet, sign)
+        if sign > 0:
+            self.settled_day_by_bet[bet['id']] = day
+        else:
+            self.settled_day_by_bet.pop(bet['id'], None)
+
+    def set_bet_result(self, bet, outcome):
+        key = (bet['created_at'], bet['id'])
+        _remove_key(self.bet_keys_by_user_status[(bet['user_id'], bet['status'])], key)
+        if bet['status'] == 'settled':
+            self._accumulate_settled(bet, self.settled_day_by_bet[bet['id']], -1)
+        bet['status'] = 'settled'
+        bet['result'] = outcome
+        bisect.insort(self.bet_keys_by_user_status[(bet['user_id'], 'settled')], key)
+        self._accumulate_settled(bet, now_epoch() // 86400, 1)
+
+    def rebuild_user_stats(self):
+        self.user_stats.clear()
+        self.user_stats_daily.clear()
+        for bet in self.bets_by_id.values():
+            if bet['status'] == 'settled':
+                day = self.settled_day_by_bet.get(bet['id'], now_epoch() // 86400)
+                self._accumulate_settled(bet, day, 1)
+
+    def period_stats(self, period):
+        """Estadísticas por usuario del periodo del ranking ('all' o '7d')."""
+        if period == 'all':
+            return self.user_stats
+        start = window_start(now_epoch() // 86400)
+        totals = defaultdict(empty_user_stats)
+        for (user_id, day), day_totals in self.user_stats_daily.items():
+            if day >= start:
+                for name, value in day_totals.items():
+                    totals[user_id][name] += value
+        return totals
+
+class MemorySportRepository(SportRepository):
+    def __init__(self, store):
+        self.store = store
+
+    def get_all(self):
+        return [
+            {key: sport.get(key) for key in ('id', 'name', 'active_events_count', 'icon_url')}
+            for sport in self.store.sports
+        ]
+
+    def reconcile_active_event_counts(self):
+        with self.store.lock:
+            self.store.recount_active_events()
+
+class MemoryCompetitionRepository(CompetitionRepository):
+    def __init__(self, store):
+        self.store = store
+
+    def get_all(self, sport_id=None):
+        return [
+            {key: comp.get(key) for key in ('id', 'name', 'sport_id', 'country', 'active_events_count', 'icon_url')}
+            for comp in self.store.competitions
+            if not sport_id or comp['sport_id'] == sport_id
+        ]
+
+class MemoryEventRepository(EventRepository):
+    def __init__(self, store):
+        self.store = store
+
+    def _paginate(self, keys, lo, hi, limit, page, cursor, include_total):
+        """Pagina un rango [lo, hi) de una lista ordenada de claves (start_time, id)."""
+        page_keys, has_more = paginate_sorted_keys(keys, lo, hi, limit, page, cursor)
+
+        response = {
+            "events": [self.store.cards_by_id[key[1]] for key in page_keys],
+            "page": page,
+            "next_cursor": encode_cursor(*page_keys[-1]) if has_more and page_keys else None
+        }
+        if include_total:
+            response["total_count"] = hi - lo
+        return response
+
+    def get_featured(self, sport_type=None, date_from=None, date_to=None, limit=10, page=1, cursor=None, include_total=True):
+        with self.store.lock:
+            keys = self.store.event_keys_by_sport.get(sport_type, []) if sport_type else self.store.event_keys
+            lo = bisect.bisect_left(keys, (date_from,)) if date_from else 0
+            hi = bisect.bisect_right(keys, (date_to, _MAX_ID)) if date_to else len(keys)
+            return self._paginate(keys, lo, max(lo, hi), limit, page, cursor, include_total)
+
+    def get_by_id(self, event_id):
+        with self.store.lock:
+            event = self.store.events_by_id.get(event_id)
+            return copy.deepcopy(event) if event else None
+
+    def get_all_events(self):
+        with self.store.lock:
+            return [copy.deepcopy(self.store.events_by_id[key[1]]) for key in self.store.event_keys]
+
+    def get_events_by_competition(self, competition, limit=10, page=1, cursor=None, include_total=True):
+        with self.store.lock:
+            keys = self.store.event_keys_by_competition.get(competition, [])
+            return self._paginate(keys, 0, len(keys), limit, page, cursor, include_total)
+
+    def get_live_events(self, limit=10, page=1, cursor=None, include_total=True):
+        with self.store.lock:
+            keys = self.store.event_keys_by_status.get('live', [])
+            return self._paginate(keys, 0, len(keys), limit, page, cursor, include_total)
+
+    def search_events(self, query_text, limit=10, page=1, cursor=None, include_total=True):
+        terms = re.findall(r"\w+", (query_text or "").lower())
+
+        with self.store.lock:
+            # Cada término debe ser prefijo de alguna palabra; la relevancia suma
+            # el peso de las columnas donde aparece (negativa, como bm25 en SQLite)
+            ranked = []
+            candidates = self.store.search_terms.items() if terms else []
+            for event_id, columns in candidates:
+                rank = 0.0
+                for term in terms:
+                    term_rank = -sum(
+                        weight for column, weight in _SEARCH_WEIGHTS
+                        if any(word.startswith(term) for word in columns[column])
+                    )
+                    if not term_rank:
+                        break
+                    rank += term_rank
+                else:
+                    ranked.append((rank, event_id))
+            ranked.sort()
+
+            start = bisect.bisect_right(ranked, decode_cursor(cursor)) if cursor else (page - 1) * limit
+            page_items = ranked[start:start + limit]
+
+            response = {
+                "events": [self.store.cards_by_id[event_id] for _, event_id in page_items],
+                "page": page,
+                "next_cursor": encode_cursor(*page_items[-1]) if start + limit < len(ranked) and page_items else None
+            }
+            if include_total:
+                response["total_count"] = len(ranked)
+            return response
+
+    def update_event_status(self, event_id, new_status):
+        with self.store.lock:
+            event = self.store.events_by_id.get(event_id)
+            if not event:
+                return False
+            self.store.set_event_status(event, new_status)
+            return True
+
+class MemoryBetRepository(BetRepository):
+    def __init__(self, store):
+        self.store = store
+
+    def create(self, user_id, selection_id, stake_amount, currency, use_ai_recommendation):
+        with self.store.lock:
+            found = self.store.selections.get(selection_id)
+            if not found:
+                return None
+
+            event, market, selection = found
+            if event['status'] not in ACTIVE_STATUSES:
+                return None
+            bet = {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "selection_id": selection_id,
+                "event_id": event['id'],
+                "market_id": market['id'],
+                "event_name": event['name'],
+                "selection_name": selection['name'],
+                "odds": selection['odds'],
+                "stake_amount": stake_amount,
+                "currency": currency,
+                "potential_return": stake_amount * selection['odds'],
+                "commission": build_commission(stake_amount, use_ai_recommendation),
+                "created_at": datetime.datetime.now().isoformat(),
+                "estimated_result_time": event['start_time'],
+                "status": "placed",
+                "result": None,
+                "used_ai_recommendation": 1 if use_ai_recommendation else 0
+            }
+            self.store.add_bet(bet)
+            return copy.deepcopy(bet)
+
+    def create_batch(self, user_id, items):
+        with self.store.lock:
+            return [
+                self.create(
+                    user_id,
+                    item['selection_id'],
+                    item['stake_amount'],
+                    item['currency'],
+                    item.get('use_ai_recommendation', False)
+                )
+                for item in items
+            ]
+
+    def get_user_bets(self, user_id, status="all", limit=10, page=1, cursor=None, include_total=True):
+        with self.store.lock:
+            if status == "all":
+                keys = self.store.bet_keys_by_user.get(user_id, [])
+            else:
+                keys = self.store.bet_keys_by_user_status.get((user_id, status), [])
+
+            # Las listas están en orden ascendente; se recorren de la más reciente hacia atrás
+            end = bisect.bisect_left(keys, decode_cursor(cursor)) if cursor else len(keys) - (page - 1) * limit
+            end = max(end, 0)
+            start = max(end - limit, 0)
+            page_keys = list(reversed(keys[start:end]))
+
+            response = {
+                "bets": [format_bet_summary(self.store.bets_by_id[key[1]]) for key in page_keys],
+                "page": page,
+                "next_cursor": encode_cursor(*page_keys[-1]) if start > 0 and page_keys else None
+            }
+            if include_total:
+                response["total_count"] = len(keys)
+            return response
+
+    def get_bet_by_id(self, bet_id):
+        with self.store.lock:
+            bet = self.store.bets_by_id.get(bet_id)
+            return copy.deepcopy(bet) if bet else None
+
+    def settle_bet(self, bet_id, outcome):
+        with self.store.lock:
+            bet = self.store.bets_by_id.get(bet_id)
+            if not bet:
+                return None
+            if bet['status'] != 'settled':
+                self.store.set_bet_result(bet, outcome)
+            return copy.deepcopy(bet)
+
+    def simulate_results(self, seed=None, max_markets=None):
+        current_time = datetime.datetime.now().isoformat()
+
+        with self.store.lock:
+            pending_bets = [
+                bet for bet in self.store.bets_by_id.values()
+                if bet['status'] == 'placed' and bet['estimated_result_time'] < current_time
+            ]
+
+            # Como en SQLite, se resuelven como mucho max_markets mercados completos
+            market_keys = list(dict.fromkeys((bet['event_id'], bet['market_id']) for bet in pending_bets))
+            if max_markets is not None:
+                market_keys = market_keys[:max_markets]
+                selected = set(market_keys)
+                pending_bets = [bet for bet in pending_bets if (bet['event_id'], bet['market_id']) in selected]
+
+            # Cuotas de los mercados con apuestas pendientes
+            rows = []
+            for event_id, market_id in market_keys:
+                event = self.store.events_by_id.get(event_id)
+                for market in (event or {}).get('markets') or []:
+                    if market['id'] == market_id:
+                        rows.extend(
+                            ((event_id, market_id), selection['id'], selection['odds'])
+                            for selection in market['selections']
+                        )
+                        break
+
+            outcomes = MonteCarloEngine(seed).bet_outcomes(MarketBook.from_rows(rows), [
+                ((bet['event_id'], bet['market_id']), bet['selection_id'], bet['odds']) for bet in pending_bets
+            ])
+
+            settled_bets = []
+            for bet, outcome in zip(pending_bets, outcomes):
+                self.store.set_bet_result(bet, outcome)
+                settled_bets.append(copy.deepcopy(bet))
+
+            return settled_bets
+
+    def calculate_user_profit(self, user_id):
+        with self.store.lock:
+            return format_user_stats(user_id, self.store.user_stats.get(user_id) or empty_user_stats())
+
+    def rebuild_user_stats(self):
+        with self.store.lock:
+            self.store.rebuild_user_stats()
+
+    def get_leaderboard(self, metric, period, limit, min_bets):
+        with self.store.lock:
+            scored = [
+                (leaderboard_score(metric, totals), user_id, totals)
+                for user_id, totals in self.store.period_stats(period).items()
+                if totals['total_bets'] >= min_bets
+            ]
+            top = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+            return rank_leaderboard_rows([
+                (user_id, None, score, dict(totals)) for score, user_id, totals in top
+            ])
+
+    def get_leaderboard_rank(self, user_id, metric, period, min_bets):
+        with self.store.lock:
+            stats = self.store.period_stats(period)
+            totals = stats.get(user_id)
+            if not totals:
+                return format_leaderboard_entry(None, user_id, None, 0, empty_user_stats())
+
+            score = leaderboard_score(metric, totals)
+            rank = None
+            if totals['total_bets'] >= min_bets:
+                rank = 1 + sum(
+                    1 for other in stats.values()
+                    if other['total_bets'] >= min_bets and leaderboard_score(metric, other) > score
+                )
+            return format_leaderboard_entry(rank, user_id, None, score, totals)
+
+def create_memory_repository():
+    """Crea el repositorio en memoria a partir de los datos de utils/mock_data.py."""
+    from utils import mock_data
+
+    competitions = [comp for sport_comps in mock_data.COMPETITIONS.values() for comp in sport_comps]
+    store = MemoryStore(mock_data.SPORTS, competitions, mock_data.EVENTS)
+
+    return Repository(
+        sports=MemorySportRepository(store),
+        competitions=MemoryCompetitionRepository(store),
+        events=MemoryEventRepository(store),
+        bets=MemoryBetRepository(store)
+    )
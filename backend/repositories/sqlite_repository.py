@@ -0,0 +1,730 @@
+# Archivo: backend/repositories/sqlite_repository.py
+
+from models.database import get_db_connection
+from models.market import Market
+from models.active_events import ACTIVE_STATUSES, recount_active_events
+from models.user_stats import (
+    LEADERBOARD_METRICS, LEADERBOARD_TABLES, window_start,
+    rebuild_user_stats, rebuild_leaderboard_window, roll_leaderboard_window
+)
+from services.monte_carlo import MarketBook, MonteCarloEngine
+from services.write_queue import write_queue
+from repositories.base import (
+    Repository, SportRepository, CompetitionRepository, EventRepository, BetRepository,
+    format_bet_summary, build_commission, empty_user_stats, format_user_stats,
+    format_leaderboard_entry, rank_leaderboard_rows
+)
+from utils import json_codec
+from utils.json_codec import RawJSON
+from utils.pagination import encode_cursor, decode_cursor
+from utils.timestamps import to_epoch, now_epoch
+import re
+import datetime
+import uuid
+
+class SQLiteSportRepository(SportRepository):
+    def get_all(self):
+        """Obtiene todos los deportes de la base de datos."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT id, name, active_events_count, icon_url FROM sports")
+        sports = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return sports
+    
+    def reconcile_active_event_counts(self):
+        """Recalcula los contadores de eventos activos en una sola transacción."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            recount_active_events(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        conn.close()
+
+class SQLiteCompetitionRepository(CompetitionRepository):
+    def get_all(self, sport_id=None):
+        """Obtiene todas las competiciones, opcionalmente filtradas por deporte."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        if sport_id:
+            cursor.execute(
+                "SELECT id, name, sport_id, country, active_events_count, icon_url FROM competitions WHERE sport_id = ?",
+                (sport_id,)
+            )
+        else:
+            cursor.execute("SELECT id, name, sport_id, country, active_events_count, icon_url FROM competitions")
+        
+        competitions = [dict(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return competitions
+
+class SQLiteEventRepository(EventRepository):
+    def _decode_row(self, row):
+        """Convierte una fila de events en diccionario decodificando los campos JSON."""
+        event = dict(row)
+        # Columnas derivadas (tarjeta de listado y fechas epoch), no forman parte del evento
+        for column in ('card', 'start_ts', 'end_ts'):
+            event.pop(column, None)
+        
+        # Convertir campos JSON de texto a diccionarios
+        if 'markets' in event and event['markets']:
+            event['markets'] = json_codec.loads(event['markets'])
+        
+        if 'teams' in event and event['teams']:
+            event['teams'] = json_codec.loads(event['teams'])
+        
+        if 'stats' in event and event['stats']:
+            event['stats'] = json_codec.loads(event['stats'])
+        
+        return event
+    
+    def _paginate(self, where, params, limit, page, cursor, include_total):
+        """
+        Ejecuta un listado de eventos ordenado por (start_ts, id).
+        
+        Con cursor se usa paginación por clave (seek) en lugar de OFFSET; sin él
+        se mantiene la paginación clásica por número de página. El recuento total
+        solo se calcula si include_total es verdadero.
+        
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        conn = get_db_connection()
+        cursor_db = conn.cursor()
+        
+        where_sql = " AND ".join(where) if where else "1=1"
+        
+        total_count = None
+        if include_total:
+            cursor_db.execute(f"SELECT COUNT(*) FROM events WHERE {where_sql}", params)
+            total_count = cursor_db.fetchone()[0]
+        
+        query_where = list(where)
+        query_params = list(params)
+        offset = 0
+        if cursor:
+            query_where.append("(start_ts, id) > (?, ?)")
+            query_params.extend(decode_cursor(cursor))
+        else:
+            offset = (page - 1) * limit
+        
+        # Solo la tarjeta precalculada (trigger events_card_*) y la clave del cursor
+        query = f"""
+        SELECT id, start_ts, card FROM events
+        WHERE {" AND ".join(query_where) if query_where else "1=1"}
+        ORDER BY start_ts ASC, id ASC
+        LIMIT ? OFFSET ?
+        """
+        # Se pide una fila extra para saber si existe una página siguiente
+        cursor_db.execute(query, query_params + [limit + 1, offset])
+        results = cursor_db.fetchall()
+        
+        conn.close()
+        
+        has_more = len(results) > limit
+        results = results[:limit]
+        events = [RawJSON(row['card']) for row in results]
+        
+        response = {
+            "events": events,
+            "page": page,
+            "next_cursor": encode_cursor(results[-1]['start_ts'], results[-1]['id']) if has_more and results else None
+        }
+        if total_count is not None:
+            response["total_count"] = total_count
+        return response
+    
+    def get_featured(self, sport_type=None, date_from=None, date_to=None, limit=10, page=1, cursor=None, include_total=True):
+        """Obtiene eventos destacados con filtros opcionales."""
+        where = []
+        params = []
+        
+        # Añadir filtros
+        if sport_type:
+            where.append("sport_type = ?")
+            params.append(sport_type)
+        
+        # Los filtros de fecha son rangos sobre start_ts (índices *_start_ts_id)
+        if date_from:
+            where.append("start_ts >= ?")
+            params.append(to_epoch(date_from))
+        
+        if date_to:
+            where.append("start_ts <= ?")
+            params.append(to_epoch(date_to))
+        
+        return self._paginate(where, params, limit, page, cursor, include_total)
+    
+    def get_by_id(self, event_id):
+        """Obtiene un evento específico por su ID."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM events WHERE id = ?", (event_id,))
+        row = cursor.fetchone()
+        
+        if not row:
+            conn.close()
+            return None
+        
+        event = self._decode_row(row)
+        
+        conn.close()
+        return event
+    
+    def get_all_events(self):
+        """Obtiene todos los eventos completos, con los campos JSON decodificados."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM events ORDER BY start_time ASC, id ASC")
+        events = [self._decode_row(row) for row in cursor.fetchall()]
+        
+        conn.close()
+        return events
+    
+    def get_events_by_competition(self, competition, limit=10, page=1, cursor=None, include_total=True):
+        """Obtiene eventos filtrados por competición."""
+        return self._paginate(["competition = ?"], [competition], limit, page, cursor, include_total)
+    
+    def get_live_events(self, limit=10, page=1, cursor=None, include_total=True):
+        """Obtiene eventos en vivo."""
+        return self._paginate(["status = 'live'"], [], limit, page, cursor, include_total)
+    
+    def _fts_query(self, query_text):
+        """Convierte el texto del usuario en una consulta FTS5 de prefijos (todas las palabras)."""
+        terms = re.findall(r"\w+", query_text or "")
+        return " ".join(f'"{term}"*' for term in terms)
+    
+    def search_events(self, query_text, limit=10, page=1, cursor=None, include_total=True):
+        """
+        Busca eventos por texto completo (nombre, descripción, competición, sede y equipos).
+        
+        Los resultados se ordenan por relevancia BM25 y cada palabra se trata como
+        prefijo. Con cursor se continúa a partir de la última (relevancia, id) devuelta.
+        
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        match = self._fts_query(query_text)
+        if not match:
+            response = {"events": [], "page": page, "next_cursor": None}
+            if include_total:
+                response["total_count"] = 0
+            return response
+        
+        conn = get_db_connection()
+        cursor_db = conn.cursor()
+        
+        total_count = None
+        if include_total:
+            cursor_db.execute("SELECT COUNT(*) FROM events_fts WHERE events_fts MATCH ?", (match,))
+            total_count = cursor_db.fetchone()[0]
+        
+        # Pesos BM25 por columna: name, description, competition, venue, teams
+        query = f"""
+        SELECT * FROM (
+            SELECT e.id, e.card, bm25(events_fts, 10.0, 2.0, 4.0, 1.0, 8.0) AS search_rank
+            FROM events_fts
+            JOIN events e ON e.rowid = events_fts.rowid
+            WHERE events_fts MATCH ?
+        )
+        {"WHERE (search_rank, id) > (?, ?)" if cursor else ""}
+        ORDER BY search_rank ASC, id ASC
+        LIMIT ? OFFSET ?
+        """
+        params = [match]
+        offset = 0
+        if cursor:
+            params.extend(decode_cursor(cursor))
+        else:
+            offset = (page - 1) * limit
+        
+        cursor_db.execute(query, params + [limit + 1, offset])
+        results = cursor_db.fetchall()
+        
+        conn.close()
+        
+        has_more = len(results) > limit
+        results = results[:limit]
+        
+        response = {
+            "events": [RawJSON(row['card']) for row in results],
+            "page": page,
+            "next_cursor": encode_cursor(results[-1]['search_rank'], results[-1]['id']) if has_more and results else None
+        }
+        if total_count is not None:
+            response["total_count"] = total_count
+        return response
+    
+    def update_event_status(self, event_id, new_status):
+        """Actualiza el estado de un evento."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "UPDATE events SET status = ? WHERE id = ?",
+            (new_status, event_id)
+        )
+        
+        conn.commit()
+        
+        # Verificar si se actualizó alguna fila
+        success = cursor.rowcount > 0
+        
+        conn.close()
+        return success
+    
+class SQLiteBetRepository(BetRepository):
+    def _bet_from_row(self, row):
+        """Convierte una fila de bets en diccionario sin las columnas epoch internas."""
+        bet = dict(row)
+        bet.pop('created_ts', None)
+        bet.pop('estimated_result_ts', None)
+        bet.pop('settled_ts', None)
+        if bet.get('commission'):
+            bet['commission'] = json_codec.loads(bet['commission'])
+        return bet
+    
+    def create(self, user_id, selection_id, stake_amount, currency, use_ai_recommendation):
+        """
+        Crea una nueva apuesta.
+        
+        La inserción pasa por la cola de escritura (commit agrupado con las de
+        otros hilos); la apuesta se devuelve una vez confirmada.
+        
+        Returns:
+            La apuesta creada, o None si la selección no existe o su evento ya no admite apuestas
+        """
+        return write_queue.execute(
+            self._insert_bet, user_id, selection_id, stake_amount, currency, use_ai_recommendation
+        )
+    
+    def _insert_bet(self, cursor, user_id, selection_id, stake_amount, currency, use_ai_recommendation):
+        """
+        Operación de escritura de create.
+        
+        Se ejecuta dentro de la transacción de escritura, de modo que las cuotas
+        validadas son las vigentes al insertar; el INSERT ... RETURNING devuelve
+        la fila sin una segunda consulta.
+        """
+        # Buscar la selección mediante la tabla indexada de selecciones
+        selection = Market.find_selection(cursor, selection_id)
+        
+        if not selection or selection['event_status'] not in ACTIVE_STATUSES:
+            return None
+        
+        odds = selection['odds']
+        commission = build_commission(stake_amount, use_ai_recommendation)
+        
+        cursor.execute('''
+        INSERT INTO bets (
+            id, user_id, selection_id, event_id, market_id, event_name, selection_name, odds, 
+            stake_amount, currency, potential_return, commission, 
+            created_at, estimated_result_time, status, used_ai_recommendation
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING *
+        ''', (
+            str(uuid.uuid4()), user_id, selection_id, selection['event_id'], selection['market_id'],
+            selection['event_name'], selection['selection_name'], odds,
+            stake_amount, currency, stake_amount * odds, json_codec.dumps(commission),
+            datetime.datetime.now().isoformat(), selection['start_time'], 'placed',
+            1 if use_ai_recommendation else 0
+        ))
+        # Los triggers AFTER INSERT (columnas *_ts) no se reflejan en la fila
+        # devuelta, pero no forman parte de la respuesta
+        bet = self._bet_from_row(cursor.fetchone())
+        # RETURNING no aplica la afinidad REAL a los valores enteros (25.0 -> 25)
+        for column in ('odds', 'stake_amount', 'potential_return'):
+            bet[column] = float(bet[column])
+        return bet
+    
+    def create_batch(self, user_id, items):
+        """
+        Crea las apuestas de un boleto en una única transacción.
+        
+        Todas las selecciones se resuelven con una consulta y todas las filas se
+        insertan con un solo executemany, como una sola operación de la cola de
+        escritura.
+        
+        Returns:
+            Lista alineada con items: la apuesta creada, o None si su selección no
+            existe o su evento ya no está abierto
+        """
+        return write_queue.execute(self._insert_bet_batch, user_id, items)
+    
+    def _insert_bet_batch(self, cursor, user_id, items):
+        """Operación de escritura de create_batch."""
+        created_at = datetime.datetime.now().isoformat()
+        bets = []
+        
+        selections = Market.find_selections(cursor, [item['selection_id'] for item in items])
+        
+        for item in items:
+            selection = selections.get(item['selection_id'])
+            if not selection or selection['event_status'] not in ACTIVE_STATUSES:
+                bets.append(None)
+                continue
+            
+            stake_amount = float(item['stake_amount'])
+            use_ai_recommendation = bool(item.get('use_ai_recommendation'))
+            bets.append({
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "selection_id": item['selection_id'],
+                "event_id": selection['event_id'],
+                "market_id": selection['market_id'],
+                "event_name": selection['event_name'],
+                "selection_name": selection['selection_name'],
+                "odds": float(selection['odds']),
+                "stake_amount": stake_amount,
+                "currency": item['currency'],
+                "potential_return": stake_amount * selection['odds'],
+                "commission": build_commission(stake_amount, use_ai_recommendation),
+                "created_at": created_at,
+                "estimated_result_time": selection['start_time'],
+                "status": "placed",
+                "result": None,
+                "used_ai_recommendation": 1 if use_ai_recommendation else 0
+            })
+        
+        cursor.executemany('''
+        INSERT INTO bets (
+            id, user_id, selection_id, event_id, market_id, event_name, selection_name, odds, 
+            stake_amount, currency, potential_return, commission, 
+            created_at, estimated_result_time, status, used_ai_recommendation
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
+                bet['id'], bet['user_id'], bet['selection_id'], bet['event_id'], bet['market_id'],
+                bet['event_name'], bet['selection_name'], bet['odds'],
+                bet['stake_amount'], bet['currency'], bet['potential_return'], json_codec.dumps(bet['commission']),
+                bet['created_at'], bet['estimated_result_time'], bet['status'], bet['used_ai_recommendation']
+            )
+            for bet in bets if bet
+        ])
+        
+        return bets
+    
+    def get_user_bets(self, user_id, status="all", limit=10, page=1, cursor=None, include_total=True):
+        """
+        Obtiene las apuestas de un usuario con filtros opcionales.
+        
+        Con cursor se pagina por clave (created_at, id) en lugar de OFFSET.
+        
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        conn = get_db_connection()
+        cursor_db = conn.cursor()
+        
+        where = ["user_id = ?"]
+        params = [user_id]
+        
+        if status != "all":
+            where.append("status = ?")
+            params.append(status)
+        
+        # Obtener el recuento total (opcional)
+        total_count = None
+        if include_total:
+            cursor_db.execute(f"SELECT COUNT(*) FROM bets WHERE {' AND '.join(where)}", params)
+            total_count = cursor_db.fetchone()[0]
+        
+        offset = 0
+        if cursor:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+        else:
+            offset = (page - 1) * limit
+        
+        # Aplicar ordenamiento y paginación (una fila extra para detectar la página siguiente)
+        query = f"""
+        SELECT * FROM bets
+        WHERE {' AND '.join(where)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ? OFFSET ?
+        """
+        cursor_db.execute(query, params + [limit + 1, offset])
+        results = cursor_db.fetchall()
+        
+        has_more = len(results) > limit
+        results = results[:limit]
+        
+        # Formatear resultados
+        bets = [format_bet_summary(dict(row)) for row in results]
+        
+        conn.close()
+        
+        response = {
+            "bets": bets,
+            "page": page,
+            "next_cursor": encode_cursor(results[-1]['created_at'], results[-1]['id']) if has_more and results else None
+        }
+        if total_count is not None:
+            response["total_count"] = total_count
+        return response
+    
+    def get_bet_by_id(self, bet_id):
+        """
+        Obtiene una apuesta por su ID.
+        
+        Args:
+            bet_id: ID de la apuesta
+        
+        Returns:
+            La apuesta o None si no se encuentra
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM bets WHERE id = ?", (bet_id,))
+        bet_row = cursor.fetchone()
+        
+        if not bet_row:
+            conn.close()
+            return None
+        
+        bet = self._bet_from_row(bet_row)
+        
+        conn.close()
+        return bet
+    
+    def settle_bet(self, bet_id, outcome):
+        """
+        Liquida una apuesta marcándola como finalizada y estableciendo su resultado.
+        
+        Args:
+            bet_id: ID de la apuesta a liquidar
+            outcome: Resultado ('win', 'loss', 'void', 'half_win', 'half_loss')
+        
+        Returns:
+            La apuesta actualizada o None si no se encuentra
+        """
+        return write_queue.execute(self._settle_bet, bet_id, outcome)
+    
+    def _settle_bet(self, cursor, bet_id, outcome):
+        """Operación de escritura de settle_bet."""
+        # Primero verificamos que la apuesta exista y no esté ya liquidada
+        cursor.execute("SELECT * FROM bets WHERE id = ?", (bet_id,))
+        bet_row = cursor.fetchone()
+        
+        if not bet_row:
+            return None
+        
+        bet = self._bet_from_row(bet_row)
+        
+        if bet['status'] == 'settled':
+            return bet  # Ya está liquidada
+        
+        # Actualizar la apuesta
+        cursor.execute("""
+        UPDATE bets 
+        SET status = 'settled', result = ?
+        WHERE id = ?
+        """, (outcome, bet_id))
+        
+        # Obtener la apuesta actualizada
+        cursor.execute("SELECT * FROM bets WHERE id = ?", (bet_id,))
+        return self._bet_from_row(cursor.fetchone())
+    
+    def simulate_results(self, seed=None, max_markets=None):
+        """
+        Simula resultados para apuestas pendientes con eventos que ya deberían haber terminado.
+        
+        El ganador de cada mercado se muestrea con las probabilidades implícitas
+        de sus cuotas (ver services/monte_carlo.py), así que las apuestas de un
+        mismo mercado reciben resultados coherentes entre sí.
+        
+        Args:
+            seed: Semilla del generador aleatorio (None para una aleatoria)
+            max_markets: Mercados resueltos como máximo en esta llamada (None para todos);
+                         las apuestas de un mercado nunca se reparten entre llamadas
+        
+        Returns:
+            Lista de apuestas liquidadas
+        """
+        return write_queue.execute(self._simulate_results, seed, max_markets)
+    
+    def _simulate_results(self, cursor, seed, max_markets):
+        """Operación de escritura de simulate_results."""
+        now = now_epoch()
+        
+        # Mercados con apuestas pendientes cuyo tiempo estimado de resultado ya
+        # pasó (rango sobre idx_bets_status_result_ts); LIMIT -1 es sin límite
+        cursor.execute("""
+        SELECT DISTINCT event_id, market_id FROM bets 
+        WHERE status = 'placed' AND estimated_result_ts < ?
+        LIMIT ?
+        """, (now, -1 if max_markets is None else max_markets))
+        market_keys = [(row['event_id'], row['market_id']) for row in cursor.fetchall()]
+        
+        # Apuestas (idx_bets_placed_selection) y cuotas de cada mercado
+        pending_bets = []
+        selection_rows = []
+        for event_id, market_id in market_keys:
+            cursor.execute("""
+            SELECT * FROM bets
+            WHERE event_id IS ? AND market_id IS ? AND status = 'placed' AND estimated_result_ts < ?
+            """, (event_id, market_id, now))
+            pending_bets.extend(self._bet_from_row(row) for row in cursor.fetchall())
+            
+            cursor.execute("""
+            SELECT id, odds FROM selections
+            WHERE event_id = ? AND market_id = ?
+            ORDER BY position
+            """, (event_id, market_id))
+            selection_rows.extend(((event_id, market_id), row['id'], row['odds']) for row in cursor.fetchall())
+        
+        if not pending_bets:
+            return []
+        
+        outcomes = MonteCarloEngine(seed).bet_outcomes(MarketBook.from_rows(selection_rows), [
+            ((bet['event_id'], bet['market_id']), bet['selection_id'], bet['odds']) for bet in pending_bets
+        ])
+        
+        cursor.executemany("""
+        UPDATE bets 
+        SET status = 'settled', result = ?
+        WHERE id = ?
+        """, [(outcome, bet['id']) for bet, outcome in zip(pending_bets, outcomes)])
+        
+        for bet, outcome in zip(pending_bets, outcomes):
+            bet['status'] = 'settled'
+            bet['result'] = outcome
+        
+        return pending_bets
+    
+    def calculate_user_profit(self, user_id):
+        """
+        Obtiene las estadísticas de beneficio de un usuario.
+        
+        Lee la fila de user_stats del usuario, que los triggers mantienen al
+        liquidar cada apuesta.
+        
+        Args:
+            user_id: ID del usuario
+        
+        Returns:
+            Dict con estadísticas de beneficios
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT * FROM user_stats WHERE user_id = ?", (user_id,))
+        row = cursor.fetchone()
+        
+        conn.close()
+        
+        return format_user_stats(user_id, row or empty_user_stats())
+    
+    def rebuild_user_stats(self):
+        """Recalcula user_stats y la ventana del ranking desde las apuestas liquidadas en una sola transacción."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            rebuild_user_stats(cursor)
+            rebuild_leaderboard_window(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        conn.close()
+    
+    def _leaderboard_table(self, conn, period):
+        """
+        Devuelve la tabla de un periodo del ranking.
+        
+        Si ha cambiado el día desde la última lectura, antes se hace avanzar la
+        ventana de 7 días (solo se restan los cubos que salen de ella). Ese
+        avance, una vez al día, va por la cola de escritura como el resto de
+        escrituras; la lectura no abre transacciones de escritura.
+        """
+        if period == '7d':
+            cursor = conn.cursor()
+            cursor.execute("SELECT start_day FROM leaderboard_window WHERE id = 1")
+            if cursor.fetchone()['start_day'] < window_start(now_epoch() // 86400):
+                # roll_leaderboard_window vuelve a comprobarlo dentro de la transacción
+                write_queue.execute(roll_leaderboard_window)
+        return LEADERBOARD_TABLES[period]
+    
+    def get_leaderboard(self, metric, period, limit, min_bets):
+        """
+        Devuelve las primeras posiciones de un ranking.
+        
+        Recorre en orden el índice idx_<tabla>_<métrica>, por lo que el coste
+        depende de limit y no del número de usuarios.
+        """
+        conn = get_db_connection()
+        table = self._leaderboard_table(conn, period)
+        score = LEADERBOARD_METRICS[metric]
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+        SELECT s.*, ({score}) AS score, u.username
+        FROM {table} s
+        LEFT JOIN users u ON u.id = s.user_id
+        WHERE s.total_bets >= ?
+        ORDER BY ({score}) DESC, s.user_id
+        LIMIT ?
+        """, (min_bets, limit))
+        rows = cursor.fetchall()
+        
+        conn.close()
+        return rank_leaderboard_rows([(row['user_id'], row['username'], row['score'], row) for row in rows])
+    
+    def get_leaderboard_rank(self, user_id, metric, period, min_bets):
+        """
+        Devuelve la posición de un usuario en un ranking.
+        
+        La posición es 1 más el número de usuarios con mejor puntuación, contado
+        sobre el índice del ranking sin leer las filas.
+        """
+        conn = get_db_connection()
+        table = self._leaderboard_table(conn, period)
+        score = LEADERBOARD_METRICS[metric]
+        cursor = conn.cursor()
+        
+        cursor.execute(f"""
+        SELECT s.*, ({score}) AS score, u.username
+        FROM {table} s
+        LEFT JOIN users u ON u.id = s.user_id
+        WHERE s.user_id = ?
+        """, (user_id,))
+        row = cursor.fetchone()
+        
+        rank = None
+        if row and row['total_bets'] >= min_bets:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE ({score}) > ? AND total_bets >= ?",
+                (row['score'], min_bets)
+            )
+            rank = cursor.fetchone()[0] + 1
+        
+        conn.close()
+        
+        if not row:
+            return format_leaderboard_entry(None, user_id, None, 0, empty_user_stats())
+        return format_leaderboard_entry(rank, user_id, row['username'], row['score'], row)
+
+def create_sqlite_repository():
+    """Crea el repositorio respaldado por la base de datos SQLite."""
+    return Repository(
+        sports=SQLiteSportRepository(),
+        competitions=SQLiteCompetitionRepository(),
+        events=SQLiteEventRepository(),
+        bets=SQLiteBetRepository()
+    )
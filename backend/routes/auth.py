@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from utils.auth import get_or_create_user, create_session
+from utils.auth import get_or_create_user, create_session, revoke_session
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -39,7 +39,6 @@ def logout():
     
     token = auth_header.split(' ')[1]
     
-    if token in SESSIONS:
-        del SESSIONS[token]
+    revoke_session(token)
     
     return jsonify({'message': 'Successfully logged out'}), 200
\ No newline at end of file
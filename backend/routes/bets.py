@@ -1,16 +1,22 @@
 from flask import Blueprint, request, jsonify
 from utils.auth import token_required
 from models.bet import Bet
+from services.job_runner import job_runner
+from services.simulation_service import SimulationService
+from utils.pagination import parse_bool_arg
 
 bets_bp = Blueprint('bets', __name__)
 
+# Número máximo de apuestas en un boleto de POST /bets/batch
+MAX_BATCH_ITEMS = 50
+
 @bets_bp.route('', methods=['POST'])
 @token_required
 def place_bet(current_user):
     """Endpoint para crear una apuesta simulada."""
     data = request.get_json()
     
-    if not data:
+    if not data or not isinstance(data, dict):
         return jsonify({'message': 'Invalid request data'}), 400
     
     required_fields = ['selection_id', 'stake_amount', 'currency']
@@ -18,6 +24,11 @@ def place_bet(current_user):
         if field not in data:
             return jsonify({'message': f'Missing required field: {field}'}), 400
     
+    # Mismas comprobaciones que cada apuesta de POST /bets/batch
+    error = _batch_item_error(data)
+    if error:
+        return jsonify({'message': error}), 400
+    
     selection_id = data['selection_id']
     stake_amount = data['stake_amount']
     currency = data['currency']
@@ -30,6 +41,66 @@ def place_bet(current_user):
     
     return jsonify(bet), 201
 
+def _batch_item_error(item):
+    """Devuelve el error de tipo o valor de una apuesta (sola o del boleto), o None si es válida."""
+    if not isinstance(item['selection_id'], str):
+        return 'Invalid selection_id'
+    stake_amount = item['stake_amount']
+    # bool es subclase de int y no es un importe
+    if isinstance(stake_amount, bool) or not isinstance(stake_amount, (int, float)):
+        return 'Invalid stake_amount'
+    if not 0 < stake_amount < float('inf'):
+        return 'stake_amount must be greater than 0'
+    if not isinstance(item['currency'], str):
+        return 'Invalid currency'
+    return None
+
+@bets_bp.route('/batch', methods=['POST'])
+@token_required
+def place_bet_batch(current_user):
+    """Endpoint para crear todas las apuestas de un boleto en una sola transacción."""
+    data = request.get_json()
+    
+    # Se acepta la lista directamente o dentro de {"bets": [...]}
+    items = data.get('bets') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({'message': 'Invalid request data'}), 400
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({'message': f'Too many bets (max {MAX_BATCH_ITEMS})'}), 400
+    
+    # Validar cada elemento; los inválidos no impiden colocar el resto
+    results = [None] * len(items)
+    valid = []
+    required_fields = ['selection_id', 'stake_amount', 'currency']
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'success': False, 'error': 'Invalid bet data'}
+            continue
+        missing = next((field for field in required_fields if field not in item), None)
+        if missing:
+            results[index] = {'index': index, 'success': False, 'error': f'Missing required field: {missing}'}
+            continue
+        error = _batch_item_error(item)
+        if error:
+            results[index] = {'index': index, 'success': False, 'error': error}
+            continue
+        valid.append((index, item))
+    
+    if valid:
+        bets = Bet.create_batch(current_user, [item for _, item in valid])
+        for (index, _), bet in zip(valid, bets):
+            if bet:
+                results[index] = {'index': index, 'success': True, 'bet': bet}
+            else:
+                results[index] = {'index': index, 'success': False, 'error': 'Invalid selection_id'}
+    
+    placed_count = sum(1 for result in results if result['success'])
+    return jsonify({
+        'results': results,
+        'placed_count': placed_count,
+        'failed_count': len(results) - placed_count
+    }), 201 if placed_count else 400
+
 @bets_bp.route('', methods=['GET'])
 @token_required
 def get_bets(current_user):
@@ -37,8 +108,15 @@ def get_bets(current_user):
     status = request.args.get('status', 'all')
     limit = int(request.args.get('limit', 10))
     page = int(request.args.get('page', 1))
+    cursor = request.args.get('cursor')
+    include_total = parse_bool_arg(request.args.get('include_total'), default=not cursor)
+    if limit < 1 or page < 1:
+        return jsonify({'message': 'limit and page must be greater than 0'}), 400
     
-    bets = Bet.get_user_bets(current_user, status, limit, page)
+    try:
+        bets = Bet.get_user_bets(current_user, status, limit, page, cursor, include_total)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
     
     return jsonify(bets), 200
 
@@ -89,20 +167,34 @@ def settle_bet(current_user, bet_id):
 @bets_bp.route('/simulate', methods=['POST'])
 @token_required
 def simulate_results(current_user):
-    """Endpoint para simular resultados de apuestas pendientes."""
+    """
+    Encola la simulación de resultados de las apuestas pendientes. El resultado
+    (total liquidado y apuestas liquidadas del usuario) se consulta en /simulation/jobs/<id>.
+    """
     # Para fines de demostración, permitimos que cualquier usuario active la simulación
     # En un sistema real, esto sería un proceso automatizado o restringido a administradores
     
-    settled_bets = Bet.simulate_results()
-    
-    # Filtrar solo las apuestas del usuario actual
-    user_settled_bets = [bet for bet in settled_bets if bet['user_id'] == current_user]
+    seed = (request.get_json(silent=True) or {}).get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        return jsonify({'message': 'seed must be a non-negative integer'}), 400
+    
+    created, job = job_runner.submit(
+        'bet_simulation', SimulationService.simulate_bets_job,
+        {'seed': seed, 'user_id': current_user}, current_user
+    )
+    if not created:
+        return jsonify({
+            'message': 'A bet simulation is already running',
+            'job_id': job['id'],
+            'status': job['status']
+        }), 409
     
     return jsonify({
-        'message': f'{len(user_settled_bets)} bets settled for current user',
-        'total_settled': len(settled_bets),
-        'settled_bets': user_settled_bets
-    }), 200
+        'message': 'Bet simulation queued',
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/simulation/jobs/{job['id']}"
+    }), 202
 
 @bets_bp.route('/stats', methods=['GET'])
 @token_required
@@ -121,8 +213,15 @@ def get_active_bets(current_user):
     """Endpoint para obtener las apuestas activas del usuario actual."""
     limit = int(request.args.get('limit', 10))
     page = int(request.args.get('page', 1))
+    cursor = request.args.get('cursor')
+    include_total = parse_bool_arg(request.args.get('include_total'), default=not cursor)
+    if limit < 1 or page < 1:
+        return jsonify({'message': 'limit and page must be greater than 0'}), 400
     
-    bets = Bet.get_user_bets(current_user, 'placed', limit, page)
+    try:
+        bets = Bet.get_user_bets(current_user, 'placed', limit, page, cursor, include_total)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
     
     return jsonify(bets), 200
 
@@ -132,7 +231,14 @@ def get_bet_history(current_user):
     """Endpoint para obtener el historial de apuestas del usuario actual."""
     limit = int(request.args.get('limit', 10))
     page = int(request.args.get('page', 1))
-    
-    bets = Bet.get_user_bets(current_user, 'settled', limit, page)
+    cursor = request.args.get('cursor')
+    include_total = parse_bool_arg(request.args.get('include_total'), default=not cursor)
+    if limit < 1 or page < 1:
+        return jsonify({'message': 'limit and page must be greater than 0'}), 400
+    
+    try:
+        bets = Bet.get_user_bets(current_user, 'settled', limit, page, cursor, include_total)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
     
     return jsonify(bets), 200
\ No newline at end of file
@@ -1,9 +1,20 @@
 from flask import Blueprint, request, jsonify
 from models.event import Event
+from services.catalog_service import CatalogService
+from utils.json_response import json_response
+from utils.pagination import parse_bool_arg
+from utils.response_cache import LISTING_TAG, cached_response, conditional_get, event_tag, request_key
 
 events_bp = Blueprint('events', __name__)
 
+# Cache-Control de las rutas del catálogo; pasado max-age el cliente revalida
+# con If-None-Match y, si nada cambió, recibe un 304 sin cuerpo
+FEATURED_CACHE_CONTROL = 'public, max-age=15'
+EVENT_CACHE_CONTROL = 'public, max-age=5'
+
 @events_bp.route('/featured', methods=['GET'])
+@conditional_get(lambda: CatalogService.get_snapshot().listing_etag(request_key()), FEATURED_CACHE_CONTROL)
+@cached_response(lambda: (LISTING_TAG,))
 def featured_events():
     """Endpoint para listar eventos deportivos destacados."""
     sport_type = request.args.get('sport_type')
@@ -11,14 +22,41 @@ def featured_events():
     date_to = request.args.get('date_to')
     limit = int(request.args.get('limit', 10))
     page = int(request.args.get('page', 1))
+    cursor = request.args.get('cursor')
+    include_total = parse_bool_arg(request.args.get('include_total'), default=not cursor)
+    
+    try:
+        result = CatalogService.get_snapshot().get_featured(sport_type, date_from, date_to, limit, page, cursor, include_total)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    return json_response(result)
+
+@events_bp.route('/search', methods=['GET'])
+def search_events():
+    """Endpoint para buscar eventos por texto (nombre, competición, sede, equipos)."""
+    query_text = request.args.get('q', '').strip()
+    if not query_text:
+        return jsonify({'message': 'Missing search query'}), 400
+    
+    limit = int(request.args.get('limit', 10))
+    page = int(request.args.get('page', 1))
+    cursor = request.args.get('cursor')
+    include_total = parse_bool_arg(request.args.get('include_total'), default=not cursor)
+    if limit < 1 or page < 1:
+        return jsonify({'message': 'limit and page must be greater than 0'}), 400
     
-    result = Event.get_featured(sport_type, date_from, date_to, limit, page)
-    return jsonify(result), 200
+    try:
+        result = Event.search_events(query_text, limit, page, cursor, include_total)
+    except ValueError:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    return json_response(result)
 
 @events_bp.route('/<event_id>', methods=['GET'])
+@conditional_get(lambda event_id: CatalogService.get_snapshot().event_etag(event_id), EVENT_CACHE_CONTROL)
+@cached_response(lambda event_id: (event_tag(event_id),))
 def get_event(event_id):
     """Endpoint para obtener un evento específico por ID."""
-    event = Event.get_by_id(event_id)
+    event = CatalogService.get_snapshot().get_by_id(event_id)
     
     if not event:
         return jsonify({'message': 'Event not found'}), 404
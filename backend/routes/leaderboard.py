@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify
+from utils.auth import token_required
+from models.leaderboard import Leaderboard
+
+leaderboard_bp = Blueprint('leaderboard', __name__)
+
+# Número máximo de posiciones de GET /leaderboard
+MAX_LEADERBOARD_LIMIT = 100
+
+def _parse_ranking_args():
+    """Lee metric y period de la petición; devuelve (metric, period) o None si no son válidos."""
+    metric = request.args.get('metric', 'profit')
+    period = request.args.get('period', 'all')
+    if metric not in Leaderboard.METRICS or period not in Leaderboard.PERIODS:
+        return None
+    return metric, period
+
+@leaderboard_bp.route('', methods=['GET'])
+def get_leaderboard():
+    """Endpoint para obtener las primeras posiciones de un ranking."""
+    ranking = _parse_ranking_args()
+    if not ranking:
+        return jsonify({'message': 'Invalid metric or period'}), 400
+    metric, period = ranking
+    
+    limit = min(max(int(request.args.get('limit', MAX_LEADERBOARD_LIMIT)), 1), MAX_LEADERBOARD_LIMIT)
+    
+    return jsonify({
+        'metric': metric,
+        'period': period,
+        'entries': Leaderboard.get_top(metric, period, limit)
+    }), 200
+
+@leaderboard_bp.route('/me', methods=['GET'])
+@token_required
+def get_my_rank(current_user):
+    """Endpoint para obtener la posición del usuario actual en un ranking."""
+    ranking = _parse_ranking_args()
+    if not ranking:
+        return jsonify({'message': 'Invalid metric or period'}), 400
+    metric, period = ranking
+    
+    return jsonify({
+        'metric': metric,
+        'period': period,
+        'entry': Leaderboard.get_rank(current_user, metric, period)
+    }), 200
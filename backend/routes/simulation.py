@@ -2,10 +2,23 @@
 
 from flask import Blueprint, jsonify, request
 from utils.auth import token_required
+from services.job_runner import job_runner
 from services.simulation_service import SimulationService
 
 simulation_bp = Blueprint('simulation', __name__)
 
+# Número máximo de escenarios de POST /simulation/house-pnl
+MAX_PNL_ITERATIONS = 100000
+
+def _read_seed(data):
+    """Lee la semilla opcional del cuerpo; devuelve (semilla, válida)."""
+    seed = data.get('seed')
+    if seed is None:
+        return None, True
+    if isinstance(seed, bool) or not isinstance(seed, int) or seed < 0:
+        return None, False
+    return seed, True
+
 @simulation_bp.route('/update-events', methods=['POST'])
 @token_required
 def update_event_statuses(current_user):
@@ -20,42 +33,78 @@ def update_event_statuses(current_user):
 @simulation_bp.route('/simulate-results', methods=['POST'])
 @token_required
 def simulate_event_results(current_user):
-    """Simula resultados para eventos completados."""
-    simulated_events = SimulationService.simulate_event_results()
+    """Simula resultados para eventos completados según las cuotas de sus mercados."""
+    seed, valid = _read_seed(request.get_json(silent=True) or {})
+    if not valid:
+        return jsonify({'message': 'seed must be a non-negative integer'}), 400
+    
+    simulated_events = SimulationService.simulate_event_results(seed)
     return jsonify({
         'message': f'{len(simulated_events)} events simulated',
-        'simulated_count': len(simulated_events)
+        'simulated_count': len(simulated_events),
+        'seed': seed
     }), 200
 
 @simulation_bp.route('/settle-bets', methods=['POST'])
 @token_required
 def auto_settle_bets(current_user):
     """Liquida automáticamente las apuestas según los resultados."""
-    settled_bets = SimulationService.auto_settle_bets()
+    report = SimulationService.auto_settle_bets()
     return jsonify({
-        'message': f'{len(settled_bets)} bets settled',
-        'settled_count': len(settled_bets)
+        'message': f'{report["bets_settled"]} bets settled',
+        'settled_count': report['bets_settled'],
+        'settlement': report
     }), 200
 
 @simulation_bp.route('/run-simulation-cycle', methods=['POST'])
 @token_required
 def run_simulation_cycle(current_user):
-    """Ejecuta un ciclo completo de simulación: actualizar eventos -> simular resultados -> liquidar apuestas."""
-    # 1. Actualizar estados de eventos
-    status_results = SimulationService.update_event_statuses()
+    """
+    Encola un ciclo completo de simulación: actualizar eventos -> simular
+    resultados -> liquidar apuestas. El progreso se consulta en /simulation/jobs/<id>.
+    """
+    seed, valid = _read_seed(request.get_json(silent=True) or {})
+    if not valid:
+        return jsonify({'message': 'seed must be a non-negative integer'}), 400
     
-    # 2. Simular resultados de eventos
-    event_results = SimulationService.simulate_event_results()
-    
-    # 3. Liquidar apuestas
-    bet_results = SimulationService.auto_settle_bets()
+    created, job = job_runner.submit(
+        'simulation_cycle', SimulationService.run_cycle_job, {'seed': seed}, current_user
+    )
+    if not created:
+        return jsonify({
+            'message': 'A simulation cycle is already running',
+            'job_id': job['id'],
+            'status': job['status']
+        }), 409
     
     return jsonify({
-        'message': 'Simulation cycle completed',
-        'events_updated': {
-            'live': status_results['live_updated'],
-            'completed': status_results['completed_updated']
-        },
-        'events_simulated': len(event_results),
-        'bets_settled': len(bet_results)
-    }), 200
\ No newline at end of file
+        'message': 'Simulation cycle queued',
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/simulation/jobs/{job['id']}"
+    }), 202
+
+@simulation_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_job(current_user, job_id):
+    """Estado, progreso y resultado de un trabajo en segundo plano del usuario actual."""
+    job = job_runner.get(job_id)
+    if not job or job['created_by'] != current_user:
+        return jsonify({'message': 'Job not found'}), 404
+    
+    return jsonify(job), 200
+
+@simulation_bp.route('/house-pnl', methods=['POST'])
+@token_required
+def house_pnl(current_user):
+    """Simula la distribución del resultado de la casa sobre las apuestas abiertas."""
+    data = request.get_json(silent=True) or {}
+    seed, valid = _read_seed(data)
+    if not valid:
+        return jsonify({'message': 'seed must be a non-negative integer'}), 400
+    
+    iterations = data.get('iterations', 10000)
+    if isinstance(iterations, bool) or not isinstance(iterations, int) or not 1 <= iterations <= MAX_PNL_ITERATIONS:
+        return jsonify({'message': f'iterations must be an integer between 1 and {MAX_PNL_ITERATIONS}'}), 400
+    
+    return jsonify(SimulationService.house_pnl_distribution(iterations, seed)), 200
\ No newline at end of file
@@ -0,0 +1,114 @@
+# Archivo: backend/scripts/bench_bet_placement.py
+#
+# Mide la latencia de colocación de apuestas (Bet.create) con varios hilos
+# escribiendo a la vez. Trabaja sobre una copia temporal de la base de datos.
+#
+#   python scripts/bench_bet_placement.py --threads 8 --bets 200
+#   python scripts/bench_bet_placement.py --threads 8 --bets 200 --queue
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import models.database as database
+
+def percentile(values, pct):
+    """Percentil por el método del rango más cercano."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def bench(threads, bets_per_thread, source_db=None, use_queue=False, delay_ms=0):
+    # Copia temporal para no ensuciar la base de datos real
+    tmp_dir = tempfile.mkdtemp(prefix="worldbet-bench-")
+    tmp_db = Path(tmp_dir) / "worldbet.db"
+    source = sqlite3.connect(str(source_db or database.DB_PATH))
+    target = sqlite3.connect(str(tmp_db))
+    source.backup(target)
+    source.close()
+    target.close()
+    database.close_db_connections()
+    database.DB_PATH = tmp_db
+    
+    from models.bet import Bet
+    from services.write_queue import write_queue
+    from utils.auth import get_or_create_user
+    
+    conn = database.get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+    SELECT s.id FROM selections s JOIN events e ON e.id = s.event_id
+    WHERE e.status IN ('upcoming', 'live')
+    """)
+    selection_ids = [row['id'] for row in cursor.fetchall()]
+    conn.close()
+    if not selection_ids:
+        print("No hay selecciones de eventos abiertos en la base de datos")
+        return
+    
+    user_id = get_or_create_user("bench-bet-placement")
+    if use_queue:
+        write_queue.start(max_delay_ms=delay_ms)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads)
+    
+    def worker(worker_index):
+        barrier.wait()
+        local_latencies = []
+        local_errors = []
+        for i in range(bets_per_thread):
+            selection_id = selection_ids[(worker_index + i) % len(selection_ids)]
+            started = time.perf_counter()
+            try:
+                Bet.create(user_id, selection_id, 10, "USD", False)
+                local_latencies.append((time.perf_counter() - started) * 1000)
+            except Exception as exc:
+                local_errors.append(str(exc))
+            finally:
+                database.release_db_connection()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+    
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    print(f"Hilos: {threads}, apuestas por hilo: {bets_per_thread}, cola de escritura: {'sí' if use_queue else 'no'}")
+    print(f"Correctas: {len(latencies)}, errores: {len(errors)}")
+    if latencies:
+        print(f"p50: {percentile(latencies, 50):.2f} ms")
+        print(f"p99: {percentile(latencies, 99):.2f} ms")
+        print(f"Rendimiento: {len(latencies) / elapsed:.0f} apuestas/s")
+    if errors:
+        print(f"Primer error: {errors[0]}")
+    if use_queue:
+        stats = write_queue.stats()
+        print(f"Transacciones: {stats['batches']} ({stats['operations_per_batch']} operaciones por commit)")
+        write_queue.stop()
+    
+    database.close_db_connections()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latencia de colocación de apuestas con escritores concurrentes")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--bets", type=int, default=200, help="Apuestas por hilo")
+    parser.add_argument("--db", help="Base de datos de origen (por defecto la de la aplicación)")
+    parser.add_argument("--queue", action="store_true", help="Escribir a través de la cola con commit agrupado")
+    parser.add_argument("--delay-ms", type=float, default=0, help="Espera máxima de la cola antes de cada commit")
+    args = parser.parse_args()
+    bench(args.threads, args.bets, args.db, args.queue, args.delay_ms)
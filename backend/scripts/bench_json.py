@@ -0,0 +1,93 @@
+# Archivo: backend/scripts/bench_json.py
+#
+# Compara el módulo json de la biblioteca estándar con el códec de la
+# aplicación (utils/json_codec.py) sobre la respuesta de /events/featured y
+# sobre la decodificación de las columnas JSON de los eventos. Los eventos de
+# la base de datos se repiten hasta llegar a --events. Solo lee la base de datos.
+#
+#   python scripts/bench_json.py --events 100
+#   JSON_CODEC=json python scripts/bench_json.py --events 100
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import models.database as database
+from utils import json_codec
+from utils.json_codec import RawJSON
+
+def best_ms(func, number):
+    """Mejor tiempo medio por llamada (ms) de cinco series de number llamadas."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+def stdlib_fragments(obj):
+    """Serialización con json de antes del códec: recorre el valor para insertar los fragmentos RawJSON."""
+    if isinstance(obj, RawJSON):
+        return obj
+    if isinstance(obj, dict):
+        return '{' + ','.join(f'{json.dumps(str(key))}:{stdlib_fragments(value)}' for key, value in obj.items()) + '}'
+    if isinstance(obj, (list, tuple)):
+        return '[' + ','.join(stdlib_fragments(value) for value in obj) + ']'
+    return json.dumps(obj, separators=(',', ':'))
+
+def load_events(count):
+    from repositories import get_repository
+
+    events = get_repository().events.get_all_events()
+    if not events:
+        return []
+    return [
+        dict(events[index % len(events)], id=f"{events[index % len(events)]['id']}-{index}")
+        for index in range(count)
+    ]
+
+def run(count, number):
+    from repositories.base import format_event_card, serialize_event_card
+
+    events = load_events(count)
+    if not events:
+        print("No hay eventos en la base de datos")
+        return
+
+    page = {"page": 1, "next_cursor": None, "total_count": len(events)}
+    # Respuesta con las tarjetas como diccionarios (jsonify) y ya serializadas (json_response)
+    dict_payload = dict(page, events=[format_event_card(event) for event in events])
+    raw_payload = dict(page, events=[serialize_event_card(event) for event in events])
+    # Columnas JSON de los eventos tal como se guardan en SQLite
+    columns = [
+        json.dumps(event.get(field))
+        for event in events for field in ('markets', 'teams', 'stats')
+    ]
+    size = len(json_codec.dumps(raw_payload).encode('utf-8'))
+
+    cases = (
+        ("Listado, tarjetas como dict", lambda: json.dumps(dict_payload, separators=(',', ':')),
+         lambda: json_codec.dumps(dict_payload)),
+        ("Listado, tarjetas RawJSON", lambda: stdlib_fragments(raw_payload),
+         lambda: json_codec.dumps(raw_payload)),
+        ("Decodificar columnas JSON", lambda: [json.loads(column) for column in columns],
+         lambda: [json_codec.loads(column) for column in columns]),
+    )
+
+    print(f"Códec:   {json_codec.BACKEND}")
+    print(f"Eventos: {len(events)} ({size / 1024:.1f} KiB por respuesta)")
+    print(f"{'Caso':<30} {'stdlib (ms)':>12} {'códec (ms)':>12} {'mejora':>8}")
+    for name, baseline, codec in cases:
+        baseline_ms = best_ms(baseline, number)
+        codec_ms = best_ms(codec, number)
+        print(f"{name:<30} {baseline_ms:>12.3f} {codec_ms:>12.3f} {baseline_ms / codec_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmark de codificación JSON del listado de eventos")
+    parser.add_argument("--events", type=int, default=100, help="Eventos en la respuesta")
+    parser.add_argument("--number", type=int, default=200, help="Llamadas por serie")
+    parser.add_argument("--db", type=Path, default=None, help="Base de datos (por defecto la de la aplicación)")
+    args = parser.parse_args()
+
+    if args.db:
+        database.DB_PATH = args.db
+    run(args.events, args.number)
@@ -0,0 +1,26 @@
+# Archivo: backend/scripts/migrate.py
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models.migrations import MIGRATIONS, get_applied_versions, run_migrations
+
+def migrate(show_status=False):
+    """Aplica las migraciones pendientes o muestra su estado con --status."""
+    if show_status:
+        applied = get_applied_versions()
+        for version, description, _ in sorted(MIGRATIONS, key=lambda m: m[0]):
+            state = "aplicada" if version in applied else "pendiente"
+            print(f"{version:>4}  {state:<10} {description}")
+        return
+    
+    applied_now = run_migrations(verbose=True)
+    if applied_now:
+        print(f"Migraciones aplicadas: {', '.join(str(v) for v in applied_now)}")
+    else:
+        print("La base de datos ya está actualizada")
+
+if __name__ == "__main__":
+    migrate(show_status='--status' in sys.argv[1:])
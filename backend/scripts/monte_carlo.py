@@ -0,0 +1,69 @@
+# Archivo: backend/scripts/monte_carlo.py
+#
+# Distribución del resultado de la casa sobre las apuestas abiertas, simulada
+# con las probabilidades implícitas de las cuotas (services/monte_carlo.py).
+# Solo lee la base de datos.
+#
+#   python scripts/monte_carlo.py --iterations 20000 --seed 42
+#   python scripts/monte_carlo.py --synthetic 5000 --iterations 1000 --seed 42
+import argparse
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+import models.database as database
+from services.monte_carlo import MarketBook, MonteCarloEngine
+
+def synthetic_book(markets, bets_per_market, seed=None):
+    """Mercados de 2 a 4 selecciones con un margen del 5% y apuestas aleatorias, para medir el motor."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    bets = []
+    for market in range(markets):
+        size = int(rng.integers(2, 5))
+        probabilities = rng.dirichlet(np.ones(size))
+        odds = np.round(1 / (probabilities * 1.05), 2).clip(1.01)
+        rows.extend((market, selection, float(odds[selection])) for selection in range(size))
+        for _ in range(bets_per_market):
+            selection = int(rng.integers(size))
+            stake = float(rng.integers(1, 100))
+            bets.append((market, selection, stake, stake * float(odds[selection])))
+    return MarketBook.from_rows(rows), bets
+
+def run(iterations, seed=None, synthetic=0, bets_per_market=10):
+    if synthetic:
+        book, bets = synthetic_book(synthetic, bets_per_market, seed)
+        report = MonteCarloEngine(seed).house_pnl(book, bets, iterations)
+    else:
+        from services.simulation_service import SimulationService
+        report = SimulationService.house_pnl_distribution(iterations, seed)
+
+    print(f"Iteraciones:            {report['iterations']}")
+    print(f"Semilla:                {report['seed']}")
+    print(f"Mercados:               {report['markets']}")
+    print(f"Apuestas:               {report['bets']} ({report['bets_skipped']} sin mercado)")
+    print(f"Total apostado:         {report['total_staked']:.2f}")
+    print(f"Resultado esperado:     {report['expected_pnl']:.2f}")
+    print(f"Media simulada:         {report['mean_pnl']:.2f} (desv. {report['std_pnl']:.2f})")
+    print(f"Mínimo / máximo:        {report['min_pnl']:.2f} / {report['max_pnl']:.2f}")
+    print("Percentiles:            " + ", ".join(f"{name} {value:.2f}" for name, value in report['percentiles'].items()))
+    print(f"Probabilidad de pérdida: {report['probability_of_loss']:.2%}")
+    print(f"Duración:               {report['duration_ms']} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo del resultado de la casa")
+    parser.add_argument("--iterations", type=int, default=10000, help="Escenarios simulados")
+    parser.add_argument("--seed", type=int, default=None, help="Semilla para resultados reproducibles")
+    parser.add_argument("--db", type=Path, default=None, help="Base de datos (por defecto la de la aplicación)")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="MARKETS",
+                        help="Usar MARKETS mercados sintéticos en lugar de la base de datos")
+    parser.add_argument("--bets-per-market", type=int, default=10, help="Apuestas por mercado sintético")
+    args = parser.parse_args()
+
+    if args.db:
+        database.DB_PATH = args.db
+    run(args.iterations, args.seed, args.synthetic, args.bets_per_market)
@@ -0,0 +1,26 @@
+# Archivo: backend/scripts/rebuild_user_stats.py
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models.bet import Bet
+from models.database import get_db_connection
+
+def rebuild():
+    """Recalcula la tabla user_stats a partir de las apuestas liquidadas."""
+    Bet.rebuild_user_stats()
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT user_id FROM user_stats ORDER BY user_id")
+    user_ids = [row['user_id'] for row in cursor.fetchall()]
+    conn.close()
+    
+    for user_id in user_ids:
+        stats = Bet.calculate_user_profit(user_id)
+        print(f"{user_id:<38} {stats['total_bets']:>6} {stats['total_profit']:>12.2f}")
+
+if __name__ == "__main__":
+    rebuild()
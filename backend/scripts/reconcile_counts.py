@@ -0,0 +1,21 @@
+# Archivo: backend/scripts/reconcile_counts.py
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from models.sport import Sport
+from models.competition import Competition
+
+def reconcile():
+    """Recalcula active_events_count de deportes y competiciones en una sola pasada."""
+    Sport.reconcile_active_event_counts()
+    
+    for sport in Sport.get_all():
+        print(f"{sport['name']:<25} {sport['active_events_count']:>5}")
+    for competition in Competition.get_all():
+        print(f"  {competition['name']:<23} {competition['active_events_count']:>5}")
+
+if __name__ == "__main__":
+    reconcile()
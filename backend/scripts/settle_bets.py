@@ -0,0 +1,21 @@
+# Archivo: backend/scripts/settle_bets.py
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para poder importar módulos
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from services.settlement_service import SettlementService
+
+def settle(full=False):
+    """Ejecuta un ciclo de liquidación incremental (--full reprocesa todo el registro)."""
+    report = SettlementService.run_cycle(full=full)
+    print(f"Eventos procesados:     {report['events_processed']}")
+    print(f"Mercados resueltos:     {report['markets_processed']}")
+    print(f"Apuestas liquidadas:    {report['bets_settled']}")
+    print(f"Lotes:                  {report['batches']}")
+    print(f"Marca de agua:          {report['watermark']}")
+    print(f"Duración:               {report['duration_ms']} ms")
+
+if __name__ == "__main__":
+    settle(full='--full' in sys.argv[1:])
@@ -0,0 +1,374 @@
+# Archivo: backend/services/catalog_service.py
+#
+# Catálogo de eventos, deportes y competiciones en memoria. Las lecturas del
+# catálogo (/events/featured, /events/<id>, /sports, /competitions) se sirven
+# desde una instantánea inmutable con los campos JSON ya decodificados y los
+# índices precalculados, sin consultar SQLite.
+#
+# Las escrituras no modifican la instantánea en uso: construyen una nueva
+# (copiando solo lo que cambia) y la publican sustituyendo la referencia, que
+# es una operación atómica. Los lectores que ya tenían la anterior la siguen
+# usando sin bloqueos.
+
+import bisect
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from repositories import get_repository
+from repositories.base import serialize_event_card
+from utils import json_codec
+from utils.pagination import encode_cursor, paginate_sorted_keys
+from utils.response_cache import LISTING_TAG, catalog_cache, event_tag
+
+# Clave máxima para incluir todos los IDs con una misma fecha en bisect
+_MAX_ID = '\U0010ffff'
+
+class CatalogSnapshot:
+    """
+    Instantánea inmutable del catálogo.
+
+    Los diccionarios devueltos se comparten entre peticiones y no deben
+    modificarse; quien necesite cambiarlos debe copiarlos antes.
+    """
+    def __init__(self, version, sports, competitions, events_by_id, cards_by_id,
+                 event_keys, event_keys_by_sport, event_keys_by_competition, event_keys_by_status):
+        self.version = version
+        self.built_at = time.monotonic()
+
+        self.sports = sports
+        self.competitions = competitions
+
+        # Eventos completos y su tarjeta de listado ya serializada, por ID
+        self.events_by_id = events_by_id
+        self.cards_by_id = cards_by_id
+
+        # Listas ordenadas de claves (start_time, id), global y por filtro
+        self.event_keys = event_keys
+        self.event_keys_by_sport = event_keys_by_sport
+        self.event_keys_by_competition = event_keys_by_competition
+        self.event_keys_by_status = event_keys_by_status
+
+        # Huellas de contenido para los ETag, calculadas al primer uso; como la
+        # instantánea no cambia, se guardan sin lock (la asignación es atómica)
+        self._event_fingerprints = {}
+        self._listing_fingerprint = None
+
+    @classmethod
+    def build(cls, version, sports, competitions, events):
+        """Construye una instantánea a partir de los datos completos del repositorio."""
+        events_by_id = {}
+        cards_by_id = {}
+        keys_by_sport = defaultdict(list)
+        keys_by_competition = defaultdict(list)
+        keys_by_status = defaultdict(list)
+
+        for event in events:
+            key = (event['start_time'], event['id'])
+            events_by_id[event['id']] = event
+            cards_by_id[event['id']] = serialize_event_card(event)
+            keys_by_sport[event['sport_type']].append(key)
+            keys_by_competition[event['competition']].append(key)
+            keys_by_status[event['status']].append(key)
+
+        for keys in (*keys_by_sport.values(), *keys_by_competition.values(), *keys_by_status.values()):
+            keys.sort()
+
+        return cls(
+            version,
+            tuple(sports),
+            tuple(competitions),
+            events_by_id,
+            cards_by_id,
+            sorted((event['start_time'], event['id']) for event in events),
+            dict(keys_by_sport),
+            dict(keys_by_competition),
+            dict(keys_by_status)
+        )
+
+    def with_event(self, version, event_id, event, sports=None, competitions=None):
+        """
+        Devuelve una nueva instantánea con un evento sustituido (copy-on-write).
+
+        Solo se copian los diccionarios por ID y las listas de índices afectadas;
+        el resto de estructuras se comparten con esta instantánea.
+
+        Args:
+            version: Versión de la nueva instantánea
+            event_id: ID del evento modificado
+            event: Evento completo actualizado, o None si se ha eliminado
+            sports: Deportes actualizados (por defecto se conservan los actuales)
+            competitions: Competiciones actualizadas (por defecto se conservan las actuales)
+        """
+        events_by_id = dict(self.events_by_id)
+        cards_by_id = dict(self.cards_by_id)
+        event_keys = self.event_keys
+        indexes = {
+            'sport_type': dict(self.event_keys_by_sport),
+            'competition': dict(self.event_keys_by_competition),
+            'status': dict(self.event_keys_by_status)
+        }
+
+        old_event = events_by_id.pop(event_id, None)
+        cards_by_id.pop(event_id, None)
+
+        old_key = (old_event['start_time'], event_id) if old_event else None
+        new_key = (event['start_time'], event_id) if event else None
+
+        if old_key != new_key:
+            event_keys = _replace_key(event_keys, old_key, new_key)
+
+        for field, index in indexes.items():
+            old_value = old_event[field] if old_event else None
+            new_value = event[field] if event else None
+            if old_key == new_key and old_value == new_value:
+                continue
+            if old_event:
+                index[old_value] = _replace_key(index.get(old_value, []), old_key, None)
+            if event:
+                index[new_value] = _replace_key(index.get(new_value, []), None, new_key)
+
+        if event:
+            events_by_id[event_id] = event
+            cards_by_id[event_id] = serialize_event_card(event)
+
+        snapshot = CatalogSnapshot(
+            version,
+            tuple(sports) if sports is not None else self.sports,
+            tuple(competitions) if competitions is not None else self.competitions,
+            events_by_id,
+            cards_by_id,
+            event_keys,
+            indexes['sport_type'],
+            indexes['competition'],
+            indexes['status']
+        )
+        # Las huellas del resto de eventos siguen siendo válidas
+        snapshot._event_fingerprints = {
+            key: value for key, value in self._event_fingerprints.items() if key != event_id
+        }
+        return snapshot
+
+    def event_etag(self, event_id):
+        """
+        ETag fuerte de /events/<id>: huella del contenido del evento.
+
+        Depende solo del contenido, así que coincide entre procesos y entre
+        instantáneas mientras el evento no cambie.
+
+        Returns:
+            Huella hexadecimal, o None si el evento no existe
+        """
+        fingerprint = self._event_fingerprints.get(event_id)
+        if fingerprint is None:
+            event = self.events_by_id.get(event_id)
+            if event is None:
+                return None
+            fingerprint = _fingerprint(json_codec.dumps(event, sort_keys=True))
+            self._event_fingerprints[event_id] = fingerprint
+        return fingerprint
+
+    def listing_etag(self, variant):
+        """
+        ETag fuerte de los listados (/events/featured, /sports, /competitions).
+
+        Combina la huella de toda la colección (tarjetas de todos los eventos,
+        deportes y competiciones) con variant, la ruta y sus argumentos: cambia
+        con cualquier evento, pero nunca sin que cambie el contenido.
+        """
+        return _fingerprint(f"{self.listing_fingerprint()}:{variant}")
+
+    def listing_fingerprint(self):
+        """Huella de toda la colección: tarjetas de todos los eventos, deportes y competiciones."""
+        if self._listing_fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            for _, event_id in self.event_keys:
+                digest.update(self.cards_by_id[event_id].encode())
+                digest.update(b'\n')
+            digest.update(json_codec.dumps([self.sports, self.competitions], sort_keys=True).encode())
+            self._listing_fingerprint = digest.hexdigest()
+        return self._listing_fingerprint
+
+    def changed_event_ids(self, previous):
+        """
+        IDs de los eventos añadidos, eliminados o modificados respecto a previous.
+
+        Las huellas de los eventos sin cambios se copian de previous, así que
+        sus ETag no se vuelven a calcular.
+        """
+        changed = set(previous.events_by_id.keys() - self.events_by_id.keys())
+        for event_id, event in self.events_by_id.items():
+            if previous.events_by_id.get(event_id) != event:
+                changed.add(event_id)
+            elif event_id in previous._event_fingerprints:
+                self._event_fingerprints[event_id] = previous._event_fingerprints[event_id]
+        return changed
+
+    def _paginate(self, keys, lo, hi, limit, page, cursor, include_total):
+        """Pagina un rango [lo, hi) de una lista ordenada de claves (start_time, id)."""
+        page_keys, has_more = paginate_sorted_keys(keys, lo, hi, limit, page, cursor)
+
+        response = {
+            "events": [self.cards_by_id[key[1]] for key in page_keys],
+            "page": page,
+            "next_cursor": encode_cursor(*page_keys[-1]) if has_more and page_keys else None
+        }
+        if include_total:
+            response["total_count"] = hi - lo
+        return response
+
+    def get_featured(self, sport_type=None, date_from=None, date_to=None, limit=10, page=1, cursor=None, include_total=True):
+        """
+        Lista eventos por (start_time, id) con filtros opcionales.
+
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        keys = self.event_keys_by_sport.get(sport_type, []) if sport_type else self.event_keys
+        lo = bisect.bisect_left(keys, (date_from,)) if date_from else 0
+        hi = bisect.bisect_right(keys, (date_to, _MAX_ID)) if date_to else len(keys)
+        return self._paginate(keys, lo, max(lo, hi), limit, page, cursor, include_total)
+
+    def get_by_id(self, event_id):
+        """Obtiene un evento completo por su ID."""
+        return self.events_by_id.get(event_id)
+
+    def get_events_by_competition(self, competition, limit=10, page=1, cursor=None, include_total=True):
+        """Lista los eventos de una competición."""
+        keys = self.event_keys_by_competition.get(competition, [])
+        return self._paginate(keys, 0, len(keys), limit, page, cursor, include_total)
+
+    def get_live_events(self, limit=10, page=1, cursor=None, include_total=True):
+        """Lista los eventos en vivo."""
+        keys = self.event_keys_by_status.get('live', [])
+        return self._paginate(keys, 0, len(keys), limit, page, cursor, include_total)
+
+    def get_sports(self):
+        """Obtiene todos los deportes."""
+        return list(self.sports)
+
+    def get_competitions(self, sport_id=None):
+        """Obtiene las competiciones, opcionalmente filtradas por deporte."""
+        return [comp for comp in self.competitions if not sport_id or comp['sport_id'] == sport_id]
+
+def _fingerprint(text):
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def _replace_key(keys, old_key, new_key):
+    """Devuelve una copia de una lista ordenada con old_key sustituida por new_key."""
+    keys = list(keys)
+    if old_key is not None:
+        index = bisect.bisect_left(keys, old_key)
+        if index < len(keys) and keys[index] == old_key:
+            del keys[index]
+    if new_key is not None:
+        bisect.insort(keys, new_key)
+    return keys
+
+class CatalogService:
+    # Instantánea publicada; se sustituye entera, nunca se modifica
+    _snapshot = None
+    _version = 0
+    # Serializa las reconstrucciones; los lectores nunca lo toman
+    _build_lock = threading.Lock()
+
+    @staticmethod
+    def _max_age():
+        from config import Config
+        return Config.CATALOG_SNAPSHOT_MAX_AGE
+
+    @staticmethod
+    def get_snapshot():
+        """
+        Devuelve la instantánea actual del catálogo, construyéndola si no existe.
+
+        Las escrituras de este proceso publican una instantánea nueva al momento;
+        CATALOG_SNAPSHOT_MAX_AGE acota cuánto tardan en verse las de otros
+        procesos. Al caducar, un único lector la reconstruye mientras el resto
+        sigue sirviendo la anterior.
+        """
+        snapshot = CatalogService._snapshot
+        if snapshot is None:
+            with CatalogService._build_lock:
+                if CatalogService._snapshot is None:
+                    CatalogService._publish_full()
+                return CatalogService._snapshot
+
+        max_age = CatalogService._max_age()
+        if max_age and time.monotonic() - snapshot.built_at > max_age:
+            if CatalogService._build_lock.acquire(blocking=False):
+                try:
+                    if CatalogService._snapshot is snapshot:
+                        CatalogService._publish_full()
+                finally:
+                    CatalogService._build_lock.release()
+            return CatalogService._snapshot
+
+        return snapshot
+
+    @staticmethod
+    def _publish_full():
+        repository = get_repository()
+        previous = CatalogService._snapshot
+        CatalogService._version += 1
+        CatalogService._snapshot = CatalogSnapshot.build(
+            CatalogService._version,
+            repository.sports.get_all(),
+            repository.competitions.get_all(),
+            repository.events.get_all_events()
+        )
+        # Solo se invalidan las respuestas cuyo contenido cambió: una
+        # reconstrucción periódica sin cambios conserva la caché (y su
+        # stale-while-revalidate)
+        if previous is not None:
+            snapshot = CatalogService._snapshot
+            tags = [event_tag(event_id) for event_id in snapshot.changed_event_ids(previous)]
+            if snapshot.listing_fingerprint() != previous.listing_fingerprint():
+                tags.append(LISTING_TAG)
+            if tags:
+                catalog_cache.invalidate(*tags)
+        return CatalogService._snapshot
+
+    @staticmethod
+    def refresh():
+        """
+        Reconstruye el catálogo completo desde el repositorio y lo publica.
+
+        Usar tras escrituras masivas (actualización de estados, resultados simulados).
+        """
+        with CatalogService._build_lock:
+            return CatalogService._publish_full()
+
+    @staticmethod
+    def apply_event_change(event_id):
+        """
+        Publica una instantánea con un único evento recargado desde el repositorio.
+
+        Usar tras escrituras puntuales (cambio de estado, cuotas) de un evento.
+        """
+        with CatalogService._build_lock:
+            snapshot = CatalogService._snapshot
+            if snapshot is None:
+                return CatalogService._publish_full()
+
+            repository = get_repository()
+            CatalogService._version += 1
+            CatalogService._snapshot = snapshot.with_event(
+                CatalogService._version,
+                event_id,
+                repository.events.get_by_id(event_id),
+                # Los contadores de eventos activos dependen del estado
+                sports=repository.sports.get_all(),
+                competitions=repository.competitions.get_all()
+            )
+            # El evento y los listados (contadores, orden por estado) cambian
+            catalog_cache.invalidate(event_tag(event_id), LISTING_TAG)
+            return CatalogService._snapshot
+
+    @staticmethod
+    def invalidate():
+        """Descarta la instantánea actual; la siguiente lectura la reconstruye."""
+        with CatalogService._build_lock:
+            CatalogService._snapshot = None
+            catalog_cache.invalidate()
@@ -0,0 +1,267 @@
+# Archivo: backend/services/job_runner.py
+#
+# Trabajos en segundo plano para los ciclos largos (simulación y liquidación).
+# La petición HTTP solo registra el trabajo en la tabla jobs y devuelve su ID;
+# unos hilos trabajadores lo ejecutan por tramos y guardan en la misma fila el
+# progreso, la duración de cada fase y el resultado, que se consultan con
+# GET /simulation/jobs/<id>.
+#
+# Cada tipo de trabajo tiene una concesión (job_leases) que se toma al crearlo
+# y se renueva en cada tramo: mientras esté vigente no se puede crear otro
+# trabajo del mismo tipo, en ningún proceso. Si el proceso que lo ejecutaba
+# muere, la concesión vence y el trabajo se da por fallido al crear el siguiente.
+
+import datetime
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from models.database import get_db_connection
+from services.write_queue import write_queue
+from utils import json_codec
+from utils.timestamps import now_epoch
+
+# Estados de un trabajo que todavía no ha terminado
+ACTIVE_STATUSES = ('queued', 'running')
+
+class LeaseLost(Exception):
+    """La concesión del trabajo venció o la tomó otro trabajo."""
+
+def _job_from_row(row, now=None):
+    """Convierte una fila de jobs (con expires_ts de su concesión) en el dict de la API."""
+    job = dict(row)
+    for field, default in (('params', {}), ('progress', {}), ('phases', []), ('result', None)):
+        job[field] = json_codec.loads(job[field]) if job[field] else default
+
+    # Un trabajo activo sin concesión vigente quedó huérfano (su proceso murió);
+    # la fila se marca como fallida al crear el siguiente trabajo del mismo tipo
+    expires_ts = job.pop('expires_ts', None)
+    if job['status'] in ACTIVE_STATUSES and (expires_ts is None or expires_ts <= (now or now_epoch())):
+        job['status'] = 'failed'
+        job['error'] = job['error'] or 'Lease expired'
+    return job
+
+_JOB_SELECT = """
+SELECT j.*, l.expires_ts
+FROM jobs j
+LEFT JOIN job_leases l ON l.name = j.kind AND l.job_id = j.id
+WHERE j.id = ?
+"""
+
+def _create_job(cursor, job_id, kind, params, created_by, lease_seconds):
+    """
+    Operación de escritura de submit: toma la concesión del tipo y registra el trabajo.
+
+    Returns:
+        Tupla (creado, trabajo); si la concesión está tomada, (False, trabajo que la tiene)
+    """
+    now = now_epoch()
+
+    cursor.execute("SELECT job_id, expires_ts FROM job_leases WHERE name = ?", (kind,))
+    lease = cursor.fetchone()
+    if lease and lease['expires_ts'] > now:
+        cursor.execute(_JOB_SELECT, (lease['job_id'],))
+        return False, _job_from_row(cursor.fetchone(), now)
+
+    timestamp = datetime.datetime.now().isoformat()
+
+    # Sin concesión vigente, cualquier trabajo activo de este tipo está huérfano
+    cursor.execute("""
+    UPDATE jobs SET status = 'failed', error = 'Lease expired', finished_at = ?
+    WHERE kind = ? AND status IN ('queued', 'running')
+    """, (timestamp, kind))
+
+    cursor.execute("""
+    INSERT INTO jobs (id, kind, status, params, created_by, created_at)
+    VALUES (?, ?, 'queued', ?, ?, ?)
+    """, (job_id, kind, json_codec.dumps(params), created_by, timestamp))
+    cursor.execute(
+        "INSERT OR REPLACE INTO job_leases (name, job_id, expires_ts) VALUES (?, ?, ?)",
+        (kind, job_id, now + lease_seconds)
+    )
+
+    cursor.execute(_JOB_SELECT, (job_id,))
+    return True, _job_from_row(cursor.fetchone(), now)
+
+def _renew_lease(cursor, job_id, kind, lease_seconds):
+    cursor.execute(
+        "UPDATE job_leases SET expires_ts = ? WHERE name = ? AND job_id = ?",
+        (now_epoch() + lease_seconds, kind, job_id)
+    )
+    if not cursor.rowcount:
+        raise LeaseLost(f"Lease for {kind} was lost")
+
+def _start_job(cursor, job_id, kind, lease_seconds):
+    _renew_lease(cursor, job_id, kind, lease_seconds)
+    cursor.execute(
+        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+        (datetime.datetime.now().isoformat(), job_id)
+    )
+
+def _save_progress(cursor, job_id, kind, lease_seconds, progress, phases):
+    _renew_lease(cursor, job_id, kind, lease_seconds)
+    cursor.execute(
+        "UPDATE jobs SET progress = ?, phases = ? WHERE id = ?",
+        (progress, phases, job_id)
+    )
+
+def _finish_job(cursor, job_id, kind, status, progress, phases, result, error):
+    cursor.execute("""
+    UPDATE jobs
+    SET status = ?, progress = ?, phases = ?, result = ?, error = ?, finished_at = ?
+    WHERE id = ?
+    """, (status, progress, phases, result, error, datetime.datetime.now().isoformat(), job_id))
+    cursor.execute("DELETE FROM job_leases WHERE name = ? AND job_id = ?", (kind, job_id))
+
+class JobContext:
+    """Progreso de un trabajo en ejecución; se pasa como primer argumento a su función."""
+    def __init__(self, job_id, kind, lease_seconds):
+        self.job_id = job_id
+        self.kind = kind
+        self.progress = {}
+        self.phases = []
+        self._lease_seconds = lease_seconds
+
+    def update(self, **counters):
+        """
+        Actualiza contadores de progreso, los guarda y renueva la concesión.
+
+        Se llama al final de cada tramo; un tramo debe durar menos que la concesión.
+
+        Raises:
+            LeaseLost: Si la concesión venció o la tomó otro trabajo
+        """
+        self.progress.update(counters)
+        write_queue.execute(
+            _save_progress, self.job_id, self.kind, self._lease_seconds,
+            json_codec.dumps(self.progress), json_codec.dumps(self.phases)
+        )
+
+    @contextmanager
+    def phase(self, name):
+        """Registra el estado y la duración de una fase del trabajo."""
+        entry = {'name': name, 'status': 'running', 'duration_ms': None}
+        self.phases.append(entry)
+        self.progress['phase'] = name
+        self.update()
+
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            entry['status'] = 'failed'
+            entry['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            raise
+        entry['status'] = 'completed'
+        entry['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.update()
+
+class JobRunner:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._threads = []
+        self._lease_seconds = 60
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def submit(self, kind, handler, params=None, created_by=None):
+        """
+        Registra un trabajo y lo encola para los hilos trabajadores.
+
+        Sin trabajadores en marcha (scripts) el trabajo se ejecuta en el hilo
+        que llama antes de volver.
+
+        Args:
+            kind: Tipo de trabajo; también es el nombre de su concesión
+            handler: Función handler(job, **params) que hace el trabajo y devuelve su resultado
+            params: Argumentos serializables en JSON para handler
+            created_by: ID del usuario que lo solicita
+
+        Returns:
+            Tupla (creado, trabajo); si ya hay uno de este tipo en curso,
+            (False, trabajo en curso)
+        """
+        params = params or {}
+        created, job = write_queue.execute(
+            _create_job, str(uuid.uuid4()), kind, params, created_by, self._lease_seconds
+        )
+        if not created:
+            return False, job
+
+        if self.is_running():
+            self._queue.put((job['id'], kind, handler, params))
+        else:
+            self._process(job['id'], kind, handler, params)
+            job = self.get(job['id'])
+        return True, job
+
+    def get(self, job_id):
+        """Obtiene un trabajo por su ID, o None si no existe."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(_JOB_SELECT, (job_id,))
+        row = cursor.fetchone()
+
+        conn.close()
+        return _job_from_row(row) if row else None
+
+    def _process(self, job_id, kind, handler, params):
+        job = JobContext(job_id, kind, self._lease_seconds)
+        try:
+            write_queue.execute(_start_job, job_id, kind, self._lease_seconds)
+            result = handler(job, **params)
+        except Exception as exc:
+            status, result, error = 'failed', None, str(exc) or exc.__class__.__name__
+        else:
+            status, error = 'completed', None
+        job.progress.pop('phase', None)
+
+        try:
+            write_queue.execute(
+                _finish_job, job_id, kind, status, json_codec.dumps(job.progress), json_codec.dumps(job.phases),
+                json_codec.dumps(result) if result is not None else None, error
+            )
+        except Exception as exc:
+            # La concesión vencerá y el trabajo se dará por fallido
+            print(f"Error al guardar el trabajo {job_id}: {exc}")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self._process(*item)
+
+    def start(self, workers=2, lease_seconds=60):
+        """
+        Arranca los hilos trabajadores.
+
+        Args:
+            workers: Número de hilos; como cada tipo de trabajo tiene una sola
+                     concesión, con uno por tipo ningún trabajo espera en cola
+            lease_seconds: Vigencia de la concesión sin renovar
+        """
+        if self.is_running():
+            return
+        self._lease_seconds = lease_seconds
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-runner-{index}", daemon=True)
+            for index in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Termina los trabajos encolados y detiene los hilos trabajadores."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+# Ejecutor del proceso
+job_runner = JobRunner()
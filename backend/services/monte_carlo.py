@@ -0,0 +1,202 @@
+# Archivo: backend/services/monte_carlo.py
+#
+# Motor de simulación Monte Carlo basado en cuotas. Las cuotas de cada mercado
+# se convierten en probabilidades implícitas (1 / cuota) y se normalizan para
+# eliminar el margen de la casa (overround), de modo que cada mercado suma 1.
+#
+# Los mercados se guardan como una matriz (un mercado por fila, una selección
+# por columna, con relleno de probabilidad 0), y el ganador de todos los
+# mercados se muestrea en una sola operación vectorizada con NumPy. Con una
+# semilla fija los resultados son reproducibles.
+
+import time
+
+import numpy as np
+
+# Número máximo de celdas (iteraciones x mercados x selecciones) por bloque
+# de muestreo; acota la memoria de house_pnl con muchas iteraciones
+MAX_BLOCK_CELLS = 4_000_000
+
+def chunk_seed(seed, index):
+    """Semilla del tramo index de una simulación por tramos (None si no hay semilla)."""
+    return None if seed is None else [seed, index]
+
+class MarketBook:
+    """Cuotas de un conjunto de mercados en forma de matriz."""
+    def __init__(self, keys, selection_ids, odds):
+        # Claves de mercado (p. ej. (event_id, market_id)) en orden de fila
+        self.keys = keys
+        # IDs de selección por fila, en orden de columna
+        self.selection_ids = selection_ids
+        # Matriz (mercados x selecciones) de cuotas; 0 en las celdas de relleno
+        self.odds = odds
+
+        # (clave de mercado, selection_id) -> (fila, columna)
+        self.positions = {
+            (key, selection_id): (row, column)
+            for row, (key, ids) in enumerate(zip(keys, selection_ids))
+            for column, selection_id in enumerate(ids)
+        }
+
+        implied = np.divide(1.0, odds, out=np.zeros_like(odds), where=odds > 0)
+        # Suma de probabilidades implícitas por mercado (1 + margen de la casa)
+        self.overround = implied.sum(axis=1)
+        self.probabilities = np.divide(
+            implied, self.overround[:, None],
+            out=np.zeros_like(implied), where=self.overround[:, None] > 0
+        )
+        # Acumuladas por fila para el muestreo por inversión de la distribución
+        self.cumulative = self.probabilities.cumsum(axis=1)
+        self.selection_counts = np.array([len(ids) for ids in selection_ids], dtype=np.int64)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Construye la matriz a partir de filas (clave de mercado, selection_id, cuota).
+
+        Las filas de un mismo mercado deben venir seguidas y en el orden de sus
+        selecciones.
+        """
+        keys = []
+        selection_ids = []
+        odds_rows = []
+        for key, selection_id, odds in rows:
+            if not keys or keys[-1] != key:
+                keys.append(key)
+                selection_ids.append([])
+                odds_rows.append([])
+            selection_ids[-1].append(selection_id)
+            odds_rows[-1].append(float(odds or 0))
+
+        width = max((len(row) for row in odds_rows), default=0)
+        odds = np.zeros((len(keys), width))
+        for index, row in enumerate(odds_rows):
+            odds[index, :len(row)] = row
+
+        return cls(keys, selection_ids, odds)
+
+    def __len__(self):
+        return len(self.keys)
+
+class MonteCarloEngine:
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def sample_winners(self, book, iterations=None):
+        """
+        Muestrea el ganador de cada mercado.
+
+        Args:
+            book: MarketBook
+            iterations: Número de escenarios; None para uno solo
+
+        Returns:
+            Columnas ganadoras, de forma (mercados,) o (iterations, mercados)
+        """
+        shape = (len(book),) if iterations is None else (iterations, len(book))
+        draws = self.rng.random(shape)
+        # Primera columna cuya probabilidad acumulada supera el número aleatorio;
+        # el recorte protege del redondeo en la última selección
+        winners = (draws[..., None] >= book.cumulative).sum(axis=-1)
+        return np.minimum(winners, book.selection_counts - 1)
+
+    def winners_by_market(self, book):
+        """Devuelve {clave de mercado: selection_id ganador} para un escenario."""
+        if not len(book):
+            return {}
+        winners = self.sample_winners(book)
+        return {
+            key: book.selection_ids[row][column]
+            for row, (key, column) in enumerate(zip(book.keys, winners.tolist()))
+        }
+
+    def bet_outcomes(self, book, bets):
+        """
+        Resultado ('win' o 'loss') de cada apuesta en un único escenario.
+
+        Todas las apuestas de un mismo mercado se resuelven con el mismo
+        ganador; las de mercados que no están en book ganan con su
+        probabilidad implícita 1 / cuota.
+
+        Args:
+            book: MarketBook de los mercados de las apuestas
+            bets: Lista de (clave de mercado, selection_id, cuota)
+
+        Returns:
+            Lista de resultados en el orden de bets
+        """
+        winners = self.winners_by_market(book)
+        fallback = self.rng.random(len(bets))
+        outcomes = []
+        for (market_key, selection_id, odds), draw in zip(bets, fallback.tolist()):
+            if market_key in winners:
+                won = winners[market_key] == selection_id
+            else:
+                won = bool(odds) and draw < 1.0 / odds
+            outcomes.append('win' if won else 'loss')
+        return outcomes
+
+    def house_pnl(self, book, bets, iterations=10000):
+        """
+        Distribución del resultado de la casa sobre un conjunto de apuestas abiertas.
+
+        En cada escenario se muestrea el ganador de todos los mercados; la casa
+        ingresa todas las apuestas y paga potential_return a las ganadoras.
+
+        Args:
+            book: MarketBook de los mercados de las apuestas
+            bets: Iterable de (clave de mercado, selection_id, stake_amount, potential_return)
+            iterations: Número de escenarios
+
+        Returns:
+            Dict con el resultado esperado y la distribución simulada
+        """
+        started = time.perf_counter()
+
+        # Pago por selección si gana (mercados x selecciones)
+        liabilities = np.zeros_like(book.odds)
+        total_staked = 0.0
+        bets_priced = 0
+        bets_skipped = 0
+        for market_key, selection_id, stake_amount, potential_return in bets:
+            position = book.positions.get((market_key, selection_id))
+            if position is None:
+                bets_skipped += 1
+                continue
+            liabilities[position] += potential_return
+            total_staked += stake_amount
+            bets_priced += 1
+
+        pnl = np.empty(iterations)
+        if len(book) and liabilities.size:
+            rows = np.arange(len(book))
+            block = max(1, MAX_BLOCK_CELLS // liabilities.size)
+            for start in range(0, iterations, block):
+                winners = self.sample_winners(book, min(block, iterations - start))
+                pnl[start:start + len(winners)] = total_staked - liabilities[rows, winners].sum(axis=1)
+        else:
+            pnl.fill(total_staked)
+
+        expected_payout = float((liabilities * book.probabilities).sum()) if liabilities.size else 0.0
+        percentiles = np.percentile(pnl, [1, 5, 50, 95, 99]) if iterations else [0.0] * 5
+
+        return {
+            'iterations': iterations,
+            'seed': self.seed,
+            'markets': len(book),
+            'bets': bets_priced,
+            'bets_skipped': bets_skipped,
+            'total_staked': round(total_staked, 2),
+            'expected_pnl': round(total_staked - expected_payout, 2),
+            'mean_pnl': round(float(pnl.mean()), 2) if iterations else 0.0,
+            'std_pnl': round(float(pnl.std()), 2) if iterations else 0.0,
+            'min_pnl': round(float(pnl.min()), 2) if iterations else 0.0,
+            'max_pnl': round(float(pnl.max()), 2) if iterations else 0.0,
+            'percentiles': {
+                name: round(float(value), 2)
+                for name, value in zip(('p1', 'p5', 'p50', 'p95', 'p99'), percentiles)
+            },
+            'probability_of_loss': round(float((pnl < 0).mean()), 4) if iterations else 0.0,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+        }
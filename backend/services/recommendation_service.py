@@ -3,8 +3,7 @@
 from models.recommendation import Recommendation
 from models.bet import Bet
 import random
-# Añade esta línea al principio del archivo, junto con las otras importaciones:
-import json
+from utils import json_codec
 
 class RecommendationService:
     @staticmethod
@@ -133,31 +132,12 @@ class RecommendationService:
         if 'use_ai_recommendation' in bet_data and not bet_data['use_ai_recommendation']:
             return bet_data
         
-        # 1. Buscar el evento basado en selection_id
-        from models.database import get_db_connection
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # 1. Buscar el evento basado en selection_id (consulta indexada)
+        from models.market import Market
         
         selection_id = bet_data['selection_id']
-        
-        # Buscar en todos los eventos para encontrar uno con esta selección
-        cursor.execute("SELECT * FROM events")
-        events = cursor.fetchall()
-        
-        event_id = None
-        for event in events:
-            markets = json.loads(event['markets'])
-            for market in markets:
-                for selection in market['selections']:
-                    if selection['id'] == selection_id:
-                        event_id = event['id']
-                        break
-                if event_id:
-                    break
-            if event_id:
-                break
-        
-        conn.close()
+        selection = Market.get_selection(selection_id)
+        event_id = selection['event_id'] if selection else None
         
         if not event_id:
             # No pudimos encontrar el evento, devolver los datos originales
@@ -189,7 +169,6 @@ class RecommendationService:
 def force_recommendation(current_user):
     """Endpoint para forzar recomendaciones ignorando algunos criterios estrictos."""
     from models.database import get_db_connection
-    import json
     import random
     
     conn = get_db_connection()
@@ -210,7 +189,7 @@ def force_recommendation(current_user):
     for event in events:
         event_dict = dict(event)
         event_id = event_dict['id']
-        markets = json.loads(event_dict['markets'])
+        markets = json_codec.loads(event_dict['markets'])
         
         # Elegir una selección aleatoria con buena cuota
         for market in markets:
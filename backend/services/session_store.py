@@ -0,0 +1,216 @@
+# Archivo: backend/services/session_store.py
+#
+# Sesiones de los tokens de /auth/login compartidas entre procesos. Las
+# sesiones viven en la tabla sessions de SQLite (con el SHA-256 del token, no
+# el token), de modo que un token emitido por un worker de gunicorn es válido
+# en todos los demás.
+#
+# Cada proceso tiene delante una caché LRU de lectura: un acierto no consulta
+# SQLite. Al revocar una sesión se borra su fila y se apunta en
+# session_revocations; cada proceso lee las revocaciones nuevas como mucho
+# una vez por revocation_poll segundos y las saca de su caché, así que una
+# sesión revocada deja de aceptarse en todos los procesos en ese plazo (en el
+# que la revoca, al momento). Las sesiones caducadas se barren periódicamente.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from models.database import get_db_connection
+from services.write_queue import write_queue
+from utils.timestamps import now_epoch
+
+def _token_hash(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _insert_session(cursor, token_hash, user_id, created_ts, expires_ts):
+    cursor.execute(
+        "INSERT OR REPLACE INTO sessions (token_hash, user_id, created_ts, expires_ts) VALUES (?, ?, ?, ?)",
+        (token_hash, user_id, created_ts, expires_ts)
+    )
+
+def _revoke_session(cursor, token_hash):
+    """Borra la sesión y apunta la revocación; devuelve si existía."""
+    cursor.execute("SELECT expires_ts FROM sessions WHERE token_hash = ?", (token_hash,))
+    row = cursor.fetchone()
+    if row is None:
+        return False
+    cursor.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+    cursor.execute(
+        "INSERT INTO session_revocations (token_hash, expires_ts) VALUES (?, ?)",
+        (token_hash, row['expires_ts'])
+    )
+    return True
+
+def _sweep_sessions(cursor, now):
+    """Borra las sesiones caducadas y las revocaciones de sesiones que ya habrían caducado."""
+    cursor.execute("DELETE FROM sessions WHERE expires_ts <= ?", (now,))
+    sessions = cursor.rowcount
+    cursor.execute("DELETE FROM session_revocations WHERE expires_ts <= ?", (now,))
+    return sessions
+
+class SessionStore:
+    """Interfaz de almacenamiento de sesiones."""
+    def create(self, token, user_id, expires_ts):
+        """Registra la sesión de token para user_id hasta expires_ts (epoch)."""
+        raise NotImplementedError
+
+    def get(self, token):
+        """Devuelve el user_id de la sesión de token, o None si no existe, caducó o se revocó."""
+        raise NotImplementedError
+
+    def revoke(self, token):
+        """Revoca la sesión de token en todos los procesos; devuelve si existía."""
+        raise NotImplementedError
+
+    def sweep(self):
+        """Elimina las sesiones caducadas; devuelve cuántas."""
+        raise NotImplementedError
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        # token_hash -> (user_id, expires_ts, instante en que se guardó)
+        self._cache = OrderedDict()
+        # Última revocación leída; None hasta la primera lectura
+        self._watermark = None
+        self._last_poll = 0.0
+        self._last_sweep = time.monotonic()
+        self.configure()
+        self._hits = 0
+        self._misses = 0
+        self._revocations_applied = 0
+        self._swept = 0
+
+    def configure(self, cache_size=4096, cache_ttl=60.0, revocation_poll=1.0, sweep_interval=300.0):
+        """
+        Ajusta la caché del proceso y la vacía.
+
+        Args:
+            cache_size: Sesiones máximas en la caché (LRU)
+            cache_ttl: Segundos que una sesión se sirve desde la caché sin volver a SQLite
+            revocation_poll: Segundos mínimos entre lecturas de session_revocations
+            sweep_interval: Segundos mínimos entre barridos de sesiones caducadas
+        """
+        with self._lock:
+            self.cache_size = max(0, cache_size)
+            self.cache_ttl = cache_ttl
+            self.revocation_poll = revocation_poll
+            self.sweep_interval = sweep_interval
+            self._cache.clear()
+
+    def _remember(self, token_hash, user_id, expires_ts, watermark):
+        """Guarda una sesión en la caché si no se leyeron revocaciones mientras se consultaba."""
+        with self._lock:
+            if watermark != self._watermark or not self.cache_size:
+                return
+            self._cache[token_hash] = (user_id, expires_ts, time.monotonic())
+            self._cache.move_to_end(token_hash)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _sync_revocations(self):
+        """Saca de la caché las sesiones revocadas por cualquier proceso desde la última lectura."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_poll < self.revocation_poll:
+                return
+            self._last_poll = now
+            watermark = self._watermark
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        if watermark is None:
+            # La caché empieza vacía: las revocaciones anteriores no le afectan
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS id FROM session_revocations")
+            rows = []
+            latest = cursor.fetchone()['id']
+        else:
+            cursor.execute(
+                "SELECT id, token_hash FROM session_revocations WHERE id > ? ORDER BY id",
+                (watermark,)
+            )
+            rows = cursor.fetchall()
+            latest = rows[-1]['id'] if rows else watermark
+        conn.close()
+
+        with self._lock:
+            if self._watermark != watermark:
+                return
+            for row in rows:
+                if self._cache.pop(row['token_hash'], None) is not None:
+                    self._revocations_applied += 1
+            self._watermark = latest
+
+    def create(self, token, user_id, expires_ts):
+        token_hash = _token_hash(token)
+        write_queue.execute(_insert_session, token_hash, user_id, now_epoch(), expires_ts)
+        self._sync_revocations()
+        self._remember(token_hash, user_id, expires_ts, self._watermark)
+
+        if time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def get(self, token):
+        token_hash = _token_hash(token)
+        now = now_epoch()
+        self._sync_revocations()
+
+        with self._lock:
+            entry = self._cache.get(token_hash)
+            if entry is not None:
+                user_id, expires_ts, stored_at = entry
+                if expires_ts > now and time.monotonic() - stored_at <= self.cache_ttl:
+                    self._cache.move_to_end(token_hash)
+                    self._hits += 1
+                    return user_id
+                del self._cache[token_hash]
+            self._misses += 1
+            watermark = self._watermark
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT user_id, expires_ts FROM sessions WHERE token_hash = ? AND expires_ts > ?",
+            (token_hash, now)
+        )
+        row = cursor.fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+        self._remember(token_hash, row['user_id'], row['expires_ts'], watermark)
+        return row['user_id']
+
+    def revoke(self, token):
+        token_hash = _token_hash(token)
+        revoked = write_queue.execute(_revoke_session, token_hash)
+        # Una lectura concurrente que la vuelva a guardar la quitará la siguiente lectura de revocaciones
+        with self._lock:
+            self._cache.pop(token_hash, None)
+        return revoked
+
+    def sweep(self):
+        self._last_sweep = time.monotonic()
+        swept = write_queue.execute(_sweep_sessions, now_epoch())
+        with self._lock:
+            self._swept += swept
+        return swept
+
+    def stats(self):
+        """Contadores de la caché de sesiones desde que arrancó el proceso."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._cache),
+                'max_entries': self.cache_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0,
+                'revocations_applied': self._revocations_applied,
+                'expired_swept': self._swept
+            }
+
+# Sesiones del proceso
+session_store = SQLiteSessionStore()
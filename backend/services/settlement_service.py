@@ -0,0 +1,143 @@
+# Archivo: backend/services/settlement_service.py
+#
+# Liquidación incremental de apuestas. Cada vez que llegan resultados de un
+# evento se añade una fila a event_result_log; un ciclo de liquidación solo
+# procesa las filas posteriores a la marca de agua (settlement_watermark) y
+# liquida las apuestas de cada mercado resuelto (event_results) con un único
+# UPDATE.
+
+import datetime
+import time
+
+from services.write_queue import write_queue
+
+class SettlementService:
+    # Filas del registro procesadas por transacción
+    BATCH_SIZE = 200
+
+    @staticmethod
+    def record_results(cursor, event_ids):
+        """
+        Registra la llegada de resultados de uno o varios eventos.
+
+        Args:
+            cursor: Cursor de la transacción que escribe los resultados (no se hace commit aquí)
+            event_ids: IDs de los eventos con resultados nuevos
+        """
+        recorded_at = datetime.datetime.now().isoformat()
+        cursor.executemany(
+            "INSERT INTO event_result_log (event_id, recorded_at) VALUES (?, ?)",
+            [(event_id, recorded_at) for event_id in event_ids]
+        )
+
+    @staticmethod
+    def _settle_batch(cursor, last_seq):
+        """
+        Liquida las apuestas de un lote del registro posterior a last_seq.
+
+        Returns:
+            Tupla (nueva marca de agua, eventos, mercados, apuestas liquidadas),
+            o None si no hay filas pendientes
+        """
+        cursor.execute(
+            "SELECT seq, event_id FROM event_result_log WHERE seq > ? ORDER BY seq LIMIT ?",
+            (last_seq, SettlementService.BATCH_SIZE)
+        )
+        log_rows = cursor.fetchall()
+        if not log_rows:
+            return None
+
+        event_ids = sorted({row['event_id'] for row in log_rows})
+        placeholders = ", ".join("?" for _ in event_ids)
+        cursor.execute(f"""
+        SELECT event_id, market_id, winning_selection_id
+        FROM event_results
+        WHERE event_id IN ({placeholders})
+        """, event_ids)
+        results = cursor.fetchall()
+
+        # Un UPDATE por mercado resuelto sobre idx_bets_placed_selection
+        bets_settled = 0
+        for result in results:
+            cursor.execute("""
+            UPDATE bets
+            SET status = 'settled',
+                result = CASE WHEN selection_id = ? THEN 'win' ELSE 'loss' END
+            WHERE event_id = ? AND market_id = ? AND status = 'placed'
+            """, (result['winning_selection_id'], result['event_id'], result['market_id']))
+            bets_settled += cursor.rowcount
+
+        return log_rows[-1]['seq'], len(event_ids), len(results), bets_settled
+
+    @staticmethod
+    def _settle_next_batch(cursor):
+        """
+        Operación de escritura de un lote: liquida desde la marca de agua y la avanza.
+
+        Returns:
+            Tupla (marca de agua, eventos, mercados, apuestas liquidadas), con
+            contadores a 0 si no quedaban filas pendientes
+        """
+        cursor.execute("SELECT last_seq FROM settlement_watermark WHERE id = 1")
+        last_seq = cursor.fetchone()['last_seq']
+
+        batch = SettlementService._settle_batch(cursor, last_seq)
+        if batch is None:
+            return last_seq, 0, 0, 0
+
+        cursor.execute(
+            "UPDATE settlement_watermark SET last_seq = ?, updated_at = ? WHERE id = 1",
+            (batch[0], datetime.datetime.now().isoformat())
+        )
+        return batch
+
+    @staticmethod
+    def _reset_watermark(cursor):
+        cursor.execute("UPDATE settlement_watermark SET last_seq = 0 WHERE id = 1")
+
+    @staticmethod
+    def run_cycle(full=False, on_batch=None):
+        """
+        Ejecuta un ciclo de liquidación incremental.
+
+        Procesa el registro de resultados por lotes desde la marca de agua; cada
+        lote (liquidación y avance de la marca) es una operación de la cola de
+        escritura y se confirma por separado, de modo que un ciclo interrumpido
+        se reanuda donde quedó.
+
+        Args:
+            full: Si es verdadero se reprocesa el registro desde el principio
+                  (p. ej. apuestas colocadas sobre eventos ya resueltos)
+            on_batch: Función opcional llamada con el informe parcial tras cada lote
+
+        Returns:
+            Dict con los contadores y tiempos del ciclo
+        """
+        started = time.perf_counter()
+
+        report = {
+            'batches': 0,
+            'events_processed': 0,
+            'markets_processed': 0,
+            'bets_settled': 0
+        }
+
+        if full:
+            write_queue.execute(SettlementService._reset_watermark)
+
+        while True:
+            watermark, events, markets, bets = write_queue.execute(SettlementService._settle_next_batch)
+            if not events:
+                break
+
+            report['batches'] += 1
+            report['events_processed'] += events
+            report['markets_processed'] += markets
+            report['bets_settled'] += bets
+            if on_batch:
+                on_batch(report)
+
+        report['watermark'] = watermark
+        report['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+        return report
@@ -1,36 +1,59 @@
 # Crear services/simulation_service.py
 
-import random
 import datetime
-import json
+from models.bet import Bet
 from models.database import get_db_connection
+from services.catalog_service import CatalogService
+from services.monte_carlo import MarketBook, MonteCarloEngine, chunk_seed
+from services.settlement_service import SettlementService
+from services.status_scheduler import status_scheduler
+from services.write_queue import write_queue
+from utils.timestamps import now_epoch
 
 class SimulationService:
+    # Tamaño de los tramos de los trabajos en segundo plano; cada tramo es una
+    # transacción de la cola de escritura y renueva la concesión del trabajo
+    EVENTS_PER_CHUNK = 200
+    MARKETS_PER_CHUNK = 500
+    
     @staticmethod
     def update_event_statuses():
         """
         Actualiza los estados de los eventos según su tiempo de inicio.
         
+        Con el planificador de estados en marcha (STATUS_SCHEDULER_ENABLED) las
+        transiciones ya se aplican solas; esta actualización completa queda
+        como recuperación manual.
+        
         Events que deberían haber comenzado -> 'live'
         Events que deberían haber terminado -> 'completed'
         
         Returns:
             Dict con contadores de eventos actualizados
         """
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        live_count, completed_count = write_queue.execute(SimulationService._apply_status_updates, now_epoch())
         
-        current_time = datetime.datetime.now().isoformat()
+        if live_count or completed_count:
+            CatalogService.refresh()
+            status_scheduler.events_changed()
         
-        # Eventos que deberían haber comenzado (asumiendo que duran 2 horas)
-        event_duration = datetime.timedelta(hours=2)
+        return {
+            'live_updated': live_count,
+            'completed_updated': completed_count
+        }
+    
+    @staticmethod
+    def _apply_status_updates(cursor, current_time):
+        """Operación de escritura de update_event_statuses; devuelve (live, completed)."""
+
+        # Rangos sobre start_ts/end_ts (epoch UTC); end_ts usa end_time o, si no
+        # existe, 2 horas después del inicio
         
         # Actualizar a 'live'
         cursor.execute("""
         UPDATE events 
         SET status = 'live' 
-        WHERE status = 'upcoming' AND start_time <= ? AND 
-              datetime(start_time, '+2 hours') > ?
+        WHERE status = 'upcoming' AND start_ts <= ? AND end_ts > ?
         """, (current_time, current_time))
         
         live_count = cursor.rowcount
@@ -39,127 +62,243 @@ class SimulationService:
         cursor.execute("""
         UPDATE events 
         SET status = 'completed' 
-        WHERE status IN ('upcoming', 'live') AND 
-              datetime(start_time, '+2 hours') <= ?
+        WHERE status IN ('upcoming', 'live') AND end_ts <= ?
         """, (current_time,))
         
         completed_count = cursor.rowcount
         
-        conn.commit()
-        conn.close()
+        return live_count, completed_count
+    
+    @staticmethod
+    def simulate_event_results(seed=None, max_events=None):
+        """
+        Simula resultados para los eventos 'completed' que todavía no tienen.
         
-        return {
-            'live_updated': live_count,
-            'completed_updated': completed_count
-        }
+        Muestrea una selección ganadora por mercado según las probabilidades
+        implícitas de sus cuotas (ver services/monte_carlo.py) y la guarda en
+        event_results en una sola transacción; los eventos ya resueltos no se
+        vuelven a simular y el JSON de mercados no se modifica.
+        
+        Args:
+            seed: Semilla del generador aleatorio (None para una aleatoria)
+            max_events: Eventos resueltos como máximo (None para todos)
+        
+        Returns:
+            Lista de eventos con resultados simulados (id, nombre y ganadores por mercado)
+        """
+        result_rows, event_names = write_queue.execute(SimulationService._insert_event_results, seed, max_events)
+        
+        simulated_events = {}
+        for event_id, market_id, winning_selection_id, _ in result_rows:
+            event = simulated_events.setdefault(event_id, {
+                'id': event_id,
+                'name': event_names[event_id],
+                'results': []
+            })
+            event['results'].append({'market_id': market_id, 'winning_selection_id': winning_selection_id})
+        
+        return list(simulated_events.values())
+    
+    @staticmethod
+    def _insert_event_results(cursor, seed=None, max_events=None):
+        """
+        Operación de escritura de simulate_event_results.
+        
+        Lee y escribe dentro de la misma transacción de escritura: dos llamadas
+        simultáneas no pueden resolver el mismo evento.
+        
+        Args:
+            cursor: Cursor de la transacción en curso
+            seed: Semilla del generador aleatorio
+            max_events: Eventos resueltos como máximo (None para todos)
+        
+        Returns:
+            Tupla (filas insertadas en event_results, nombres por ID de evento)
+        """
+        # Selecciones de los mercados de eventos completados sin resultados
+        # (LIMIT -1 es sin límite)
+        cursor.execute("""
+        SELECT e.id AS event_id, e.name AS event_name, s.market_id, s.id AS selection_id, s.odds
+        FROM events e
+        JOIN selections s ON s.event_id = e.id
+        JOIN markets m ON m.event_id = s.event_id AND m.id = s.market_id
+        WHERE e.id IN (
+            SELECT id FROM events
+            WHERE status = 'completed'
+              AND NOT EXISTS (SELECT 1 FROM event_results r WHERE r.event_id = events.id)
+            ORDER BY id
+            LIMIT ?
+        )
+        ORDER BY e.id, m.position, s.position
+        """, (-1 if max_events is None else max_events,))
+        
+        rows = cursor.fetchall()
+        event_names = {row['event_id']: row['event_name'] for row in rows}
+        book = MarketBook.from_rows(
+            ((row['event_id'], row['market_id']), row['selection_id'], row['odds']) for row in rows
+        )
+        
+        # Muestrear el ganador de todos los mercados en una sola pasada
+        winners = MonteCarloEngine(seed).winners_by_market(book)
+        resolved_at = datetime.datetime.now().isoformat()
+        result_rows = [
+            (event_id, market_id, winning_selection_id, resolved_at)
+            for (event_id, market_id), winning_selection_id in winners.items()
+        ]
+        cursor.executemany("""
+        INSERT OR IGNORE INTO event_results (event_id, market_id, winning_selection_id, resolved_at)
+        VALUES (?, ?, ?, ?)
+        """, result_rows)
+        
+        # Registrar la llegada de resultados para la liquidación incremental
+        SettlementService.record_results(cursor, list(event_names))
+        
+        return result_rows, event_names
     
     @staticmethod
-    def simulate_event_results():
+    def house_pnl_distribution(iterations=10000, seed=None):
         """
-        Simula resultados para eventos marcados como 'completed'.
-        Actualiza las selecciones ganadoras en los mercados.
+        Simula el resultado de la casa sobre las apuestas abiertas.
+        
+        Cada iteración resuelve todos los mercados con apuestas 'placed' según
+        las probabilidades implícitas de sus cuotas; la casa ingresa los
+        importes apostados y paga potential_return a las apuestas ganadoras
+        (sin comisiones).
+        
+        Args:
+            iterations: Número de escenarios simulados
+            seed: Semilla del generador aleatorio (None para una aleatoria)
         
         Returns:
-            Lista de eventos con resultados simulados
+            Dict con el resultado esperado y la distribución (ver MonteCarloEngine.house_pnl)
         """
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # Obtener eventos completados sin resultados
+        # Selecciones de los mercados con apuestas abiertas
+        cursor.execute("""
+        SELECT s.event_id, s.market_id, s.id, s.odds
+        FROM selections s
+        JOIN markets m ON m.event_id = s.event_id AND m.id = s.market_id
+        WHERE (s.event_id, s.market_id) IN (
+            SELECT event_id, market_id FROM bets WHERE status = 'placed'
+        )
+        ORDER BY s.event_id, m.position, s.position
+        """)
+        book = MarketBook.from_rows(
+            ((row['event_id'], row['market_id']), row['id'], row['odds']) for row in cursor.fetchall()
+        )
+        
         cursor.execute("""
-        SELECT * FROM events 
-        WHERE status = 'completed'
+        SELECT event_id, market_id, selection_id, stake_amount, potential_return
+        FROM bets
+        WHERE status = 'placed'
         """)
+        bets = [
+            ((row['event_id'], row['market_id']), row['selection_id'], row['stake_amount'], row['potential_return'])
+            for row in cursor.fetchall()
+        ]
         
-        completed_events = [dict(row) for row in cursor.fetchall()]
-        simulated_events = []
-        
-        for event in completed_events:
-            # Cargar mercados
-            markets = json.loads(event['markets'])
-            event_id = event['id']
-            
-            # Simular un ganador para cada mercado
-            for market in markets:
-                # Seleccionar un resultado aleatorio
-                winner_index = random.randint(0, len(market['selections']) - 1)
-                
-                # Marcar la selección ganadora
-                for i, selection in enumerate(market['selections']):
-                    selection['result'] = 'win' if i == winner_index else 'loss'
-            
-            # Guardar resultados simulados
-            updated_markets = json.dumps(markets)
-            cursor.execute("""
-            UPDATE events 
-            SET markets = ? 
-            WHERE id = ?
-            """, (updated_markets, event_id))
-            
-            # Añadir a la lista de eventos simulados
-            event['markets'] = markets
-            simulated_events.append(event)
-        
-        conn.commit()
         conn.close()
         
-        return simulated_events
+        return MonteCarloEngine(seed).house_pnl(book, bets, iterations)
     
     @staticmethod
     def auto_settle_bets():
         """
-        Liquida automáticamente las apuestas según los resultados de los eventos.
+        Liquida las apuestas de los eventos cuyos resultados llegaron desde el
+        último ciclo (ver SettlementService).
         
         Returns:
-            Lista de apuestas liquidadas
+            Dict con los contadores y tiempos del ciclo de liquidación
         """
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        return SettlementService.run_cycle()
+    
+    @staticmethod
+    def run_cycle_job(job, seed=None):
+        """
+        Trabajo en segundo plano de un ciclo completo: actualizar eventos ->
+        simular resultados -> liquidar apuestas.
+        
+        Los resultados se simulan en tramos de EVENTS_PER_CHUNK eventos y la
+        liquidación en los lotes de SettlementService; tras cada tramo se
+        guardan los contadores de progreso.
+        
+        Args:
+            job: JobContext del trabajo (ver services/job_runner.py)
+            seed: Semilla del generador aleatorio (None para una aleatoria)
+        
+        Returns:
+            Dict con el resultado del ciclo
+        """
+        with job.phase('update_events'):
+            status_results = SimulationService.update_event_statuses()
+            job.update(
+                events_live=status_results['live_updated'],
+                events_completed=status_results['completed_updated']
+            )
         
-        # Obtener todas las apuestas pendientes
-        cursor.execute("SELECT * FROM bets WHERE status = 'placed'")
-        pending_bets = [dict(row) for row in cursor.fetchall()]
-        
-        # Obtener todos los eventos completados
-        cursor.execute("SELECT * FROM events WHERE status = 'completed'")
-        completed_events = {row['id']: dict(row) for row in cursor.fetchall()}
-        
-        settled_bets = []
-        
-        for bet in pending_bets:
-            selection_id = bet['selection_id']
-            event_found = False
-            selection_result = None
-            
-            # Buscar la selección en los eventos completados
-            for event_id, event in completed_events.items():
-                markets = json.loads(event['markets'])
-                for market in markets:
-                    for selection in market['selections']:
-                        if selection['id'] == selection_id:
-                            event_found = True
-                            selection_result = selection.get('result')
-                            break
-                    if event_found:
-                        break
-                if event_found:
+        events_simulated = 0
+        with job.phase('simulate_results'):
+            chunk = 0
+            while True:
+                events = SimulationService.simulate_event_results(
+                    chunk_seed(seed, chunk), SimulationService.EVENTS_PER_CHUNK
+                )
+                events_simulated += len(events)
+                chunk += 1
+                job.update(events_simulated=events_simulated)
+                if len(events) < SimulationService.EVENTS_PER_CHUNK:
                     break
-            
-            # Si encontramos el evento y tiene resultado, liquidar la apuesta
-            if event_found and selection_result:
-                outcome = 'win' if selection_result == 'win' else 'loss'
-                
-                cursor.execute("""
-                UPDATE bets 
-                SET status = 'settled', result = ? 
-                WHERE id = ?
-                """, (outcome, bet['id']))
-                
-                bet['status'] = 'settled'
-                bet['result'] = outcome
-                settled_bets.append(bet)
-        
-        conn.commit()
-        conn.close()
         
-        return settled_bets
\ No newline at end of file
+        with job.phase('settle_bets'):
+            settlement = SettlementService.run_cycle(
+                on_batch=lambda report: job.update(
+                    bets_settled=report['bets_settled'],
+                    settlement_batches=report['batches']
+                )
+            )
+        
+        return {
+            'events_updated': {
+                'live': status_results['live_updated'],
+                'completed': status_results['completed_updated']
+            },
+            'events_simulated': events_simulated,
+            'bets_settled': settlement['bets_settled'],
+            'settlement': settlement,
+            'seed': seed
+        }
+    
+    @staticmethod
+    def simulate_bets_job(job, seed=None, user_id=None):
+        """
+        Trabajo en segundo plano de POST /bets/simulate: liquida con resultados
+        simulados las apuestas pendientes, en tramos de MARKETS_PER_CHUNK mercados.
+        
+        Args:
+            job: JobContext del trabajo (ver services/job_runner.py)
+            seed: Semilla del generador aleatorio (None para una aleatoria)
+            user_id: Usuario que lo solicita; el resultado incluye solo sus apuestas
+        
+        Returns:
+            Dict con el total liquidado y las apuestas liquidadas del usuario
+        """
+        total_settled = 0
+        user_settled_bets = []
+        with job.phase('simulate_bets'):
+            chunk = 0
+            while True:
+                settled_bets = Bet.simulate_results(chunk_seed(seed, chunk), SimulationService.MARKETS_PER_CHUNK)
+                if not settled_bets:
+                    break
+                total_settled += len(settled_bets)
+                user_settled_bets.extend(bet for bet in settled_bets if bet['user_id'] == user_id)
+                chunk += 1
+                job.update(bets_settled=total_settled, chunks=chunk)
+        
+        return {
+            'total_settled': total_settled,
+            'settled_bets': user_settled_bets,
+            'seed': seed
+        }
@@ -0,0 +1,236 @@
+# Archivo: backend/services/status_scheduler.py
+#
+# Planificador en proceso de las transiciones de estado de los eventos
+# (upcoming -> live -> completed). Mantiene un montículo (heap) con el
+# siguiente instante de transición de cada evento, calculado a partir de
+# start_ts/end_ts, y un hilo que duerme hasta el próximo vencimiento y aplica
+# solo las transiciones vencidas, en transacciones pequeñas.
+#
+# Cada proceso tiene su propio planificador; las actualizaciones comprueban el
+# estado actual, así que si varios procesos aplican la misma transición solo
+# la primera modifica la fila.
+
+import heapq
+import threading
+import time
+
+from models.database import get_db_connection
+from services.catalog_service import CatalogService
+from utils.timestamps import now_epoch
+
+class StatusScheduler:
+    # Transiciones aplicadas por transacción
+    BATCH_SIZE = 50
+    # Por encima de este número de eventos cambiados se reconstruye el catálogo entero
+    CATALOG_REFRESH_THRESHOLD = 20
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # Entradas (instante, id de evento, estado destino, token)
+        self._heap = []
+        # Token vigente por evento; las entradas con otro token están obsoletas
+        self._tokens = {}
+        self._next_token = 0
+        self._thread = None
+        self._stopping = False
+        self._rebuild_interval = 0
+        self._last_rebuild = 0.0
+
+    def _plan(self, event_id, status, start_ts, end_ts, now):
+        """Devuelve (instante, estado destino) de la próxima transición de un evento, o None."""
+        if start_ts is None or end_ts is None:
+            return None
+        if status == 'upcoming':
+            if end_ts <= now:
+                return now, 'completed'
+            return start_ts, 'live'
+        if status == 'live':
+            return end_ts, 'completed'
+        return None
+
+    def _push(self, event_id, plan):
+        """Sustituye la transición planificada de un evento (con el lock tomado)."""
+        self._next_token += 1
+        if plan is None:
+            self._tokens.pop(event_id, None)
+            return
+        self._tokens[event_id] = self._next_token
+        heapq.heappush(self._heap, (plan[0], event_id, plan[1], self._next_token))
+
+    def rebuild(self):
+        """Reconstruye el montículo con todos los eventos pendientes de transición."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id, status, start_ts, end_ts FROM events WHERE status IN ('upcoming', 'live')")
+        rows = cursor.fetchall()
+        conn.close()
+
+        now = now_epoch()
+        with self._condition:
+            self._heap = []
+            self._tokens = {}
+            for row in rows:
+                self._push(row['id'], self._plan(row['id'], row['status'], row['start_ts'], row['end_ts'], now))
+            heapq.heapify(self._heap)
+            self._last_rebuild = time.monotonic()
+            self._condition.notify()
+
+    def reschedule(self, event_id):
+        """Vuelve a planificar un evento tras un cambio (estado, fechas o alta)."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT status, start_ts, end_ts FROM events WHERE id = ?", (event_id,))
+        row = cursor.fetchone()
+        conn.close()
+
+        with self._condition:
+            plan = self._plan(event_id, row['status'], row['start_ts'], row['end_ts'], now_epoch()) if row else None
+            self._push(event_id, plan)
+            self._condition.notify()
+
+    def _pop_due(self, now):
+        """Extrae las transiciones vencidas y vigentes (con el lock tomado)."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_ts, event_id, target, token = heapq.heappop(self._heap)
+            if self._tokens.get(event_id) == token:
+                due.append((event_id, target))
+                del self._tokens[event_id]
+        return due
+
+    def _apply(self, transitions):
+        """
+        Aplica transiciones vencidas en lotes de BATCH_SIZE por transacción.
+
+        Returns:
+            IDs de los eventos cuyo estado cambió
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        now = now_epoch()
+        changed = []
+
+        for start in range(0, len(transitions), StatusScheduler.BATCH_SIZE):
+            batch = transitions[start:start + StatusScheduler.BATCH_SIZE]
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                for event_id, target in batch:
+                    if target == 'live':
+                        cursor.execute("""
+                        UPDATE events SET status = 'live'
+                        WHERE id = ? AND status = 'upcoming' AND start_ts <= ? AND end_ts > ?
+                        """, (event_id, now, now))
+                    else:
+                        cursor.execute("""
+                        UPDATE events SET status = 'completed'
+                        WHERE id = ? AND status IN ('upcoming', 'live') AND end_ts <= ?
+                        """, (event_id, now))
+                    if cursor.rowcount:
+                        changed.append(event_id)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        conn.close()
+        return changed
+
+    def run_due(self):
+        """
+        Aplica las transiciones vencidas y planifica las siguientes de esos eventos.
+
+        Returns:
+            Número de eventos cuyo estado cambió
+        """
+        with self._condition:
+            due = self._pop_due(now_epoch())
+        if not due:
+            return 0
+
+        changed = self._apply(due)
+
+        # Los eventos que pasan a 'live' quedan pendientes de completarse; los que
+        # no cambiaron (otro proceso se adelantó o cambiaron sus fechas) se replanifican
+        for event_id, _ in due:
+            self.reschedule(event_id)
+
+        if len(changed) > StatusScheduler.CATALOG_REFRESH_THRESHOLD:
+            CatalogService.refresh()
+        else:
+            for event_id in changed:
+                CatalogService.apply_event_change(event_id)
+
+        return len(changed)
+
+    def _next_wait(self):
+        """Segundos hasta la próxima transición o reconstrucción (con el lock tomado)."""
+        waits = []
+        if self._heap:
+            waits.append(self._heap[0][0] - time.time())
+        if self._rebuild_interval:
+            waits.append(self._last_rebuild + self._rebuild_interval - time.monotonic())
+        return max(0.0, min(waits)) if waits else None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._stopping:
+                    return
+                self._condition.wait(self._next_wait())
+                if self._stopping:
+                    return
+                rebuild_due = self._rebuild_interval and \
+                    time.monotonic() - self._last_rebuild >= self._rebuild_interval
+
+            try:
+                # La reconstrucción periódica recoge eventos creados o
+                # modificados por otros procesos
+                if rebuild_due:
+                    self.rebuild()
+                self.run_due()
+            except Exception as exc:
+                print(f"Error en el planificador de estados: {exc}")
+                time.sleep(1)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def event_changed(self, event_id):
+        """Notifica el cambio de un evento (estado, fechas o alta) si el planificador está en marcha."""
+        if self.is_running():
+            self.reschedule(event_id)
+
+    def events_changed(self):
+        """Notifica cambios masivos de eventos; el montículo se reconstruye."""
+        if self.is_running():
+            self.rebuild()
+
+    def start(self, rebuild_interval=300):
+        """
+        Construye el montículo y arranca el hilo del planificador.
+
+        Args:
+            rebuild_interval: Segundos entre reconstrucciones completas (0 para desactivarlas)
+        """
+        if self.is_running():
+            return
+        self._rebuild_interval = rebuild_interval
+        self._stopping = False
+        self.rebuild()
+        self.run_due()
+        self._thread = threading.Thread(target=self._run, name="status-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo del planificador."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+# Planificador del proceso
+status_scheduler = StatusScheduler()
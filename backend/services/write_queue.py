@@ -0,0 +1,198 @@
+# Archivo: backend/services/write_queue.py
+#
+# Cola de escritura con commit agrupado (group commit). Los hilos de las
+# peticiones no abren transacciones de escritura: entregan la operación a un
+# único hilo escritor, que agrupa las operaciones pendientes (hasta
+# WRITE_QUEUE_MAX_BATCH, esperando como mucho WRITE_QUEUE_MAX_DELAY_MS) en
+# una sola transacción con un solo commit. Los hilos dejan de competir por el
+# bloqueo de escritura de SQLite y el coste de cada commit se reparte entre
+# todas las operaciones de la tanda.
+#
+# Cada operación se ejecuta dentro de su propio SAVEPOINT: si falla, solo se
+# deshacen sus cambios y solo su llamador recibe la excepción. El resultado de
+# cada operación se entrega a su llamador después del commit, nunca antes.
+#
+# Las operaciones reciben un cursor de la transacción en curso y no deben
+# hacer commit, rollback ni BEGIN.
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from models.database import get_db_connection
+
+class WriteQueue:
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._max_batch = 64
+        self._max_delay = 0.0
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._operations = 0
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def execute(self, operation, *args):
+        """
+        Ejecuta operation(cursor, *args) en una transacción de escritura.
+
+        Con el escritor en marcha la operación se agrupa con las de otros hilos;
+        si no (backend sin cola, scripts) se ejecuta en su propia transacción
+        BEGIN IMMEDIATE. En ambos casos devuelve el resultado cuando los cambios
+        ya están confirmados.
+
+        Raises:
+            La excepción de la operación, o la del commit si este falla
+        """
+        if not self.is_running() or threading.current_thread() is self._thread:
+            return _run_in_transaction(operation, args)
+
+        future = Future()
+        self._queue.put((operation, args, future))
+        return future.result()
+
+    def _collect(self, first):
+        """Reúne una tanda: first, lo ya encolado y lo que llegue antes del plazo."""
+        batch = [first]
+        deadline = time.monotonic() + self._max_delay
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                # Parada: se procesa la tanda actual y se vuelve a encolar la señal
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _commit_batch(self, batch):
+        """Ejecuta una tanda en una transacción, con un SAVEPOINT por operación."""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        outcomes = []
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for operation, args, future in batch:
+                cursor.execute("SAVEPOINT write_op")
+                try:
+                    result = operation(cursor, *args)
+                except Exception as exc:
+                    cursor.execute("ROLLBACK TO write_op")
+                    cursor.execute("RELEASE write_op")
+                    outcomes.append((future, None, exc))
+                else:
+                    cursor.execute("RELEASE write_op")
+                    outcomes.append((future, result, None))
+            conn.commit()
+        except Exception as exc:
+            # Sin commit no hay cambios de ninguna operación de la tanda
+            if conn.in_transaction:
+                conn.rollback()
+            for _, _, future in batch:
+                future.set_exception(exc)
+            return
+
+        with self._stats_lock:
+            self._batches += 1
+            self._operations += len(batch)
+
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                self._commit_batch(batch)
+            except Exception as exc:
+                # Nunca dejar a un llamador esperando
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def stats(self):
+        """Tandas y operaciones confirmadas por el escritor desde que arrancó."""
+        with self._stats_lock:
+            return {
+                'batches': self._batches,
+                'operations': self._operations,
+                'operations_per_batch': round(self._operations / self._batches, 2) if self._batches else 0
+            }
+
+    def start(self, max_batch=64, max_delay_ms=0):
+        """
+        Arranca el hilo escritor.
+
+        Con max_delay_ms=0 cada tanda reúne las operaciones que llegaron mientras
+        se confirmaba la anterior, así que crece con la carga sin añadir espera;
+        un valor mayor solo compensa si cada commit es caro (synchronous=FULL).
+
+        Args:
+            max_batch: Operaciones máximas por transacción
+            max_delay_ms: Milisegundos que se espera a más operaciones antes del commit
+        """
+        if self.is_running():
+            return
+        self._max_batch = max(1, max_batch)
+        self._max_delay = max(0, max_delay_ms) / 1000
+        self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Procesa las operaciones pendientes y detiene el hilo escritor."""
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+        # Las operaciones encoladas justo después de la señal de parada se
+        # ejecutan aquí; la señal que pudiera quedar se descarta
+        pending = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                pending.append(item)
+        if pending:
+            self._commit_batch(pending)
+
+def _run_in_transaction(operation, args):
+    """Ejecuta una operación en su propia transacción (o en la del hilo, si ya hay una abierta)."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    if conn.in_transaction:
+        return operation(cursor, *args)
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        result = operation(cursor, *args)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return result
+
+# Escritor del proceso
+write_queue = WriteQueue()
@@ -1,17 +1,18 @@
 import jwt
 import datetime
+import time
 import uuid
 from functools import wraps
 from flask import request, jsonify, current_app
 from models.database import get_db_connection
+from services.session_store import session_store
+from utils.timestamps import now_epoch
+from utils.token_cache import verified_tokens
 
-# Sesiones activas simuladas
-SESSIONS = {}
-
-def generate_token(user_id):
-    """Genera un token JWT para el usuario."""
+def generate_token(user_id, expires_in=86400):
+    """Genera un token JWT para el usuario, válido durante expires_in segundos."""
     payload = {
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1),
+        'exp': datetime.datetime.utcnow() + datetime.timedelta(seconds=expires_in),
         'iat': datetime.datetime.utcnow(),
         'sub': user_id
     }
@@ -31,17 +32,25 @@ def token_required(f):
         if not token:
             return jsonify({'message': 'Token is missing'}), 401
         
-        try:
-            payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-            current_user = payload['sub']
-            
-            if token not in SESSIONS or SESSIONS[token] != current_user:
-                return jsonify({'message': 'Invalid or expired token'}), 401
-                
-        except jwt.ExpiredSignatureError:
-            return jsonify({'message': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'message': 'Invalid token'}), 401
+        started = time.perf_counter()
+        # Un token ya verificado y sin caducar no vuelve a pasar por jwt.decode
+        current_user = verified_tokens.get(token)
+        cached = current_user is not None
+        if not cached:
+            try:
+                payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+                current_user = payload['sub']
+            except jwt.ExpiredSignatureError:
+                return jsonify({'message': 'Token has expired'}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({'message': 'Invalid token'}), 401
+            verified_tokens.put(token, current_user, payload['exp'])
+        
+        # La sesión puede venir de otro worker o estar revocada
+        if session_store.get(token) != current_user:
+            verified_tokens.discard(token)
+            return jsonify({'message': 'Invalid or expired token'}), 401
+        verified_tokens.record(time.perf_counter() - started, cached)
             
         return f(current_user, *args, **kwargs)
     
@@ -80,7 +89,13 @@ def get_or_create_user(username):
     return user_id
 
 def create_session(user_id):
-    """Crea una sesión para el usuario autenticado."""
-    token = generate_token(user_id)
-    SESSIONS[token] = user_id
-    return token
\ No newline at end of file
+    """Crea una sesión para el usuario autenticado, compartida por todos los procesos."""
+    expires_in = current_app.config.get('SESSION_TTL', 86400)
+    token = generate_token(user_id, expires_in)
+    session_store.create(token, user_id, now_epoch() + expires_in)
+    return token
+
+def revoke_session(token):
+    """Revoca la sesión de un token en todos los procesos; devuelve si existía."""
+    verified_tokens.discard(token)
+    return session_store.revoke(token)
\ No newline at end of file
@@ -0,0 +1,158 @@
+# Archivo: backend/utils/json_codec.py
+#
+# Codificación y decodificación JSON de toda la aplicación: columnas JSON de
+# SQLite (markets, teams, stats, commission...), filas de jobs y respuestas
+# HTTP (jsonify usa CodecJSONEncoder, ver app.py).
+#
+# Usa orjson si está instalado y, si no, el módulo json de la biblioteca
+# estándar. La variable de entorno JSON_CODEC fuerza uno de los dos ('orjson'
+# o 'json'); por defecto ('auto') se elige el más rápido disponible.
+#
+# Los fragmentos RawJSON (JSON ya serializado, p. ej. las tarjetas de evento
+# del catálogo) se copian tal cual en la salida sin volver a codificarlos.
+
+import json
+import os
+
+from flask.json import JSONDecoder, JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CODEC = os.getenv('JSON_CODEC', 'auto')
+if JSON_CODEC == 'orjson' and orjson is None:
+    raise ImportError("JSON_CODEC=orjson requiere el paquete orjson")
+
+# Nombre del codificador en uso: 'orjson' o 'json'
+BACKEND = 'orjson' if orjson is not None and JSON_CODEC != 'json' else 'json'
+
+class RawJSON(str):
+    """Fragmento JSON ya serializado que se inserta tal cual en la respuesta."""
+    __slots__ = ()
+
+class _RawFragment(Exception):
+    """El valor contiene fragmentos RawJSON y hay que serializarlo por partes."""
+
+def loads(data):
+    """Decodifica JSON desde str o bytes."""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, sort_keys=False, indent=None, default=None):
+    """
+    Serializa a JSON compacto (sin espacios) copiando sin cambios los fragmentos RawJSON.
+
+    Args:
+        obj: Valor a serializar
+        sort_keys: Ordenar las claves de los diccionarios
+        indent: Indentar la salida (con orjson siempre son 2 espacios); no se
+                aplica a los valores que contienen fragmentos RawJSON
+        default: Función que convierte los valores no serializables
+
+    Returns:
+        Texto JSON (str)
+    """
+    if BACKEND == 'orjson':
+        def encode(value):
+            return _orjson_dumps(value, sort_keys, indent, default)
+    else:
+        def encode(value):
+            return _stdlib_dumps(value, sort_keys, indent, default)
+
+    try:
+        return encode(obj)
+    except _RawFragment:
+        return _splice(obj, encode, sort_keys)
+
+def _orjson_dumps(obj, sort_keys, indent, default):
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    if indent is not None:
+        option |= orjson.OPT_INDENT_2
+    if default is not None:
+        # Las fechas pasan por default, como en jsonify (formato HTTP)
+        option |= orjson.OPT_PASSTHROUGH_DATETIME
+
+    raw_found = False
+
+    def _default(value):
+        nonlocal raw_found
+        # Con OPT_PASSTHROUGH_SUBCLASS las subclases de tipos básicos llegan
+        # aquí: RawJSON interrumpe la codificación y el resto pasa a su tipo base
+        if isinstance(value, RawJSON):
+            raw_found = True
+            raise TypeError("RawJSON")
+        for base in (str, dict, list, int, float):
+            if isinstance(value, base):
+                return base(value)
+        if isinstance(value, tuple):
+            return list(value)
+        if default is not None:
+            return default(value)
+        raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
+
+    try:
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    except orjson.JSONEncodeError:
+        if raw_found:
+            raise _RawFragment()
+        # Enteros de más de 64 bits y otros valores que orjson no admite
+        return _stdlib_dumps(obj, sort_keys, indent, default)
+
+def _stdlib_dumps(obj, sort_keys, indent, default):
+    # json serializa RawJSON como una cadena más, así que hay que buscarlos antes
+    if isinstance(obj, (dict, list, tuple)) and _contains_raw(obj):
+        raise _RawFragment()
+    separators = None if indent is not None else (',', ':')
+    return json.dumps(obj, sort_keys=sort_keys, indent=indent, default=default, separators=separators)
+
+def _contains_raw(obj):
+    if isinstance(obj, RawJSON):
+        return True
+    if isinstance(obj, dict):
+        return any(_contains_raw(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_contains_raw(value) for value in obj)
+    return False
+
+def _splice(obj, encode, sort_keys):
+    """
+    Serializa un valor con fragmentos RawJSON uniendo a mano sus partes.
+
+    Solo se recorren los diccionarios, listas y tuplas que contienen algún
+    fragmento; el resto se serializa de una vez con encode.
+    """
+    if isinstance(obj, RawJSON):
+        return obj
+    try:
+        return encode(obj)
+    except _RawFragment:
+        pass
+    if isinstance(obj, dict):
+        items = sorted(obj.items(), key=lambda item: str(item[0])) if sort_keys else obj.items()
+        return '{' + ','.join(
+            f'{json.dumps(str(key))}:{_splice(value, encode, sort_keys)}' for key, value in items
+        ) + '}'
+    return '[' + ','.join(_splice(value, encode, sort_keys) for value in obj) + ']'
+
+class CodecJSONEncoder(JSONEncoder):
+    """
+    Codificador de jsonify que usa dumps respetando JSON_SORT_KEYS, la indentación de depuración y default.
+
+    Con el módulo json se usa el codificador de Flask sin cambios, que no
+    busca fragmentos RawJSON; las respuestas que los llevan se construyen con
+    json_response.
+    """
+    def encode(self, o):
+        if BACKEND == 'json':
+            return super().encode(o)
+        return dumps(o, sort_keys=self.sort_keys, indent=self.indent, default=self.default)
+
+class CodecJSONDecoder(JSONDecoder):
+    """Decodificador de request.get_json que usa loads."""
+    def decode(self, s):
+        return loads(s)
@@ -0,0 +1,7 @@
+from flask import current_app
+
+from utils.json_codec import dumps
+
+def json_response(payload, status=200):
+    """Equivalente a jsonify para respuestas que contienen fragmentos RawJSON."""
+    return current_app.response_class(dumps(payload) + '\n', status=status, mimetype='application/json')
@@ -0,0 +1,75 @@
+import base64
+import bisect
+import json
+
+def encode_cursor(*values):
+    """
+    Codifica la posición de la última fila devuelta como un cursor opaco.
+
+    Args:
+        values: Valores de la clave de ordenación, p. ej. (start_time, id)
+
+    Returns:
+        Cursor en base64 apto para URL
+    """
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, size=2):
+    """
+    Decodifica un cursor generado por encode_cursor.
+
+    Args:
+        cursor: Cursor recibido en ?cursor=
+        size: Número de valores que debe contener
+
+    Returns:
+        Tupla con los valores de la clave de ordenación
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    # Solo valores escalares; bool es subclase de int y tampoco se admite
+    if any(isinstance(value, bool) or not isinstance(value, (str, int, float)) for value in values):
+        raise ValueError('Invalid cursor')
+
+    return tuple(values)
+
+def parse_bool_arg(value, default=False):
+    """Interpreta un parámetro de query string como booleano."""
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+def paginate_sorted_keys(keys, lo, hi, limit, page=1, cursor=None):
+    """
+    Pagina el rango [lo, hi) de una lista de claves en orden ascendente.
+
+    Con cursor se busca (bisect) la primera clave posterior a la del cursor; sin
+    él se salta por número de página.
+
+    Returns:
+        Tupla (claves de la página, hay_más)
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    if cursor:
+        try:
+            start = max(lo, bisect.bisect_right(keys, decode_cursor(cursor)))
+        except TypeError:
+            # Valores de un tipo que no se compara con el de las claves
+            raise ValueError('Invalid cursor')
+    else:
+        start = lo + (page - 1) * limit
+
+    page_keys = keys[start:min(start + limit, hi)]
+    return page_keys, start + limit < hi
@@ -0,0 +1,276 @@
+# Archivo: backend/utils/response_cache.py
+#
+# Caché en memoria de respuestas de las rutas públicas del catálogo
+# (/sports, /competitions, /events/featured, /events/<id>). Guarda el cuerpo
+# ya serializado de las respuestas 200, con clave ruta + argumentos de la
+# consulta normalizados, y lo sirve sin volver a construir el JSON.
+#
+# Cada entrada es fresca durante ttl segundos; después, durante stale_ttl
+# segundos más, se sigue sirviendo mientras una única petición la recalcula
+# (stale-while-revalidate). El número de entradas está acotado con desalojo
+# LRU. Las escrituras del catálogo invalidan por etiqueta (evento concreto o
+# listados) o todo (ver CatalogService).
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, make_response, request
+
+# Etiqueta de las respuestas que dependen de todos los eventos (listados, deportes, competiciones)
+LISTING_TAG = 'listing'
+
+def event_tag(event_id):
+    """Etiqueta de las respuestas que dependen de un evento concreto."""
+    return f'event:{event_id}'
+
+class _Entry:
+    __slots__ = ('body', 'mimetype', 'tags', 'stored_at', 'refreshing')
+
+    def __init__(self, body, mimetype, tags, stored_at):
+        self.body = body
+        self.mimetype = mimetype
+        self.tags = tags
+        self.stored_at = stored_at
+        self.refreshing = False
+
+class ResponseCache:
+    def __init__(self, max_entries=2048, ttl=30.0, stale_ttl=30.0, enabled=True):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # Etiqueta -> claves de las entradas que la llevan
+        self._keys_by_tag = {}
+        # Se incrementa en cada invalidación; una respuesta calculada antes de
+        # una invalidación no se guarda
+        self._generation = 0
+        self.configure(max_entries, ttl, stale_ttl, enabled)
+        self._reset_counters()
+
+    def configure(self, max_entries=2048, ttl=30.0, stale_ttl=30.0, enabled=True):
+        """
+        Ajusta los límites de la caché y la vacía.
+
+        Args:
+            max_entries: Número máximo de respuestas guardadas (LRU)
+            ttl: Segundos durante los que una entrada es fresca
+            stale_ttl: Segundos adicionales en los que se sirve caducada mientras se recalcula
+            enabled: Si es falso todas las peticiones se calculan
+        """
+        with self._lock:
+            self.max_entries = max(1, max_entries)
+            self.ttl = ttl
+            self.stale_ttl = stale_ttl
+            self.enabled = enabled
+            self._clear()
+
+    def _reset_counters(self):
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def _clear(self):
+        self._entries.clear()
+        self._keys_by_tag.clear()
+        self._generation += 1
+
+    def _remove(self, key):
+        """Elimina una entrada y sus etiquetas (con el lock tomado)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def _lookup(self, key):
+        """
+        Busca una entrada y decide cómo servirla (con el lock tomado).
+
+        Returns:
+            Tupla (entrada o None, estado): 'hit', 'stale' (se sirve caducada),
+            'revalidate' (se sirve recalculada por esta petición) o 'miss'
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, 'miss'
+
+        age = time.monotonic() - entry.stored_at
+        if age <= self.ttl:
+            self._entries.move_to_end(key)
+            return entry, 'hit'
+        if age <= self.ttl + self.stale_ttl:
+            self._entries.move_to_end(key)
+            if entry.refreshing:
+                return entry, 'stale'
+            entry.refreshing = True
+            return entry, 'revalidate'
+
+        self._remove(key)
+        return None, 'miss'
+
+    def _store(self, key, body, mimetype, tags, generation):
+        """Guarda una respuesta si no hubo invalidaciones mientras se calculaba (con el lock tomado)."""
+        if generation != self._generation:
+            return
+        self._remove(key)
+        self._entries[key] = _Entry(body, mimetype, tags, time.monotonic())
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def get_or_compute(self, key, compute, tags=()):
+        """
+        Devuelve la respuesta guardada para key o la calcula con compute().
+
+        Args:
+            key: Clave de la respuesta
+            compute: Función que devuelve la respuesta (objeto Response de Flask)
+            tags: Etiquetas para invalidar la entrada
+
+        Returns:
+            Tupla (respuesta, estado de caché): 'hit', 'stale', 'miss',
+            'revalidated' o 'bypass' (respuesta que no se guarda)
+        """
+        if not self.enabled:
+            return compute(), 'bypass'
+
+        with self._lock:
+            entry, state = self._lookup(key)
+            if state == 'hit':
+                self._hits += 1
+            elif state == 'stale':
+                self._stale_hits += 1
+            elif state == 'miss':
+                self._misses += 1
+            else:
+                self._revalidations += 1
+            generation = self._generation
+
+        if state in ('hit', 'stale'):
+            return _from_entry(entry), state
+
+        try:
+            response = compute()
+        except Exception:
+            self._release(entry)
+            raise
+
+        # Solo se guardan respuestas correctas; los errores se recalculan siempre
+        if response.status_code != 200:
+            self._release(entry)
+            return response, 'bypass'
+
+        with self._lock:
+            self._store(key, response.get_data(), response.mimetype, tuple(tags), generation)
+        return response, 'miss' if state == 'miss' else 'revalidated'
+
+    def _release(self, entry):
+        """Permite que otra petición vuelva a recalcular una entrada caducada."""
+        if entry is not None:
+            with self._lock:
+                entry.refreshing = False
+
+    def invalidate(self, *tags):
+        """Elimina las entradas con alguna de las etiquetas, o todas si no se indica ninguna."""
+        with self._lock:
+            self._invalidations += 1
+            if not tags:
+                self._clear()
+                return
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+            self._generation += 1
+
+    def stats(self):
+        """Contadores de la caché desde que arrancó el proceso."""
+        with self._lock:
+            lookups = self._hits + self._stale_hits + self._misses + self._revalidations
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'stale_hits': self._stale_hits,
+                'misses': self._misses,
+                'revalidations': self._revalidations,
+                'hit_ratio': round((self._hits + self._stale_hits) / lookups, 4) if lookups else 0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+def request_key():
+    """Ruta y argumentos de la consulta ordenados, sin los vacíos."""
+    args = sorted((name, value) for name, value in request.args.items(multi=True) if value != '')
+    return f"{request.path}?{urlencode(args)}" if args else request.path
+
+def _from_entry(entry):
+    response = make_response(entry.body)
+    response.mimetype = entry.mimetype
+    return response
+
+def cached_response(tags):
+    """
+    Decorador de rutas GET públicas que sirve las respuestas desde catalog_cache.
+
+    Añade la cabecera X-Cache con el estado de la caché (HIT, STALE, MISS,
+    REVALIDATED o BYPASS).
+
+    Args:
+        tags: Función que recibe los argumentos de la ruta y devuelve las etiquetas de la respuesta
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response, state = catalog_cache.get_or_compute(
+                request_key(),
+                lambda: make_response(view(*args, **kwargs)),
+                tags(**kwargs)
+            )
+            response.headers['X-Cache'] = state.upper()
+            return response
+        return wrapper
+    return decorator
+
+def conditional_get(etag, cache_control):
+    """
+    Decorador de rutas GET con ETag fuerte y Cache-Control.
+
+    El ETag se calcula antes de la vista; si coincide con If-None-Match se
+    responde 304 sin ejecutarla, es decir, sin construir ni serializar el JSON.
+    Las respuestas de error no llevan ETag ni Cache-Control.
+
+    Args:
+        etag: Función que recibe los argumentos de la ruta y devuelve el ETag
+              (sin comillas), o None si la respuesta no tiene
+        cache_control: Valor de la cabecera Cache-Control
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            tag = etag(**kwargs)
+            if tag is not None and request.if_none_match.contains_weak(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            if tag is not None:
+                response.set_etag(tag)
+                response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
+
+# Caché de respuestas del catálogo del proceso
+catalog_cache = ResponseCache()
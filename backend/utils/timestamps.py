@@ -0,0 +1,19 @@
+import datetime
+import time
+
+def to_epoch(value):
+    """
+    Convierte una fecha ISO 8601 en segundos desde epoch (UTC).
+
+    Las fechas sin zona horaria se interpretan en hora local, igual que
+    strftime('%s', valor, 'utc') en los triggers de SQLite que rellenan las
+    columnas *_ts.
+
+    Raises:
+        ValueError: Si la fecha no es válida
+    """
+    return int(datetime.datetime.fromisoformat(value).timestamp())
+
+def now_epoch():
+    """Instante actual en segundos desde epoch (UTC)."""
+    return int(time.time())
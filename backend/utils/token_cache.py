@@ -0,0 +1,101 @@
+# Archivo: backend/utils/token_cache.py
+#
+# Caché de tokens JWT ya verificados. token_required verifica la firma HMAC
+# y las claims de un token solo la primera vez que lo ve; las siguientes
+# peticiones con el mismo token (la mini app lo reenvía en cada consulta)
+# toman el user_id de aquí. Una entrada nunca se usa después del exp del
+# token ni más de ttl segundos, y el logout la elimina. La sesión se sigue
+# comprobando en cada petición (ver services/session_store.py), así que una
+# revocación en otro proceso se respeta aunque el token esté en esta caché.
+#
+# También mide cuánto tarda la autenticación de cada petición, separando las
+# que usaron la caché de las que verificaron el token.
+
+import threading
+import time
+from collections import OrderedDict
+
+class VerifiedTokenCache:
+    def __init__(self, max_entries=4096, ttl=300.0):
+        self._lock = threading.Lock()
+        # token -> (user_id, instante epoch hasta el que se puede usar)
+        self._entries = OrderedDict()
+        self.configure(max_entries, ttl)
+        self._hits = 0
+        self._misses = 0
+        self._durations = {True: [0, 0.0, 0.0], False: [0, 0.0, 0.0]}
+
+    def configure(self, max_entries=4096, ttl=300.0):
+        """
+        Ajusta los límites de la caché y la vacía.
+
+        Args:
+            max_entries: Tokens máximos guardados (LRU); 0 la desactiva
+            ttl: Segundos máximos que se usa una entrada, aunque el token dure más
+        """
+        with self._lock:
+            self.max_entries = max(0, max_entries)
+            self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, token):
+        """Devuelve el user_id de un token verificado y vigente, o None."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                user_id, valid_until = entry
+                if time.time() < valid_until:
+                    self._entries.move_to_end(token)
+                    self._hits += 1
+                    return user_id
+                del self._entries[token]
+            self._misses += 1
+            return None
+
+    def put(self, token, user_id, exp):
+        """Guarda un token recién verificado hasta su exp (epoch) o durante ttl segundos, lo que llegue antes."""
+        valid_until = min(exp, time.time() + self.ttl)
+        with self._lock:
+            if not self.max_entries:
+                return
+            self._entries[token] = (user_id, valid_until)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, token):
+        """Elimina un token (logout o sesión revocada)."""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def record(self, seconds, cached):
+        """Registra la duración de una autenticación correcta."""
+        with self._lock:
+            timing = self._durations[cached]
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def stats(self):
+        """Contadores de la caché y tiempos de autenticación desde que arrancó el proceso."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            timings = {}
+            for name, cached in (('cached', True), ('verified', False)):
+                count, total, slowest = self._durations[cached]
+                timings[name] = {
+                    'requests': count,
+                    'avg_ms': round(total / count * 1000, 3) if count else 0,
+                    'max_ms': round(slowest * 1000, 3)
+                }
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0,
+                'auth_timing': timings
+            }
+
+# Tokens verificados del proceso
+verified_tokens = VerifiedTokenCache()